@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+"""
+Microbenchmark of ConfigObject and FrozenConfigObject reads
+
+Usage: python benchmarks/config_object_access.py
+"""
+from __future__ import print_function
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from octoconf import ConfigObject  # noqa: E402 pylint: disable=wrong-import-position
+
+NUMBER = 1000000
+SETUPS = [
+    ('ConfigObject', 'from __main__ import CONFIG as config'),
+    ('FrozenConfigObject', 'from __main__ import FROZEN_CONFIG as config'),
+]
+
+STATEMENTS = [
+    ('top-level attribute', 'config.count'),
+    ('top-level item', 'config["count"]'),
+    ('nested attribute', 'config.Flask.SQLALCHEMY_DATABASE_URI'),
+    ('nested item', 'config["Flask"]["SQLALCHEMY_DATABASE_URI"]'),
+    ('get() of existing key', 'config.get("count")'),
+    ('get() of missing key', 'config.get("missing")'),
+    ('membership of missing key', '"missing" in config'),
+]
+
+CONFIG = ConfigObject({
+    'count': 42,
+    'Flask': {
+        'SQLALCHEMY_DATABASE_URI': 'sqlite:///app.sqlite',
+        'DEBUG': False,
+    },
+})
+FROZEN_CONFIG = CONFIG.freeze()
+
+
+def main():
+    for class_name, setup in SETUPS:
+        print(class_name)
+        for title, statement in STATEMENTS:
+            seconds = min(timeit.repeat(statement, setup, number=NUMBER, repeat=3))
+            print('    {:<30} {:8.1f} ns/access'.format(title, seconds / NUMBER * 1e9))
+
+
+if __name__ == '__main__':
+    main()
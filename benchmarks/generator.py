@@ -0,0 +1,192 @@
+"""
+Generator of synthetic config files for the benchmarks
+
+Every ``make_*()`` function writes the files of one config shape into a directory, and returns a ``Scenario``.
+"""
+import collections
+import os
+
+from octoconf.octoconf import DEFAULT_CONFIG_SELECTOR, BASE_CONFIG_SELECTOR, INCLUDE_FILE_SPECIFIER
+
+Scenario = collections.namedtuple('Scenario', ['name', 'path', 'variables', 'used_config', 'access_path'])
+
+
+def make_inheritance_chain(directory, depth, keys=10):
+    """
+    Profiles, where every profile inherits the previous one
+
+    :type directory: str
+    :type depth: int
+    :type keys: int
+    :rtype: Scenario
+    """
+    lines = ['{}: Profile{}'.format(DEFAULT_CONFIG_SELECTOR, depth - 1)]
+    for level in range(depth):
+        lines.append('Profile{}:'.format(level))
+        if level:
+            lines.append('  {}: Profile{}'.format(BASE_CONFIG_SELECTOR, level - 1))
+        lines.extend(_make_section_lines(keys, indent=1, prefix='level{}_'.format(level)))
+
+    path = _write_file(directory, 'chain_{}.yml'.format(depth), lines)
+    return Scenario('inheritance_chain_{}'.format(depth), path, {}, None, ('level0_section0', 'number'))
+
+
+def make_include_fanout(directory, width, keys=10):
+    """
+    Root file, what includes many independent files
+
+    :type directory: str
+    :type width: int
+    :type keys: int
+    :rtype: Scenario
+    """
+    includes = []
+    for index in range(width):
+        name = 'fanout_{}_{}.yml'.format(width, index)
+        _write_file(directory, name, ['Profile:'] + _make_section_lines(keys, indent=1, prefix='file{}_'.format(index)))
+        includes.append(name)
+
+    lines = ['{}: Profile'.format(DEFAULT_CONFIG_SELECTOR), '{}:'.format(INCLUDE_FILE_SPECIFIER)]
+    lines.extend('  - {}'.format(name) for name in includes)
+    lines.extend(['Profile:', '  root: true'])
+
+    path = _write_file(directory, 'fanout_{}.yml'.format(width), lines)
+    return Scenario('include_fanout_{}'.format(width), path, {}, None, ('file0_section0', 'number'))
+
+
+def make_include_diamond(directory, levels, keys=10):
+    """
+    Include graph of diamonds, where both files of a level include the same file of the next level
+
+    :type directory: str
+    :type levels: int
+    :type keys: int
+    :rtype: Scenario
+    """
+    next_level_name = None
+    for level in reversed(range(levels)):
+        level_name = 'diamond_{}_{}.yml'.format(levels, level)
+        for side in ('left', 'right'):
+            lines = []
+            if next_level_name:
+                lines.append('{}: {}'.format(INCLUDE_FILE_SPECIFIER, next_level_name))
+            lines.append('Profile:')
+            lines.extend(_make_section_lines(keys, indent=1, prefix='{}{}_'.format(side, level)))
+            _write_file(directory, '{}_{}'.format(side, level_name), lines)
+
+        _write_file(directory, level_name, [
+            '{}:'.format(INCLUDE_FILE_SPECIFIER),
+            '  - left_{}'.format(level_name),
+            '  - right_{}'.format(level_name),
+        ])
+        next_level_name = level_name
+
+    lines = [
+        '{}: Profile'.format(DEFAULT_CONFIG_SELECTOR),
+        '{}: {}'.format(INCLUDE_FILE_SPECIFIER, next_level_name),
+        'Profile:',
+        '  root: true',
+    ]
+    path = _write_file(directory, 'diamond_{}.yml'.format(levels), lines)
+    return Scenario('include_diamond_{}'.format(levels), path, {}, None, ('left0_section0', 'number'))
+
+
+def make_many_profiles(directory, profiles, keys=10):
+    """
+    Many independent profiles in one file, where only one profile is used
+
+    :type directory: str
+    :type profiles: int
+    :type keys: int
+    :rtype: Scenario
+    """
+    lines = ['{}: Profile0'.format(DEFAULT_CONFIG_SELECTOR)]
+    for index in range(profiles):
+        lines.append('Profile{}:'.format(index))
+        lines.extend(_make_section_lines(keys, indent=1))
+
+    path = _write_file(directory, 'profiles_{}.yml'.format(profiles), lines)
+    return Scenario('many_profiles_{}'.format(profiles), path, {}, None, ('section0', 'number'))
+
+
+def make_deep_nesting(directory, depth, keys=10):
+    """
+    One profile, where the sections are nested into each other
+
+    :type directory: str
+    :type depth: int
+    :type keys: int
+    :rtype: Scenario
+    """
+    lines = ['{}: Profile'.format(DEFAULT_CONFIG_SELECTOR), 'Profile:']
+    for level in range(depth):
+        lines.append('{}nested:'.format('  ' * (level + 1)))
+        lines.extend('{}key{}: {}'.format('  ' * (level + 2), index, index) for index in range(keys))
+
+    path = _write_file(directory, 'nesting_{}.yml'.format(depth), lines)
+    return Scenario('deep_nesting_{}'.format(depth), path, {}, None, ('nested',) * depth + ('key0',))
+
+
+def make_variables(directory, count, keys=10):
+    """
+    One profile, where most of the values contain variables
+
+    :type directory: str
+    :type count: int
+    :type keys: int
+    :rtype: Scenario
+    """
+    lines = ['{}: Profile'.format(DEFAULT_CONFIG_SELECTOR), 'Profile:']
+    for index in range(count):
+        lines.append('  section{}:'.format(index))
+        lines.extend('    key{0}: ${{VAR{1}}}/path/${{VAR{0}}}'.format(key, index % 10) for key in range(keys))
+
+    variables = {'VAR{}'.format(index): 'value{}'.format(index) for index in range(max(keys, 10))}
+    path = _write_file(directory, 'variables_{}.yml'.format(count), lines)
+    return Scenario('variables_{}'.format(count), path, variables, None, ('section0', 'key0'))
+
+
+def make_default_scenarios(directory):
+    """
+    :type directory: str
+    :rtype: list
+    """
+    return [
+        make_inheritance_chain(directory, depth=3),
+        make_inheritance_chain(directory, depth=50),
+        make_include_fanout(directory, width=50),
+        make_include_diamond(directory, levels=10),
+        make_many_profiles(directory, profiles=1000),
+        make_deep_nesting(directory, depth=100),
+        make_variables(directory, count=200),
+    ]
+
+
+def _make_section_lines(keys, indent, prefix=''):
+    """
+    :type keys: int
+    :type indent: int
+    :type prefix: str
+    :rtype: list
+    """
+    lines = []
+    for section in range(max(keys // 5, 1)):
+        lines.append('{}{}section{}:'.format('  ' * indent, prefix, section))
+        lines.append('{}number: {}'.format('  ' * (indent + 1), section))
+        lines.append('{}text: value {}'.format('  ' * (indent + 1), section))
+        lines.append('{}flag: true'.format('  ' * (indent + 1)))
+        lines.append('{}items: [1, 2, 3]'.format('  ' * (indent + 1)))
+    return lines
+
+
+def _write_file(directory, name, lines):
+    """
+    :type directory: str
+    :type name: str
+    :type lines: list
+    :rtype: str
+    """
+    path = os.path.join(directory, name)
+    with open(path, 'w') as fd:
+        fd.write('\n'.join(lines) + '\n')
+    return path
@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+"""
+Benchmark of glob includes of many drop-in fragments, where one fragment is added to the directory
+
+Usage: python benchmarks/glob_include.py [FRAGMENTS]
+"""
+from __future__ import print_function
+import os
+import shutil
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+import octoconf  # noqa: E402 pylint: disable=wrong-import-position
+from octoconf.octoconf import INCLUDE_FILE_SPECIFIER  # noqa: E402 pylint: disable=wrong-import-position
+
+MAIN_YAML = '\n'.join([
+    'USED_CONFIG>: Service',
+    '{}: conf.d/*.yml'.format(INCLUDE_FILE_SPECIFIER),
+    'Service:',
+    '  name: service',
+]) + '\n'
+
+
+def write_fragment(directory, index):
+    """
+    :type directory: str
+    :type index: int
+    """
+    lines = ['Service:', '  fragment{}:'.format(index)]
+    lines.extend('    key{}: value {}'.format(key, key) for key in range(20))
+    with open(os.path.join(directory, '{:04d}-fragment.yml'.format(index)), 'w') as fd:
+        fd.write('\n'.join(lines) + '\n')
+
+
+def add_fragment(conf_dir, index):
+    """
+    Add a fragment, and move the modification time of the directory forward (like a later deploy)
+
+    :type conf_dir: str
+    :type index: int
+    """
+    stat = os.stat(conf_dir)
+    write_fragment(conf_dir, index)
+    os.utime(conf_dir, (stat.st_atime, stat.st_mtime + index))
+
+
+def main():
+    fragments = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    directory = tempfile.mkdtemp()
+    try:
+        conf_dir = os.path.join(directory, 'conf.d')
+        os.mkdir(conf_dir)
+        for index in range(fragments - 1):
+            write_fragment(conf_dir, index)
+
+        cache = octoconf.MemoryCache()
+        octoconf.loads(MAIN_YAML, include_cwd=directory, cache=cache)
+
+        def load_without_cache():
+            return octoconf.loads(MAIN_YAML, include_cwd=directory)
+
+        state = {'next_index': fragments - 1}
+
+        def load_after_new_fragment():
+            add_fragment(conf_dir, state['next_index'])
+            state['next_index'] += 1
+            return octoconf.loads(MAIN_YAML, include_cwd=directory, cache=cache)
+
+        print('{} fragments'.format(fragments))
+        for title, function in (('load without cache', load_without_cache),
+                                ('new fragment, cached', load_after_new_fragment)):
+            seconds = min(timeit.repeat(function, number=1, repeat=5))
+            print('    {:<24} {:10.1f} ms/load'.format(title, seconds * 1e3))
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
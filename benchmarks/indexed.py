@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+"""
+Benchmark of selecting one tenant of multi-tenant files by a full load and by the profile index
+
+Usage: python benchmarks/indexed.py
+"""
+from __future__ import print_function
+import os
+import shutil
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+import octoconf  # noqa: E402 pylint: disable=wrong-import-position
+from octoconf.octoconf import BASE_CONFIG_SELECTOR  # noqa: E402 pylint: disable=wrong-import-position
+
+TENANT_COUNTS = (100, 1000, 10000)
+NUMBER = 5
+
+
+def write_tenants(path, tenants):
+    """
+    :type path: str
+    :type tenants: int
+    """
+    lines = ['Base:', '  color: green', '  size: 1']
+    for index in range(tenants):
+        lines.extend([
+            'Tenant{}:'.format(index),
+            '  {}: Base'.format(BASE_CONFIG_SELECTOR),
+            '  name: tenant {}'.format(index),
+            '  database:',
+            '    host: db{}.example.com'.format(index),
+            '    port: 5432',
+            '    options: [ssl, pool]',
+        ])
+    with open(path, 'w') as fd:
+        fd.write('\n'.join(lines) + '\n')
+
+
+def main():
+    directory = tempfile.mkdtemp()
+    try:
+        for tenants in TENANT_COUNTS:
+            path = os.path.join(directory, 'tenants_{}.yml'.format(tenants))
+            write_tenants(path, tenants)
+            used_config = 'Tenant{}'.format(tenants // 2)
+
+            def full_load():
+                with open(path) as fd:
+                    return octoconf.load(fd, used_config=used_config)
+
+            def indexed_load():
+                return octoconf.load_indexed(path, used_config=used_config)
+
+            assert full_load().get_dict() == indexed_load().get_dict()
+
+            print('{} tenants ({:.1f} KiB)'.format(tenants, os.path.getsize(path) / 1024.0))
+            for title, function in (('full load', full_load), ('indexed load', indexed_load)):
+                seconds = min(timeit.repeat(function, number=NUMBER, repeat=3)) / NUMBER
+                print('    {:<20} {:10.3f} ms/load'.format(title, seconds * 1e3))
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,180 @@
+#!/usr/bin/env python
+"""
+Benchmark of config loads on synthetic config shapes
+
+It measures the load latency, the peak memory of a load and the ConfigObject access cost for every available YAML
+loader, and prints the results as JSON, so the results of commits can be compared.
+
+Usage: python benchmarks/load.py [--number N] [--filter SUBSTRING] [--output results.json]
+"""
+from __future__ import print_function
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+
+import yaml
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCHMARKS_DIR, os.pardir))
+sys.path.insert(0, BENCHMARKS_DIR)
+
+import octoconf  # noqa: E402 pylint: disable=wrong-import-position
+from generator import make_default_scenarios  # noqa: E402 pylint: disable=wrong-import-position
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+ACCESS_NUMBER = 10000
+
+
+def get_loaders():
+    """
+    :rtype: list
+    """
+    loaders = [yaml.Loader, yaml.SafeLoader]
+    if octoconf.LIBYAML_AVAILABLE:
+        loaders.extend([yaml.CLoader, yaml.CSafeLoader])
+    return loaders
+
+
+def load(scenario, yaml_string, loader):
+    """
+    :type scenario: generator.Scenario
+    :type yaml_string: str
+    :type loader: type
+    :rtype: octoconf.ConfigObject
+    """
+    return octoconf.loads(yaml_string, variables=scenario.variables, used_config=scenario.used_config,
+                          include_cwd=os.path.dirname(scenario.path), loader=loader)
+
+
+def measure_load_seconds(scenario, yaml_string, loader, number):
+    """
+    :type scenario: generator.Scenario
+    :type yaml_string: str
+    :type loader: type
+    :type number: int
+    :rtype: float
+    """
+    return min(timeit.repeat(lambda: load(scenario, yaml_string, loader), number=number, repeat=3)) / number
+
+
+def measure_peak_memory(scenario, yaml_string, loader):
+    """
+    :type scenario: generator.Scenario
+    :type yaml_string: str
+    :type loader: type
+    :rtype: int or None
+    """
+    if tracemalloc is None:
+        return None
+
+    tracemalloc.start()
+    try:
+        load(scenario, yaml_string, loader)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def measure_access_ns(scenario, yaml_string, loader):
+    """
+    :type scenario: generator.Scenario
+    :type yaml_string: str
+    :type loader: type
+    :rtype: dict
+    """
+    config = load(scenario, yaml_string, loader)
+    read_attributes = eval('lambda: config.' + '.'.join(scenario.access_path),  # pylint: disable=eval-used
+                           {'config': config})
+
+    def read_path():
+        return config.get_path(scenario.access_path)
+
+    attribute_seconds = min(timeit.repeat(read_attributes, number=ACCESS_NUMBER, repeat=3))
+    path_seconds = min(timeit.repeat(read_path, number=ACCESS_NUMBER, repeat=3))
+    return {
+        'attribute_access_ns': attribute_seconds / ACCESS_NUMBER * 1e9,
+        'get_path_ns': path_seconds / ACCESS_NUMBER * 1e9,
+    }
+
+
+def get_git_commit():
+    """
+    :rtype: str or None
+    """
+    try:
+        output = subprocess.check_output(['git', 'rev-parse', 'HEAD'], stderr=subprocess.STDOUT,
+                                         cwd=BENCHMARKS_DIR)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return output.decode('ascii').strip()
+
+
+def run(number, name_filter=None):
+    """
+    :type number: int
+    :type name_filter: str or None
+    :rtype: dict
+    """
+    directory = tempfile.mkdtemp(prefix='octoconf-benchmark-')
+    try:
+        results = []
+        for scenario in make_default_scenarios(directory):
+            if name_filter and name_filter not in scenario.name:
+                continue
+
+            with open(scenario.path) as fd:
+                yaml_string = fd.read()
+
+            for loader in get_loaders():
+                result = {
+                    'scenario': scenario.name,
+                    'loader': loader.__name__,
+                    'load_seconds': measure_load_seconds(scenario, yaml_string, loader, number),
+                    'peak_memory_bytes': measure_peak_memory(scenario, yaml_string, loader),
+                }
+                result.update(measure_access_ns(scenario, yaml_string, loader))
+                results.append(result)
+    finally:
+        shutil.rmtree(directory)
+
+    return {
+        'meta': {
+            'commit': get_git_commit(),
+            'time': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'pyyaml': yaml.__version__,
+            'number': number,
+        },
+        'results': results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark of config loads on synthetic config shapes')
+    parser.add_argument('--number', type=int, default=10, help='loads per measurement (default: %(default)s)')
+    parser.add_argument('--filter', dest='name_filter', help='run the scenarios what contain this substring only')
+    parser.add_argument('--output', help='write the JSON results into this file instead of the stdout')
+    args = parser.parse_args()
+
+    report = json.dumps(run(args.number, name_filter=args.name_filter), indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, 'w') as fd:
+            fd.write(report + '\n')
+    else:
+        print(report)
+
+
+if __name__ == '__main__':
+    main()
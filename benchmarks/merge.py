@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+"""
+Benchmark of the merge engine against the legacy recursive, in-place merge
+
+Usage: python benchmarks/merge.py
+"""
+from __future__ import print_function
+import copy
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from octoconf.octoconf import Mapping, _merge_dicts  # noqa: E402 pylint: disable=wrong-import-position
+
+NUMBER = 20
+
+
+def legacy_update_dict_recursive(base, update):
+    """
+    The previous merge, what changes the base in place (so the base has to be copied before every merge)
+
+    :type base: dict
+    :type update: dict
+    :rtype: dict
+    """
+    for k, v in update.items():
+        if isinstance(v, Mapping):
+            base[k] = legacy_update_dict_recursive(base.get(k, {}), v)
+        else:
+            base[k] = update[k]
+    return base
+
+
+def make_tree(width, depth, value):
+    """
+    :type width: int
+    :type depth: int
+    :type value: object
+    :rtype: dict
+    """
+    if not depth:
+        return {'key{}'.format(index): value for index in range(width)}
+    return {'section{}'.format(index): make_tree(width, depth - 1, value) for index in range(width)}
+
+
+def make_sparse_update(width, depth, value):
+    """
+    Update of one leaf on every level
+
+    :type width: int
+    :type depth: int
+    :type value: object
+    :rtype: dict
+    """
+    if not depth:
+        return {'key0': value}
+    return {'section0': make_sparse_update(width, depth - 1, value), 'key0': value}
+
+
+SHAPES = [
+    ('wide base, sparse update', make_tree(10, 3, 1), make_sparse_update(10, 3, 2)),
+    ('wide base, full update', make_tree(10, 3, 1), make_tree(10, 3, 2)),
+    ('deep base, sparse update', make_tree(2, 12, 1), make_sparse_update(2, 12, 2)),
+]
+
+
+def measure_legacy_in_place(base, update):
+    """
+    Time of the in-place merge only (the base copies are made outside of the measurement)
+
+    :type base: dict
+    :type update: dict
+    :rtype: float
+    """
+    best_seconds = None
+    for _ in range(3):
+        bases = [copy.deepcopy(base) for _ in range(NUMBER)]
+        started = timeit.default_timer()
+        for base_copy in bases:
+            legacy_update_dict_recursive(base_copy, update)
+        seconds = (timeit.default_timer() - started) / NUMBER
+        best_seconds = seconds if best_seconds is None else min(best_seconds, seconds)
+    return best_seconds
+
+
+def main():
+    for title, base, update in SHAPES:
+        assert legacy_update_dict_recursive(copy.deepcopy(base), update) == _merge_dicts(base, update)
+
+        legacy_seconds = min(timeit.repeat(lambda: legacy_update_dict_recursive(copy.deepcopy(base), update),
+                                           number=NUMBER, repeat=3)) / NUMBER
+        legacy_in_place_seconds = measure_legacy_in_place(base, update)
+        merge_seconds = min(timeit.repeat(lambda: _merge_dicts(base, update), number=NUMBER, repeat=3)) / NUMBER
+
+        print(title)
+        print('    {:<40} {:10.1f} us/merge'.format('legacy (deep copy of base + merge)', legacy_seconds * 1e6))
+        print('    {:<40} {:10.1f} us/merge'.format('legacy (in-place merge only)', legacy_in_place_seconds * 1e6))
+        print('    {:<40} {:10.1f} us/merge'.format('_merge_dicts', merge_seconds * 1e6))
+
+
+if __name__ == '__main__':
+    main()
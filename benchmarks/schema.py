@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+"""
+Benchmark of the hot-path reads of typed values: converting the raw values of ConfigObject at every read against the
+values of a schema, what were coerced once at load
+
+Usage: python benchmarks/schema.py
+"""
+from __future__ import print_function
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+import octoconf  # noqa: E402 pylint: disable=wrong-import-position
+from octoconf import Schema, Duration, Url  # noqa: E402 pylint: disable=wrong-import-position
+
+NUMBER = 100000
+
+YAML_STRING = """
+Production:
+  port: '8080'
+  timeout: 1m 30s
+  endpoint: https://example.com/api
+  database:
+    pool_size: '16'
+"""
+
+SCHEMA = Schema({
+    'port': int,
+    'timeout': Duration(),
+    'endpoint': Url(schemes=['https']),
+    'database': {
+        'pool_size': int,
+    },
+})
+
+DURATION = Duration()
+URL = Url(schemes=['https'])
+
+
+def read_raw(config):
+    return (int(config.port), DURATION(config.timeout), URL(config.endpoint), int(config.database.pool_size))
+
+
+def read_typed(config):
+    return config.port, config.timeout, config.endpoint, config.database.pool_size
+
+
+def main():
+    raw_config = octoconf.loads(YAML_STRING, used_config='Production')
+    typed_config = octoconf.loads(YAML_STRING, used_config='Production', schema=SCHEMA)
+    assert read_raw(raw_config) == read_typed(typed_config)
+
+    load_seconds = min(timeit.repeat(lambda: octoconf.loads(YAML_STRING, used_config='Production'),
+                                     number=100, repeat=3)) / 100
+    typed_load_seconds = min(timeit.repeat(
+        lambda: octoconf.loads(YAML_STRING, used_config='Production', schema=SCHEMA), number=100, repeat=3)) / 100
+    raw_seconds = min(timeit.repeat(lambda: read_raw(raw_config), number=NUMBER, repeat=3)) / NUMBER
+    typed_seconds = min(timeit.repeat(lambda: read_typed(typed_config), number=NUMBER, repeat=3)) / NUMBER
+
+    print('{:<44} {:10.1f} us/load'.format('load', load_seconds * 1e6))
+    print('{:<44} {:10.1f} us/load'.format('load with schema', typed_load_seconds * 1e6))
+    print('{:<44} {:10.3f} us/read'.format('ConfigObject + conversion at every read', raw_seconds * 1e6))
+    print('{:<44} {:10.3f} us/read'.format('schema (coerced at load)', typed_seconds * 1e6))
+
+
+if __name__ == '__main__':
+    main()
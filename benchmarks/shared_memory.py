@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+"""
+Benchmark of the private memory of a worker process, what needs the resolved config
+
+Usage: python benchmarks/shared_memory.py [SECTIONS]
+"""
+from __future__ import print_function
+import gc
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+import octoconf  # noqa: E402 pylint: disable=wrong-import-position
+
+KEYS = 20
+ACCESSED_SECTIONS = 10
+
+
+def make_yaml(sections):
+    """
+    :type sections: int
+    :rtype: str
+    """
+    lines = ['Profile:']
+    for section in range(sections):
+        lines.append('  section{}:'.format(section))
+        lines.extend('    key{}: value {} of section {}'.format(key, key, section) for key in range(KEYS))
+    return '\n'.join(lines) + '\n'
+
+
+def measure_private_bytes(get_config):
+    """
+    Allocated bytes after getting the config and reading a few sections of it
+
+    :type get_config: callable
+    :rtype: int
+    """
+    gc.collect()
+    tracemalloc.start()
+    config = get_config()
+    for section in range(ACCESSED_SECTIONS):
+        assert config['section{}'.format(section)]['key0'].startswith('value 0')
+    gc.collect()
+    allocated_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return allocated_bytes
+
+
+def main():
+    sections = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    yaml_string = make_yaml(sections)
+    config = octoconf.loads(yaml_string, used_config='Profile')
+    pickled_config = pickle.dumps(config.get_dict(), protocol=2)
+
+    directory = tempfile.mkdtemp()
+    try:
+        path = os.path.join(directory, 'config.bin')
+        published_bytes = octoconf.publish_config(config, path)
+
+        print('{} sections, {:.1f} KiB published (shared by the workers)'.format(sections, published_bytes / 1024.0))
+        for title, get_config in (
+                ('parse in worker', lambda: octoconf.loads(yaml_string, used_config='Profile')),
+                ('pickled copy', lambda: octoconf.ConfigObject(pickle.loads(pickled_config))),
+                ('attach_config', lambda: octoconf.attach_config(path)),
+        ):
+            print('    {:<20} {:10.1f} KiB/worker'.format(title, measure_private_bytes(get_config) / 1024.0))
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
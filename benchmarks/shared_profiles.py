@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+"""
+Benchmark of the memory of ``loads_all()``, where thousands of profiles override a few keys of a big base profile
+
+Usage: python benchmarks/shared_profiles.py [PROFILES]
+"""
+from __future__ import print_function
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+import octoconf  # noqa: E402 pylint: disable=wrong-import-position
+from octoconf.octoconf import BASE_CONFIG_SELECTOR  # noqa: E402 pylint: disable=wrong-import-position
+
+BASE_SECTIONS = 50
+BASE_KEYS = 20
+
+
+def make_yaml(profiles):
+    """
+    :type profiles: int
+    :rtype: str
+    """
+    lines = ['Base:']
+    for section in range(BASE_SECTIONS):
+        lines.append('  section{}:'.format(section))
+        lines.extend('    key{}: value {}'.format(key, key) for key in range(BASE_KEYS))
+
+    for index in range(profiles):
+        lines.extend([
+            'Customer{}:'.format(index),
+            '  {}: Base'.format(BASE_CONFIG_SELECTOR),
+            '  section0:',
+            '    key0: customer {}'.format(index),
+        ])
+    return '\n'.join(lines) + '\n'
+
+
+def measure_retained_bytes(yaml_string, shared):
+    """
+    :type yaml_string: str
+    :type shared: bool
+    :rtype: int
+    """
+    gc.collect()
+    tracemalloc.start()
+    configs = octoconf.loads_all(yaml_string, shared=shared)
+    gc.collect()
+    retained_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    assert 'customer 0' == configs['Customer0'].section0.key0
+    return retained_bytes
+
+
+def main():
+    profiles = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    yaml_string = make_yaml(profiles)
+
+    print('{} profiles, {} keys in the base'.format(profiles, BASE_SECTIONS * BASE_KEYS))
+    for shared in (False, True):
+        retained_bytes = measure_retained_bytes(yaml_string, shared)
+        print('    {:<20} {:10.1f} MiB'.format('shared={}'.format(shared), retained_bytes / 1024.0 / 1024.0))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,12 +1,46 @@
 # pylint: disable=invalid-name
+import sys
 
 from .octoconf import (
     Octoconf as _Octoconf,
     ConfigObject,
+    LoadStats,
     CircularDependencyError,
     UndefinedVariableError,
     CircularIncludeError,
+    PurePythonLoaderWarning,
+    LIBYAML_AVAILABLE,
+    set_default_loader,
 )
+from .cache import DiskCache, MemoryCache
+from .frozen import FrozenConfigObject
+from .watcher import ConfigWatcher
+from .template import ConfigTemplate
+from .compiled import StaleArtifactError, compile_config, load_compiled
+from .index import build_index, load_indexed
+from .shared import publish_config, attach_config
+from .schema import Schema, SchemaError, Optional, Duration, Url
 
 load = _Octoconf.load
 loads = _Octoconf.loads
+load_all = _Octoconf.load_all
+loads_all = _Octoconf.loads_all
+load_template = ConfigTemplate.load
+loads_template = ConfigTemplate.loads
+
+if sys.version_info >= (3, 5):
+    # the asyncio is imported at the first call only, so it does not slow down the import of the synchronous users
+
+    def aload(*args, **kwargs):
+        """
+        See ``octoconf.aio.aload()``
+        """
+        from .aio import aload as _aload
+        return _aload(*args, **kwargs)
+
+    def aloads(*args, **kwargs):
+        """
+        See ``octoconf.aio.aloads()``
+        """
+        from .aio import aloads as _aloads
+        return _aloads(*args, **kwargs)
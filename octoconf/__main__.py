@@ -0,0 +1,72 @@
+"""
+Command line interface of octoconf
+
+Usage: octoconf compile <config.yml> -o <artifact.json> [-p PROFILE ...] [-v NAME=VALUE ...]
+       octoconf index <config.yml> [-o <config.yml.octoindex>]
+"""
+from __future__ import print_function
+import argparse
+import sys
+
+from .compiled import compile_config, ARTIFACT_FORMATS
+from .index import build_index, get_index_path
+
+
+def parse_variable(text):
+    """
+    :type text: str
+    :rtype: tuple
+    """
+    name, separator, value = text.partition('=')
+    if not separator:
+        raise argparse.ArgumentTypeError('variable has to be in NAME=VALUE format: {!r}'.format(text))
+    return name, value
+
+
+def get_parser():
+    """
+    :rtype: argparse.ArgumentParser
+    """
+    parser = argparse.ArgumentParser(prog='octoconf', description='Multi-profile supported, flexible config library')
+    subparsers = parser.add_subparsers(dest='command')
+    subparsers.required = True
+
+    compile_parser = subparsers.add_parser('compile', help='resolve a config file into a YAML-free artifact')
+    compile_parser.add_argument('path', help='root config file')
+    compile_parser.add_argument('-o', '--output', required=True, help='path of the artifact')
+    compile_parser.add_argument('-p', '--profile', dest='profiles', action='append',
+                                help='used profile (repeatable; default: the USED_CONFIG> of the file)')
+    compile_parser.add_argument('-v', '--variable', dest='variables', action='append', type=parse_variable,
+                                default=[], help='variable in NAME=VALUE format (repeatable)')
+    compile_parser.add_argument('--include-cwd', help='base directory of the relative includes')
+    compile_parser.add_argument('--format', dest='artifact_format', choices=ARTIFACT_FORMATS,
+                                help='artifact format (default: by the extension of the output, or json)')
+
+    index_parser = subparsers.add_parser('index', help='write the profile index of a config file for load_indexed()')
+    index_parser.add_argument('path', help='config file')
+    index_parser.add_argument('-o', '--output', help='path of the index (default: <path>.octoindex)')
+    return parser
+
+
+def main(argv=None):
+    """
+    :type argv: list or None
+    :rtype: int
+    """
+    args = get_parser().parse_args(argv)
+
+    if args.command == 'index':
+        index_path = args.output or get_index_path(args.path)
+        index = build_index(args.path, index_path=index_path)
+        print('indexed {} top level node(s) into {}'.format(len(index['ranges']), index_path))
+        return 0
+
+    artifact = compile_config(args.path, args.output, used_configs=args.profiles, variables=dict(args.variables),
+                              include_cwd=args.include_cwd, artifact_format=args.artifact_format)
+    print('compiled {} profile(s) from {} source(s) into {}'.format(
+        len(artifact['profiles']), len(artifact['sources']), args.output))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
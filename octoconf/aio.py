@@ -0,0 +1,164 @@
+"""
+Asyncio API of octoconf (requires Python 3.5+)
+
+The loads run in an executor, so the file reads and the YAML parsing do not block the event loop.
+"""
+import asyncio
+import concurrent.futures
+import copy
+import functools
+import os
+import threading
+
+from .cache import get_digest
+from .octoconf import Octoconf, ConfigObject, _get_config_data
+
+INCLUDE_WORKERS = 4
+
+_in_flight_loads = {}
+_include_executor = None
+_include_executor_lock = threading.Lock()
+
+
+async def aload(path, variables=None, used_config=None, include_cwd=None, cache=None, stats=None, lazy=False,
+                frozen=False, selective=False, loader=None, schema=None, executor=None, include_executor=None):
+    """
+    Load config from a YAML file in the ``executor`` (default: the executor of the event loop)
+
+    The relative includes are relative to the directory of the file by default. The concurrent loads of the same
+    file with the same arguments share one load (except the loads with ``stats``).
+
+    See ``Octoconf.loads()`` for the other arguments, and ``aloads()`` for the ``include_executor``.
+
+    :type path: str
+    :type variables: dict or None
+    :type used_config: str or None
+    :type include_cwd: str or None
+    :type cache: octoconf.cache.DiskCache or octoconf.cache.MemoryCache or None
+    :type stats: octoconf.LoadStats or None
+    :type lazy: bool
+    :type frozen: bool
+    :type selective: bool
+    :type loader: type or None
+    :type schema: octoconf.schema.Schema or None
+    :type executor: concurrent.futures.Executor or None
+    :type include_executor: concurrent.futures.Executor or None
+    :rtype: ConfigObject or octoconf.frozen.FrozenConfigObject
+    """
+    path = os.path.abspath(path)
+    if include_cwd is None:
+        include_cwd = os.path.dirname(path)
+
+    load = functools.partial(_load_file, path, variables=variables, used_config=used_config, include_cwd=include_cwd,
+                             cache=cache, stats=stats, executor=include_executor or _get_include_executor(),
+                             lazy=lazy, frozen=frozen, selective=selective, loader=loader, schema=schema)
+    options = (used_config, include_cwd, lazy, frozen, selective, loader, id(schema))
+    return await _share_load(load, path, variables, options, executor=executor, shared=stats is None)
+
+
+async def aloads(yaml_string, variables=None, used_config=None, include_cwd=None, cache=None, stats=None,
+                 lazy=False, frozen=False, selective=False, loader=None, schema=None, executor=None,
+                 include_executor=None):
+    """
+    Load config from YAML contained string in the ``executor`` (default: the executor of the event loop)
+
+    The sibling includes are read and parsed concurrently by the ``include_executor`` (default: a shared thread pool
+    of ``INCLUDE_WORKERS`` threads). It should not be the same bounded pool as the ``executor``, because the loads
+    wait for the includes in the ``executor``.
+
+    See ``Octoconf.loads()`` for the other arguments.
+
+    :type yaml_string: str
+    :type variables: dict or None
+    :type used_config: str or None
+    :type include_cwd: str or None
+    :type cache: octoconf.cache.DiskCache or octoconf.cache.MemoryCache or None
+    :type stats: octoconf.LoadStats or None
+    :type lazy: bool
+    :type frozen: bool
+    :type selective: bool
+    :type loader: type or None
+    :type schema: octoconf.schema.Schema or None
+    :type executor: concurrent.futures.Executor or None
+    :type include_executor: concurrent.futures.Executor or None
+    :rtype: ConfigObject or octoconf.frozen.FrozenConfigObject
+    """
+    load = functools.partial(Octoconf.loads, yaml_string, variables=variables, used_config=used_config,
+                             include_cwd=include_cwd, cache=cache, stats=stats,
+                             executor=include_executor or _get_include_executor(), lazy=lazy, frozen=frozen,
+                             selective=selective, loader=loader, schema=schema)
+    options = (used_config, include_cwd, lazy, frozen, selective, loader, id(schema))
+    return await _share_load(load, get_digest(yaml_string), variables, options, executor=executor,
+                             shared=stats is None)
+
+
+async def _share_load(load, source, variables, options, executor=None, shared=True):
+    """
+    Run the load in the executor, or wait for the same load what is already in flight
+
+    The callers of a shared load get their own deep copies of the result, so the changes of a caller are private (the
+    frozen configs are shared as they are). The copies are made in the executor, and a load without other callers
+    returns its result without copy.
+
+    :type load: callable
+    :type source: str
+    :type variables: dict or None
+    :type options: tuple
+    :type executor: concurrent.futures.Executor or None
+    :type shared: bool
+    :rtype: ConfigObject or octoconf.frozen.FrozenConfigObject
+    """
+    loop = asyncio.get_event_loop()
+    if not shared:
+        return await loop.run_in_executor(executor, load)
+
+    flight_key = _get_flight_key(loop, source, variables, options)
+    flight = _in_flight_loads.get(flight_key)
+    if flight is None:
+        # the flight is the future of the load and the count of its callers
+        flight = _in_flight_loads[flight_key] = [loop.run_in_executor(executor, load), 0]
+        flight[0].add_done_callback(lambda _future: _in_flight_loads.pop(flight_key, None))
+    flight[1] += 1
+
+    # the shield keeps the shared load running, when a waiting caller is cancelled; the flight is closed before the
+    # callers are woken up, so the count of callers is final here
+    config = await asyncio.shield(flight[0])
+    if flight[1] == 1 or not isinstance(config, ConfigObject):
+        return config
+    return ConfigObject(await loop.run_in_executor(executor, copy.deepcopy, _get_config_data(config)))
+
+
+def _load_file(path, **kwargs):
+    """
+    :type path: str
+    :rtype: ConfigObject or octoconf.frozen.FrozenConfigObject
+    """
+    with open(path) as fd:
+        return Octoconf.load(fd, **kwargs)
+
+
+def _get_flight_key(loop, source, variables, options):
+    """
+    :type loop: asyncio.AbstractEventLoop
+    :type source: str
+    :type variables: dict or None
+    :type options: tuple
+    :rtype: str
+    """
+    return repr((
+        id(loop),
+        source,
+        sorted((name, repr(value)) for name, value in (variables or {}).items()),
+        options,
+    ))
+
+
+def _get_include_executor():
+    """
+    :rtype: concurrent.futures.ThreadPoolExecutor
+    """
+    global _include_executor  # pylint: disable=global-statement
+    with _include_executor_lock:
+        if _include_executor is None:
+            _include_executor = concurrent.futures.ThreadPoolExecutor(max_workers=INCLUDE_WORKERS)
+    return _include_executor
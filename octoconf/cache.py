@@ -0,0 +1,417 @@
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+
+CACHE_FORMAT_VERSION = 2
+FRAGMENT_CACHE_MAX_ENTRIES = 4096
+DISK_CACHE_MAX_ENTRIES = 1024
+
+
+def get_digest(text):
+    """
+    :type text: str or bytes
+    :rtype: str
+    """
+    if not isinstance(text, bytes):
+        text = text.encode('utf-8')
+    return hashlib.sha1(text).hexdigest()
+
+
+def get_cache_key(yaml_string, variables, used_config, include_cwd, loader=None):
+    """
+    Fingerprint of everything what is known about a load before parsing it
+
+    The ``variables`` are the constant variables and the used variables of the root YAML; the resolved values of the
+    other used variables are checked by ``get()``.
+
+    :type yaml_string: str
+    :type variables: dict
+    :type used_config: str or None
+    :type include_cwd: str or None
+    :type loader: type or None
+    :rtype: str
+    """
+    key = repr((
+        CACHE_FORMAT_VERSION,
+        get_digest(yaml_string),
+        sorted((name, repr(value)) for name, value in variables.items()),
+        used_config,
+        os.path.abspath(include_cwd or os.curdir),
+        '{}.{}'.format(loader.__module__, loader.__name__) if loader is not None else None,
+    ))
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+
+def get_file_cache_key(abs_path, loader=None):
+    """
+    Fingerprint of the parse of an included file (its variables are checked by ``get()``)
+
+    :type abs_path: str
+    :type loader: type or None
+    :rtype: str
+    """
+    key = repr((
+        CACHE_FORMAT_VERSION,
+        'file',
+        abs_path,
+        '{}.{}'.format(loader.__module__, loader.__name__) if loader is not None else None,
+    ))
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+
+def write_file_atomically(path, data, mode=0o644):
+    """
+    Write the file through a unique temporary file, what replaces the file by one rename, so the readers see the old
+    or the new content only (the temporary file is removed at failure)
+
+    :type path: str
+    :type data: bytes
+    :type mode: int
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as tmp_fd:
+            tmp_fd.write(data)
+        # the mkstemp() creates the file for the owner only
+        os.chmod(tmp_path, mode)
+        replace_file(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def replace_file(src, dst):
+    """
+    :type src: str
+    :type dst: str
+    """
+    try:
+        os.rename(src, dst)
+    except OSError:
+        # the rename does not replace the existing files on Windows
+        if os.path.exists(dst):
+            os.remove(dst)
+        os.rename(src, dst)
+
+
+def get_source_fingerprints(sources):
+    """
+    :type sources: dict
+    :rtype: list
+    """
+    fingerprints = []
+    for path, digest in sorted(sources.items()):
+        stat = os.stat(path)
+        fingerprints.append((path, stat.st_mtime, stat.st_size, digest))
+    return fingerprints
+
+
+def get_variable_fingerprints(variables):
+    """
+    :type variables: dict or None
+    :rtype: list
+    """
+    return sorted((name, repr(value)) for name, value in (variables or {}).items())
+
+
+def are_variables_fresh(fingerprints, variables):
+    """
+    Resolve the used variables of the cached load again, so the not used providers are not called
+
+    :type fingerprints: list
+    :type variables: dict or Mapping
+    :rtype: bool
+    """
+    for name, value in fingerprints:
+        try:
+            if repr(variables[name]) != value:
+                return False
+        except KeyError:
+            return False
+    return True
+
+
+def are_sources_fresh(fingerprints):
+    """
+    Check the stats of the sources first, and compare the content only if those were changed
+
+    :type fingerprints: list
+    :rtype: bool
+    """
+    for path, mtime, size, digest in fingerprints:
+        try:
+            stat = os.stat(path)
+            if (stat.st_mtime, stat.st_size) == (mtime, size):
+                continue
+            with open(path) as fd:
+                if get_digest(fd.read()) != digest:
+                    return False
+        except (IOError, OSError):
+            return False
+    return True
+
+
+class DiskCache(object):
+    def __init__(self, directory, max_entries=DISK_CACHE_MAX_ENTRIES):
+        """
+        Store resolved configs in the directory, keyed by the fingerprint of the root YAML and the load parameters
+
+        The entries are read by ``pickle``, what can run any code of the files, so the directory has to be private to
+        the owner of the process (it is created for the owner only, and the entries are readable by the owner only).
+        The stale entries are removed at their read, and only the last used ``max_entries`` entries are kept (None
+        means no limit).
+
+        :type directory: str
+        :type max_entries: int or None
+        """
+        self.__directory = directory
+        self.__max_entries = max_entries
+
+    def get(self, key, variables=None):
+        """
+        :type key: str
+        :type variables: dict or Mapping or None
+        :rtype: dict or None
+        """
+        path = self.__get_path(key)
+        try:
+            with open(path, 'rb') as fd:
+                fingerprints, variable_fingerprints, config = pickle.load(fd)
+        except Exception:  # pylint: disable=broad-except
+            return None
+
+        if not are_sources_fresh(fingerprints):
+            self.__remove(path)
+            return None
+        if variables is not None and not are_variables_fresh(variable_fingerprints, variables):
+            return None
+
+        # the modification time orders the entries for the pruning
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        return config
+
+    def set(self, key, config, sources, variables=None):
+        """
+        :type key: str
+        :type config: dict
+        :type sources: dict
+        :type variables: dict or None
+        """
+        try:
+            if not os.path.isdir(self.__directory):
+                os.makedirs(self.__directory, 0o700)
+
+            entry = (get_source_fingerprints(sources), get_variable_fingerprints(variables), config)
+            write_file_atomically(self.__get_path(key), pickle.dumps(entry, pickle.HIGHEST_PROTOCOL), mode=0o600)
+            self.__prune()
+        except (IOError, OSError):
+            pass
+
+    def __prune(self):
+        """
+        Remove the least recently used entries above the ``max_entries``
+        """
+        if self.__max_entries is None:
+            return
+
+        entries = []
+        for name in os.listdir(self.__directory):
+            if not name.endswith('.cache'):
+                continue
+            path = os.path.join(self.__directory, name)
+            try:
+                entries.append((os.stat(path).st_mtime, path))
+            except OSError:
+                pass
+
+        entries.sort()
+        for _mtime, path in entries[:max(len(entries) - self.__max_entries, 0)]:
+            self.__remove(path)
+
+    @staticmethod
+    def __remove(path):
+        """
+        :type path: str
+        """
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def __get_path(self, key):
+        """
+        :type key: str
+        :rtype: str
+        """
+        return os.path.join(self.__directory, '{}.cache'.format(key))
+
+
+class MemoryCache(object):
+    def __init__(self, max_entries=128, max_bytes=None):
+        """
+        Thread-safe LRU store of resolved configs in the memory of the process
+
+        The configs are kept pickled, so every caller gets its own copy which is safe to change.
+
+        :type max_entries: int or None
+        :type max_bytes: int or None
+        """
+        self.__max_entries = max_entries
+        self.__max_bytes = max_bytes
+        self.__entries = OrderedDict()
+        self.__size = 0
+        self.__lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.__entries)
+
+    @property
+    def size(self):
+        """
+        :rtype: int
+        """
+        return self.__size
+
+    def get(self, key, variables=None):
+        """
+        :type key: str
+        :type variables: dict or Mapping or None
+        :rtype: dict or None
+        """
+        with self.__lock:
+            entry = self.__entries.pop(key, None)
+            if entry is not None:
+                self.__entries[key] = entry
+
+        if entry is None:
+            return self.__miss()
+
+        fingerprints, variable_fingerprints, pickled_config = entry
+        if not are_sources_fresh(fingerprints):
+            with self.__lock:
+                if self.__entries.get(key) is entry:
+                    self.__remove(key)
+            return self.__miss()
+        if variables is not None and not are_variables_fresh(variable_fingerprints, variables):
+            return self.__miss()
+
+        with self.__lock:
+            self.hits += 1
+        return pickle.loads(pickled_config)
+
+    def set(self, key, config, sources, variables=None):
+        """
+        :type key: str
+        :type config: dict
+        :type sources: dict
+        :type variables: dict or None
+        """
+        try:
+            entry = (get_source_fingerprints(sources), get_variable_fingerprints(variables),
+                     pickle.dumps(config, pickle.HIGHEST_PROTOCOL))
+        except (IOError, OSError):
+            return
+
+        entry_size = len(entry[2])
+        if self.__max_bytes is not None and entry_size > self.__max_bytes:
+            return
+
+        with self.__lock:
+            if key in self.__entries:
+                self.__remove(key)
+            self.__entries[key] = entry
+            self.__size += entry_size
+
+            while self.__is_over_limit():
+                self.__remove(next(iter(self.__entries)))
+                self.evictions += 1
+
+    def clear(self):
+        with self.__lock:
+            self.__entries.clear()
+            self.__size = 0
+
+    def __miss(self):
+        with self.__lock:
+            self.misses += 1
+
+    def __is_over_limit(self):
+        """
+        :rtype: bool
+        """
+        if self.__max_entries is not None and len(self.__entries) > self.__max_entries:
+            return True
+        return self.__max_bytes is not None and self.__size > self.__max_bytes
+
+    def __remove(self, key):
+        """
+        :type key: str
+        """
+        _, _, pickled_config = self.__entries.pop(key)
+        self.__size -= len(pickled_config)
+
+
+class FragmentCache(object):
+    def __init__(self, max_entries=FRAGMENT_CACHE_MAX_ENTRIES):
+        """
+        Thread-safe LRU store of parsed included files in the memory of the process, what are validated by the stat
+        of the files
+
+        It is separated from the caches of the resolved configs, so many fragments do not evict the configs. The
+        parsed files are kept pickled, so the loads can not change them.
+
+        :type max_entries: int
+        """
+        self.__max_entries = max_entries
+        self.__entries = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def get(self, key, stat_key, variables):
+        """
+        :type key: str
+        :type stat_key: tuple
+        :type variables: dict or Mapping
+        :rtype: object or None
+        """
+        with self.__lock:
+            entry = self.__entries.pop(key, None)
+            if entry is None:
+                return None
+            self.__entries[key] = entry
+
+        entry_stat_key, variable_fingerprints, pickled_value = entry
+        if entry_stat_key != stat_key or not are_variables_fresh(variable_fingerprints, variables):
+            return None
+        return pickle.loads(pickled_value)
+
+    def set(self, key, stat_key, value, variables):
+        """
+        :type key: str
+        :type stat_key: tuple
+        :type value: object
+        :type variables: dict
+        """
+        entry = (stat_key, get_variable_fingerprints(variables), pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+        with self.__lock:
+            self.__entries.pop(key, None)
+            self.__entries[key] = entry
+            while len(self.__entries) > self.__max_entries:
+                self.__entries.popitem(last=False)
+
+    def clear(self):
+        with self.__lock:
+            self.__entries.clear()
@@ -0,0 +1,204 @@
+import json
+import marshal
+import os
+
+from .cache import get_digest, get_source_fingerprints, are_sources_fresh, write_file_atomically
+from .frozen import freeze_config
+from .octoconf import Octoconf, ConfigObject, _STRING_TYPES
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+COMPILED_FORMAT_VERSION = 1
+ARTIFACT_FORMATS = ('json', 'marshal', 'msgpack')
+
+
+class StaleArtifactError(Exception):
+    pass
+
+
+class _SourceRecorder(object):
+    def __init__(self):
+        """
+        Cache what never hits, but records the sources of the loads
+        """
+        self.sources = {}
+
+    def get(self, _key, variables=None):  # pylint: disable=unused-argument
+        return None
+
+    def set(self, _key, _config, sources, variables=None):  # pylint: disable=unused-argument
+        self.sources.update(sources)
+
+
+def compile_config(path, output_path, used_configs=None, variables=None, include_cwd=None, loader=None,
+                   artifact_format=None):
+    """
+    Resolve the used profiles of a config file, and write them into an artifact, what can be loaded without YAML
+
+    The artifact contains the fingerprints of the root and the included files for the staleness check. Without
+    ``used_configs`` the profile of the default selector is compiled (by its name). It raises ``ValueError``, when the
+    format can not store the config without changes (e.g. the non-string keys in JSON).
+
+    :type path: str
+    :type output_path: str
+    :type used_configs: list or None
+    :type variables: dict or None
+    :type include_cwd: str or None
+    :type loader: type or None
+    :type artifact_format: str or None
+    :rtype: dict
+    """
+    artifact_format = artifact_format or _get_artifact_format(output_path)
+    path = os.path.abspath(path)
+    if include_cwd is None:
+        include_cwd = os.path.dirname(path)
+
+    with open(path) as fd:
+        yaml_string = fd.read()
+
+    if not used_configs:
+        used_configs = [Octoconf._get_default_config_name(yaml_string, variables=variables, include_cwd=include_cwd,
+                                                          loader=loader)]
+
+    recorder = _SourceRecorder()
+    recorder.sources[path] = get_digest(yaml_string)
+
+    profiles = {}
+    for used_config in used_configs:
+        config = Octoconf.loads(yaml_string, variables=variables, used_config=used_config, include_cwd=include_cwd,
+                                cache=recorder, loader=loader)
+        profiles[used_config] = config.get_dict()
+
+    artifact = {
+        'version': COMPILED_FORMAT_VERSION,
+        'sources': [list(fingerprint) for fingerprint in get_source_fingerprints(recorder.sources)],
+        'default': used_configs[0],
+        'profiles': [[used_config, config] for used_config, config in profiles.items()],
+    }
+
+    data = _dump_artifact(artifact, artifact_format)
+    difference_path = _find_difference(artifact, _load_artifact(data, artifact_format))
+    if difference_path is not None:
+        raise ValueError('config can not be stored in {} artifact without changes; path={!r}'.format(
+            artifact_format, list(difference_path)))
+
+    write_file_atomically(output_path, data)
+    return artifact
+
+
+def load_compiled(path, used_config=None, check_sources=True, frozen=False, artifact_format=None):
+    """
+    Load a config from an artifact of ``compile_config()``
+
+    :type path: str
+    :type used_config: str or None
+    :type check_sources: bool
+    :type frozen: bool
+    :type artifact_format: str or None
+    :rtype: ConfigObject or octoconf.frozen.FrozenConfigObject
+    """
+    with open(path, 'rb') as fd:
+        artifact = _load_artifact(fd.read(), artifact_format or _get_artifact_format(path))
+
+    if artifact.get('version') != COMPILED_FORMAT_VERSION:
+        raise ValueError('unsupported compiled config version: {!r}'.format(artifact.get('version')))
+
+    if check_sources and not are_sources_fresh([tuple(fingerprint) for fingerprint in artifact['sources']]):
+        raise StaleArtifactError('compiled config is stale; sources={!r}'.format(
+            [fingerprint[0] for fingerprint in artifact['sources']]))
+
+    profiles = dict((name, config) for name, config in artifact['profiles'])
+    used_config = used_config or artifact['default']
+    if used_config not in profiles:
+        raise ValueError('missing used_config referred node: {!r}'.format(used_config))
+
+    if frozen:
+        return freeze_config(profiles[used_config])
+    return ConfigObject(profiles[used_config])
+
+
+def _get_artifact_format(path):
+    """
+    :type path: str
+    :rtype: str
+    """
+    extension = os.path.splitext(path)[1].lstrip('.')
+    if extension in ARTIFACT_FORMATS:
+        return extension
+    return 'json'
+
+
+def _dump_artifact(artifact, artifact_format):
+    """
+    :type artifact: dict
+    :type artifact_format: str
+    :rtype: bytes
+    """
+    try:
+        if artifact_format == 'json':
+            return json.dumps(artifact, separators=(',', ':')).encode('utf-8')
+        if artifact_format == 'marshal':
+            return marshal.dumps(artifact)
+        if artifact_format == 'msgpack':
+            return _get_msgpack().packb(artifact, use_bin_type=True)
+    except (TypeError, ValueError) as e:
+        raise ValueError('config can not be stored in {} artifact: {!s}'.format(artifact_format, e))
+    raise ValueError('unknown artifact format: {!r}'.format(artifact_format))
+
+
+def _load_artifact(data, artifact_format):
+    """
+    :type data: bytes
+    :type artifact_format: str
+    :rtype: dict
+    """
+    if artifact_format == 'json':
+        return json.loads(data.decode('utf-8'))
+    if artifact_format == 'marshal':
+        return marshal.loads(data)
+    if artifact_format == 'msgpack':
+        return _get_msgpack().unpackb(data, raw=False)
+    raise ValueError('unknown artifact format: {!r}'.format(artifact_format))
+
+
+def _find_difference(expected, actual):
+    """
+    Find the path of the first node, what was changed by the round trip of an artifact (or None)
+
+    :type expected: object
+    :type actual: object
+    :rtype: tuple or None
+    """
+    pending_nodes = [((), expected, actual)]
+    while pending_nodes:
+        path, expected, actual = pending_nodes.pop()
+        if isinstance(expected, dict) and isinstance(actual, dict):
+            changed_keys = set(expected) - set(actual) or set(actual) - set(expected)
+            if changed_keys:
+                return path + (sorted(changed_keys, key=repr)[0],)
+            pending_nodes.extend((path + (key,), value, actual[key]) for key, value in expected.items())
+        elif isinstance(expected, list) and isinstance(actual, list) and len(expected) == len(actual):
+            pending_nodes.extend((path + (index,), value, actual[index]) for index, value in enumerate(expected))
+        elif expected != actual or not _is_same_type(expected, actual):
+            return path
+    return None
+
+
+def _is_same_type(expected, actual):
+    """
+    :type expected: object
+    :type actual: object
+    :rtype: bool
+    """
+    if isinstance(expected, _STRING_TYPES) and isinstance(actual, _STRING_TYPES):
+        return True
+    return type(expected) is type(actual)
+
+
+def _get_msgpack():
+    if msgpack is None:
+        raise ImportError('the msgpack artifact format requires the msgpack package')
+    return msgpack
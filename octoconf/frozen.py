@@ -0,0 +1,192 @@
+import keyword
+import re
+import threading
+from collections import Mapping
+from pprint import pformat
+
+_IDENTIFIER_REGEX = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+FROZEN_CLASSES_MAX_ENTRIES = 1024
+FROZEN_CLASS_MAX_SLOTS = 256
+
+
+class FrozenConfigObject(object):
+    """
+    Immutable snapshot of a config
+
+    Every section has a generated class, where the nodes are slots, so the attribute reads are native.
+    """
+    __slots__ = ('__items', '__hash')
+
+    def __setattr__(self, key, value):
+        raise TypeError('{!r} object is immutable'.format(self.__class__.__name__))
+
+    def __delattr__(self, key):
+        raise TypeError('{!r} object is immutable'.format(self.__class__.__name__))
+
+    def __getattr__(self, name):
+        """
+        Fallback for the nodes, what can not be slots
+
+        :type name: str
+        """
+        if name in _FROZEN_CONFIG_OBJECT_ATTRIBUTES:
+            raise AttributeError(name)
+        try:
+            return self.__items[name]
+        except KeyError:
+            raise AttributeError('{!r} object has no attribute {!r}'.format(self.__class__.__name__, name))
+
+    def __getitem__(self, name):
+        """
+        :type name: str
+        """
+        try:
+            return self.__items[name]
+        except KeyError:
+            raise AttributeError('{!r} object has no attribute {!r}'.format(self.__class__.__name__, name))
+
+    def __setitem__(self, name, value):
+        raise TypeError('{!r} object is immutable'.format(self.__class__.__name__))
+
+    def __iter__(self):
+        return iter(self.__items)
+
+    def __len__(self):
+        return len(self.__items)
+
+    def __contains__(self, name):
+        """
+        :type name: str
+        :rtype: bool
+        """
+        return name in self.__items
+
+    def __eq__(self, other):
+        if not isinstance(other, FrozenConfigObject):
+            return NotImplemented
+        return self.__items == other.__items
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        if result is NotImplemented:
+            return result
+        return not result
+
+    def __hash__(self):
+        try:
+            return self.__hash
+        except AttributeError:
+            object.__setattr__(self, '_FrozenConfigObject__hash', hash(frozenset(self.__items.items())))
+            return self.__hash
+
+    def __reduce__(self):
+        return freeze_config, (self.get_dict(),)
+
+    def __str__(self):
+        return pformat(self.get_dict())
+
+    def __repr__(self):
+        return '{}({})'.format(self.__class__.__name__, pformat(self.get_dict()))
+
+    def get(self, name, default=None):
+        """
+        :type name: str
+        """
+        return self.__items.get(name, default)
+
+    def get_dict(self):
+        """
+        Get a mutable copy of the config
+
+        :rtype: dict
+        """
+        return {key: _thaw_value(value) for key, value in self.__items.items()}
+
+
+_FROZEN_CONFIG_OBJECT_ATTRIBUTES = ('_FrozenConfigObject__items', '_FrozenConfigObject__hash')
+_FROZEN_CONFIG_OBJECT_NAMES = frozenset(dir(FrozenConfigObject))
+
+_frozen_classes = {}
+_frozen_classes_lock = threading.Lock()
+
+
+def freeze_config(data):
+    """
+    Make an immutable snapshot of the config
+
+    :type data: dict or Mapping
+    :rtype: FrozenConfigObject
+    """
+    items = {key: _freeze_value(value) for key, value in data.items()}
+
+    frozen_class, slots = _get_frozen_class(items.keys())
+    frozen_config = object.__new__(frozen_class)
+    object.__setattr__(frozen_config, '_FrozenConfigObject__items', items)
+    for name in slots:
+        object.__setattr__(frozen_config, name, items[name])
+
+    return frozen_config
+
+
+def _get_frozen_class(keys):
+    """
+    Get the generated class and its slots of a section; the sections with the same keys share the class
+
+    The classes are kept for the process, so only ``FROZEN_CLASSES_MAX_ENTRIES`` key sets get a class, and only the
+    sections with at most ``FROZEN_CLASS_MAX_SLOTS`` slots. The other sections are ``FrozenConfigObject`` instances
+    without slots, where the reads fall back to the items.
+
+    :type keys: collections.Iterable
+    :rtype: tuple
+    """
+    slots = tuple(sorted(key for key in keys if _is_slot_name(key)))
+    frozen_class = _frozen_classes.get(slots)
+    if frozen_class is not None:
+        return frozen_class, slots
+
+    if len(slots) > FROZEN_CLASS_MAX_SLOTS:
+        return FrozenConfigObject, ()
+
+    with _frozen_classes_lock:
+        frozen_class = _frozen_classes.get(slots)
+        if frozen_class is None:
+            if len(_frozen_classes) >= FROZEN_CLASSES_MAX_ENTRIES:
+                return FrozenConfigObject, ()
+            frozen_class = type('FrozenConfigObject', (FrozenConfigObject,), {'__slots__': slots})
+            _frozen_classes[slots] = frozen_class
+
+    return frozen_class, slots
+
+
+def _is_slot_name(key):
+    """
+    :rtype: bool
+    """
+    return isinstance(key, str) \
+        and _IDENTIFIER_REGEX.match(key) is not None \
+        and not keyword.iskeyword(key) \
+        and not key.startswith('__') \
+        and key not in _FROZEN_CONFIG_OBJECT_NAMES
+
+
+def _freeze_value(value):
+    if isinstance(value, FrozenConfigObject):
+        return value
+    if isinstance(value, Mapping):
+        return freeze_config(value)
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze_value(item) for item in value)
+    if isinstance(value, set):
+        return frozenset(value)
+    return value
+
+
+def _thaw_value(value):
+    if isinstance(value, FrozenConfigObject):
+        return value.get_dict()
+    if isinstance(value, tuple):
+        return [_thaw_value(item) for item in value]
+    if isinstance(value, frozenset):
+        return set(value)
+    return value
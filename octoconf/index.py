@@ -0,0 +1,255 @@
+import json
+import mmap
+import os
+import re
+import threading
+from collections import OrderedDict
+
+import yaml
+
+from .cache import write_file_atomically
+from .octoconf import Octoconf, _get_loader, _STRING_TYPES
+
+INDEX_FORMAT_VERSION = 1
+INDEX_FILE_SUFFIX = '.octoindex'
+INDEX_CACHE_MAX_ENTRIES = 64
+
+_LINE_BREAK_PATTERN = re.compile(u'\r\n|[\n\r\x85\u2028\u2029]')
+_MERGE_TAG = u'tag:yaml.org,2002:merge'
+
+# the parsed indexes by their paths, with the stats of the index files
+_index_cache = OrderedDict()
+_index_cache_lock = threading.Lock()
+
+
+def get_index_path(path):
+    """
+    :type path: str
+    :rtype: str
+    """
+    return path + INDEX_FILE_SUFFIX
+
+
+def build_index(path, index_path=None, loader=None):
+    """
+    Write the byte ranges of the top level nodes (profiles, ``USED_CONFIG>`` and ``<INCLUDE``) of a YAML file next
+    to the file
+
+    The file has to be a block style dict on top level, and its aliases can not refer to anchors of other top level
+    nodes.
+
+    :type path: str
+    :type index_path: str or None
+    :type loader: type or None
+    :rtype: dict
+    """
+    path = os.path.abspath(path)
+    index_path = index_path or get_index_path(path)
+
+    stat = os.stat(path)
+    with open(path, 'rb') as fd:
+        data = fd.read()
+
+    index = {
+        'version': INDEX_FORMAT_VERSION,
+        'mtime': stat.st_mtime,
+        'size': stat.st_size,
+        'ranges': _get_top_level_ranges(data, _get_loader(loader)),
+    }
+
+    write_file_atomically(index_path, json.dumps(index, separators=(',', ':')).encode('utf-8'))
+    _cache_index(index_path, _get_index_stat_key(index_path), index)
+    return index
+
+
+def load_indexed(path, variables=None, used_config=None, include_cwd=None, stats=None, lazy=False, frozen=False,
+                 loader=None, index_path=None):
+    """
+    Load config from an indexed YAML file, where only the ranges of the selector, the include and the used profile
+    chain nodes are read (by mmap) and parsed
+
+    The index is (re)built, when it is missing or stale. The parsed indexes of the last ``INDEX_CACHE_MAX_ENTRIES``
+    files are kept in the process (until their index file is changed), so a load does not parse the whole index
+    again. The included files are loaded selectively (see ``Octoconf.loads()``).
+
+    :type path: str
+    :type variables: dict or None
+    :type used_config: str or None
+    :type include_cwd: str or None
+    :type stats: octoconf.LoadStats or None
+    :type lazy: bool
+    :type frozen: bool
+    :type loader: type or None
+    :type index_path: str or None
+    :rtype: octoconf.ConfigObject or octoconf.frozen.FrozenConfigObject
+    """
+    path = os.path.abspath(path)
+    index_path = index_path or get_index_path(path)
+    if include_cwd is None:
+        include_cwd = os.path.dirname(path)
+
+    index = _read_index(index_path)
+    stat = os.stat(path)
+    if index is None or (index['mtime'], index['size']) != (stat.st_mtime, stat.st_size):
+        index = build_index(path, index_path=index_path, loader=loader)
+
+    with open(path, 'rb') as fd:
+        mapped_file = mmap.mmap(fd.fileno(), 0, access=mmap.ACCESS_READ) if index['size'] else b''
+        if stats is not None:
+            stats.files_opened += 1
+
+        def read_range(start, end):
+            if stats is not None:
+                stats.bytes_read += end - start
+            return mapped_file[start:end].decode('utf-8')
+
+        try:
+            return Octoconf._loads_indexed(read_range, index['ranges'], variables=variables, used_config=used_config,
+                                           include_cwd=include_cwd, stats=stats, lazy=lazy, frozen=frozen,
+                                           loader=loader)
+        finally:
+            if index['size']:
+                mapped_file.close()
+
+
+def _read_index(index_path):
+    """
+    Read the index, or take it from the cache of the parsed indexes, when the index file was not changed
+
+    :type index_path: str
+    :rtype: dict or None
+    """
+    stat_key = _get_index_stat_key(index_path)
+    if stat_key is None:
+        return None
+
+    with _index_cache_lock:
+        cached_index = _index_cache.pop(index_path, None)
+        if cached_index is not None:
+            _index_cache[index_path] = cached_index
+    if cached_index is not None and cached_index[0] == stat_key:
+        return cached_index[1]
+
+    try:
+        with open(index_path) as fd:
+            index = json.load(fd)
+    except (IOError, OSError, ValueError):
+        return None
+
+    if not isinstance(index, dict) or index.get('version') != INDEX_FORMAT_VERSION:
+        return None
+    _cache_index(index_path, stat_key, index)
+    return index
+
+
+def _cache_index(index_path, stat_key, index):
+    """
+    :type index_path: str
+    :type stat_key: tuple or None
+    :type index: dict
+    """
+    if stat_key is None:
+        return
+
+    with _index_cache_lock:
+        _index_cache.pop(index_path, None)
+        _index_cache[index_path] = (stat_key, index)
+        while len(_index_cache) > INDEX_CACHE_MAX_ENTRIES:
+            _index_cache.popitem(last=False)
+
+
+def _get_index_stat_key(index_path):
+    """
+    The stats of the index file, what are changed by every write (the writes replace the file)
+
+    :type index_path: str
+    :rtype: tuple or None
+    """
+    try:
+        stat = os.stat(index_path)
+    except OSError:
+        return None
+    return stat.st_mtime, stat.st_size, stat.st_ino
+
+
+def _get_top_level_ranges(data, loader):
+    """
+    :type data: bytes
+    :type loader: type
+    :rtype: dict
+    """
+    yaml_string = data.decode('utf-8')
+    key_lines = []
+
+    loader_instance = loader(yaml_string)
+    try:
+        root_node = loader_instance.get_single_node()
+        if root_node is None:
+            return {}
+        if not isinstance(root_node, yaml.MappingNode) or root_node.flow_style:
+            raise ValueError('bad formatted YAML; have to be block style dict on top level for indexing')
+
+        node_owners = {}
+        for key_node, value_node in root_node.value:
+            if key_node.tag == _MERGE_TAG:
+                raise ValueError('merge key is not supported on top level of indexed YAML')
+            name = loader_instance.construct_object(key_node, deep=True)
+            if not isinstance(name, _STRING_TYPES):
+                raise ValueError('top level key has to be string for indexing: {!r}'.format(name))
+            _check_node_owner(value_node, name, node_owners)
+            key_lines.append((name, key_node.start_mark.line))
+    finally:
+        loader_instance.dispose()
+
+    line_offsets = _get_line_offsets(yaml_string, is_ascii=len(yaml_string) == len(data))
+    ranges = {}
+    for position, (name, line) in enumerate(key_lines):
+        end = line_offsets[key_lines[position + 1][1]] if position + 1 < len(key_lines) else len(data)
+        ranges[name] = [line_offsets[line], end]
+    return ranges
+
+
+def _check_node_owner(value_node, name, node_owners):
+    """
+    Deny the aliases between top level nodes, because their ranges are parsed separately
+
+    :type value_node: yaml.Node
+    :type name: str
+    :type node_owners: dict
+    """
+    pending_nodes = [value_node]
+    while pending_nodes:
+        node = pending_nodes.pop()
+        owner = node_owners.get(id(node))
+        if owner is not None:
+            if owner != name:
+                raise ValueError('alias between top level nodes is not supported for indexing: {!r} refers to {!r}'
+                                 .format(name, owner))
+            continue
+        node_owners[id(node)] = name
+
+        if isinstance(node, yaml.MappingNode):
+            for key_node, item_node in node.value:
+                pending_nodes.append(key_node)
+                pending_nodes.append(item_node)
+        elif isinstance(node, yaml.SequenceNode):
+            pending_nodes.extend(node.value)
+
+
+def _get_line_offsets(yaml_string, is_ascii):
+    """
+    Byte offsets of the lines (by the line breaks of YAML)
+
+    :type yaml_string: str
+    :type is_ascii: bool
+    :rtype: list
+    """
+    if is_ascii:
+        return [0] + [match.end() for match in _LINE_BREAK_PATTERN.finditer(yaml_string)]
+
+    line_offsets = [0]
+    line_start = 0
+    for match in _LINE_BREAK_PATTERN.finditer(yaml_string):
+        line_offsets.append(line_offsets[-1] + len(yaml_string[line_start:match.end()].encode('utf-8')))
+        line_start = match.end()
+    return line_offsets
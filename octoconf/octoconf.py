@@ -1,17 +1,45 @@
+import fnmatch
 import os
+import re
 import string
+import time
+import warnings
 import yaml
 from collections import Mapping
 from pprint import pformat
 
-YamlLoader = yaml.Loader
-if 'CLoader' in dir(yaml):
-    YamlLoader = yaml.CLoader
+from .cache import FragmentCache, get_cache_key, get_file_cache_key, get_digest
+from .frozen import freeze_config
+from .schema import ROOT_SOURCE_NAME, SchemaError
+
+LIBYAML_AVAILABLE = 'CSafeLoader' in dir(yaml)
+
+YamlLoader = yaml.CSafeLoader if LIBYAML_AVAILABLE else yaml.SafeLoader
+_FALLBACK_LOADER = None if LIBYAML_AVAILABLE else yaml.SafeLoader
 
 DEFAULT_CONFIG_SELECTOR = 'USED_CONFIG>'
 BASE_CONFIG_SELECTOR = '<BASE'
 INCLUDE_FILE_SPECIFIER = '<INCLUDE'
 
+_clock = getattr(time, 'perf_counter', time.time)
+_GLOB_PATTERN_REGEX = re.compile(r'[*?[]')
+
+# the directories of the glob includes are sources too, but they have no content
+_DIRECTORY_DIGEST = ''
+
+# the parsed files of the glob includes of the loads with cache
+_fragment_cache = FragmentCache()
+
+
+def _get_byte_size(text):
+    """
+    :type text: str or bytes
+    :rtype: int
+    """
+    if isinstance(text, bytes):
+        return len(text)
+    return len(text.encode('utf-8'))
+
 
 class CircularDependencyError(Exception):
     pass
@@ -25,65 +53,959 @@ class CircularIncludeError(Exception):
     pass
 
 
-class ConfigObject(object):
-    def __init__(self, data):
+class PurePythonLoaderWarning(RuntimeWarning):
+    pass
+
+
+def set_default_loader(loader):
+    """
+    Set the YAML loader class of the loads, what do not set the ``loader`` argument
+
+    :type loader: type
+    """
+    global YamlLoader  # pylint: disable=global-statement
+    YamlLoader = loader
+
+
+def _get_loader(loader=None):
+    """
+    Get the loader of a load, and warn when the default loader fell back to the pure-Python loader
+
+    :type loader: type or None
+    :rtype: type
+    """
+    if loader is not None:
+        return loader
+    if YamlLoader is _FALLBACK_LOADER:
+        warnings.warn('libyaml is not available, the YAML files are parsed by the slow pure-Python loader',
+                      PurePythonLoaderWarning)
+    return YamlLoader
+
+
+class LoadStats(object):
+    def __init__(self):
         """
-        :type data: dict
+        Counters and timings of a load
+
+        The ``timings`` contains the wall time of the phases in seconds: ``read``, ``substitute``, ``parse``,
+        ``include`` (it contains the read, substitute and parse times of the included files too), ``prefetch_wait``
+        (waiting for the included files what were read by the executor), ``inherit``, ``wrap`` and ``total``.
         """
-        self.__data = data
+        self.parses = 0
+        self.saved_parses = 0
+        self.files_opened = 0
+        self.bytes_read = 0
+        self.merged_nodes = 0
+        self.inheritance_depth = 0
+        self.loader = None
+        self.timings = {}
+
+    def add_time(self, phase, started):
+        """
+        Add the elapsed time since ``started`` to the phase, and return the current time
+
+        :type phase: str
+        :type started: float
+        :rtype: float
+        """
+        now = _clock()
+        self.timings[phase] = self.timings.get(phase, 0.0) + now - started
+        return now
+
+    def add_stats(self, stats):
+        """
+        Add the file counters and the timings of a partial load (e.g. the read of an included file on the executor)
+
+        :type stats: LoadStats
+        """
+        self.files_opened += stats.files_opened
+        self.bytes_read += stats.bytes_read
+        for phase, seconds in stats.timings.items():
+            self.timings[phase] = self.timings.get(phase, 0.0) + seconds
+
+
+class _LazyVariables(Mapping):
+    def __init__(self, variables=None):
+        """
+        Variables of a load, where the callable values are providers, and they are called at their first use only
+
+        The ``variables`` can be a dict subclass with ``__missing__()`` too, what resolves the not listed variables.
+
+        :type variables: dict or Mapping or None
+        """
+        self.__variables = {} if variables is None else variables
+        self.__values = {}
+
+    def __getitem__(self, name):
+        try:
+            return self.__values[name]
+        except KeyError:
+            pass
+
+        value = self.__variables[name]
+        if callable(value):
+            value = value()
+        self.__values[name] = value
+        return value
+
+    def __iter__(self):
+        return iter(self.__variables)
+
+    def __len__(self):
+        return len(self.__variables)
+
+    def get_constants(self):
+        """
+        The values of the variables, what are not providers (without calling the providers and the resolver)
+
+        :rtype: dict
+        """
+        return {name: value for name, value in self.__variables.items() if not callable(value)}
+
+    def get_plain(self):
+        """
+        The variables as a plain dict, if they have no providers and no resolver (else None)
+
+        :rtype: dict or None
+        """
+        if not isinstance(self.__variables, dict) or hasattr(self.__variables, '__missing__'):
+            return None
+        if any(callable(value) for value in self.__variables.values()):
+            return None
+        return dict(self.__variables)
+
+    def get_used(self):
+        """
+        The values of the variables, what were used so far
+
+        :rtype: dict
+        """
+        return dict(self.__values)
+
+    def resolve(self, names):
+        """
+        Plain dict of the defined variables of the names (the undefined ones are left out)
+
+        :type names: set
+        :rtype: dict
+        """
+        resolved = {}
+        for name in names:
+            try:
+                resolved[name] = self[name]
+            except KeyError:
+                pass
+        return resolved
+
+
+def _get_template_names(yaml_string):
+    """
+    The names of the variables, what are used in the YAML
+
+    :type yaml_string: str
+    :rtype: set
+    """
+    names = set()
+    for match in string.Template.pattern.finditer(yaml_string):
+        name = match.group('named') or match.group('braced')
+        if name is not None:
+            names.add(name)
+    return names
+
+
+class _LoadContext(object):
+    def __init__(self, variables, stats=None, executor=None, sources=None, parsed_yamls=None, included_yamls=None,
+                 include_parents=None, read_yaml_file=None, loader=None, cache=None, directory_files=None):
+        """
+        State of one load, what is shared between the recursive steps
+
+        The state of included files can be kept between loads (e.g. by the watcher). With ``cache`` (and the default
+        file reader), the parsed files of the glob includes are kept in the fragment cache of the process one by one,
+        so a changed fragment does not need to parse the others again.
+
+        :type variables: dict
+        :type stats: LoadStats or None
+        :type executor: concurrent.futures.Executor or None
+        :type sources: dict or None
+        :type parsed_yamls: dict or None
+        :type included_yamls: dict or None
+        :type include_parents: dict or None
+        :type read_yaml_file: callable or None
+        :type loader: type or None
+        :type cache: octoconf.cache.DiskCache or octoconf.cache.MemoryCache or None
+        :type directory_files: dict or None
+        """
+        self.variables = variables
+        self.stats = stats
+        self.executor = executor
+        self.sources = {} if sources is None else sources
+        self.parsed_yamls = {} if parsed_yamls is None else parsed_yamls
+        self.included_yamls = {} if included_yamls is None else included_yamls
+        self.include_parents = {} if include_parents is None else include_parents
+        self.pending_yamls = {}
+        self.yaml_file_reader = read_yaml_file
+        self.loader = loader or YamlLoader
+        self.cache = cache if read_yaml_file is None else None
+        self.directory_files = {} if directory_files is None else directory_files
+        self.globbed_paths = set()
+        self.fragment_stat_keys = {}
+
+    def read_yaml_file(self, abs_path):
+        """
+        :type abs_path: str
+        :rtype: tuple
+        """
+        if self.yaml_file_reader is None:
+            return Octoconf._read_yaml_file(abs_path, self.variables, stats=self.stats, loader=self.loader)
+        return self.yaml_file_reader(abs_path, self.variables)
+
+    def use_cached_yaml_file(self, abs_path):
+        """
+        Take the parsed file from the fragment cache, if it was not changed since it was cached
+
+        The file is stated before it is read, so a change during the read can not be hidden by the cached stat.
+
+        :type abs_path: str
+        :rtype: bool
+        """
+        if self.cache is None or abs_path in self.parsed_yamls or abs_path in self.pending_yamls \
+                or abs_path not in self.globbed_paths:
+            return False
+
+        try:
+            stat = os.stat(abs_path)
+        except OSError:
+            return False
+        stat_key = self.fragment_stat_keys[abs_path] = (stat.st_mtime, stat.st_size)
+
+        parsed_file = _fragment_cache.get(get_file_cache_key(abs_path, loader=self.loader), stat_key, self.variables)
+        if parsed_file is None:
+            return False
+        self.sources[abs_path], self.parsed_yamls[abs_path] = parsed_file
+        return True
+
+    def cache_yaml_file(self, abs_path, yaml_digest, parsed_yaml, used_variables=None):
+        """
+        Store the parsed file in the fragment cache with the variables, what were substituted into it
+
+        The files, what were parsed on the executor, pass their ``used_variables``, because their substitution was not
+        recorded by the variables of the load.
+
+        :type abs_path: str
+        :type yaml_digest: str
+        :type parsed_yaml: dict
+        :type used_variables: dict or None
+        """
+        stat_key = self.fragment_stat_keys.pop(abs_path, None)
+        if stat_key is not None:
+            _fragment_cache.set(get_file_cache_key(abs_path, loader=self.loader), stat_key, (yaml_digest, parsed_yaml),
+                                self.variables.get_used() if used_variables is None else used_variables)
+
+    def count_parse(self):
+        if self.stats is not None:
+            self.stats.parses += 1
+
+    def count_saved_parse(self):
+        if self.stats is not None:
+            self.stats.saved_parses += 1
+
+
+class _ComposedYaml(object):
+    def __init__(self, yaml_string, loader):
+        """
+        Composed (but not constructed) YAML, where the top level nodes can be constructed selectively
 
-    def __check(self, name):
+        :type yaml_string: str
+        :type loader: type
+        """
+        self.__loader = loader(yaml_string)
+        self.__nodes = []
+        try:
+            root_node = self.__loader.get_single_node()
+            if root_node is not None and not isinstance(root_node, yaml.MappingNode):
+                raise ValueError('bad formatted YAML; have to be dict on top level')
+            for key_node, value_node in root_node.value if root_node is not None else ():
+                if key_node.tag == u'tag:yaml.org,2002:merge':
+                    raise ValueError('merge key is not supported on top level of selectively loaded YAML')
+                self.__nodes.append((self.__loader.construct_object(key_node, deep=True), value_node))
+        except Exception:
+            self.__loader.dispose()
+            raise
+
+    def get(self, name):
         """
+        Construct the last top level node of the name
+
         :type name: str
+        :rtype: object
         """
-        if name not in self.__data.keys():
-            raise AttributeError('{!r} object has no attribute {!r}'.format(self.__class__.__name__, name))
+        value_node = None
+        for key, node in self.__nodes:
+            if key == name:
+                value_node = node
+        if value_node is None:
+            return None
+        return self.__loader.construct_object(value_node, deep=True)
 
-    def __getattr__(self, name):
+    def get_base_name(self, name):
         """
+        Construct the base selector of a top level profile only
+
         :type name: str
+        :rtype: str or None
         """
-        self.__check(name)
-        if isinstance(self.__data[name], dict):
-            return ConfigObject(self.__data[name])
-        else:
-            return self.__data[name]
+        base_name = None
+        for key, node in self.__nodes:
+            if key != name or not isinstance(node, yaml.MappingNode):
+                continue
+            for profile_key_node, profile_value_node in node.value:
+                if isinstance(profile_key_node, yaml.ScalarNode) and profile_key_node.value == BASE_CONFIG_SELECTOR:
+                    base_name = self.__loader.construct_object(profile_value_node, deep=True)
+        return base_name
+
+    def construct(self, names):
+        """
+        Construct the top level nodes of the given names only, and release the composed nodes
+
+        :type names: set
+        :rtype: dict
+        """
+        try:
+            return {key: self.__loader.construct_object(node, deep=True)
+                    for key, node in self.__nodes if key in names}
+        finally:
+            self.__loader.dispose()
+            self.__nodes = []
+
+
+class _IndexedYaml(object):
+    def __init__(self, read_range, ranges, substitute, loader):
+        """
+        Top level nodes of a YAML file, what are read and parsed by their ranges in a profile index only
+
+        It has the interface of ``_ComposedYaml``.
+
+        :type read_range: callable
+        :type ranges: dict
+        :type substitute: callable
+        :type loader: type
+        """
+        self.__read_range = read_range
+        self.__ranges = ranges
+        self.__substitute = substitute
+        self.__loader = loader
+        self.__values = {}
+
+    def get(self, name):
+        """
+        Parse the range of a top level node
+
+        :type name: str
+        :rtype: object
+        """
+        if name in self.__values:
+            return self.__values[name]
+        if name not in self.__ranges:
+            return None
+
+        start, end = self.__ranges[name]
+        parsed_range = yaml.load(self.__substitute(self.__read_range(start, end)), Loader=self.__loader)
+        if not isinstance(parsed_range, dict) or name not in parsed_range:
+            raise ValueError('bad formatted index; range of {!r} does not contain the node'.format(name))
+        return self.__values.setdefault(name, parsed_range[name])
+
+    def get_base_name(self, name):
+        """
+        :type name: str
+        :rtype: str or None
+        """
+        value = self.get(name)
+        if isinstance(value, dict):
+            return value.get(BASE_CONFIG_SELECTOR)
+        return None
+
+    def construct(self, names):
+        """
+        :type names: set
+        :rtype: dict
+        """
+        return {name: self.get(name) for name in names if name in self.__ranges}
+
+
+class _LayeredDict(Mapping):
+    def __init__(self, layers, hidden_keys=()):
+        """
+        Read-through view of dicts, where the first layer overrides the next ones
+
+        The values are merged at the first access only, and they are memoized.
+
+        :type layers: list
+        :type hidden_keys: tuple
+        """
+        self.__layers = layers
+        self.__hidden_keys = hidden_keys
+        self.__values = {}
+
+    def __getitem__(self, key):
+        if key in self.__values:
+            return self.__values[key]
+        if key in self.__hidden_keys:
+            raise KeyError(key)
+
+        mapping_values = []
+        for layer in self.__layers:
+            if key not in layer:
+                continue
+            value = layer[key]
+            if not isinstance(value, Mapping):
+                if not mapping_values:
+                    return self.__values.setdefault(key, value)
+                break
+            mapping_values.append(value)
+
+        if not mapping_values:
+            raise KeyError(key)
+
+        return self.__values.setdefault(key, _LayeredDict(mapping_values))
+
+    def __setitem__(self, key, value):
+        self.__values[key] = value
+
+    def __iter__(self):
+        seen_keys = set(self.__hidden_keys)
+        for layer in reversed(self.__layers):
+            for key in layer:
+                if key not in seen_keys:
+                    seen_keys.add(key)
+                    yield key
+
+        for key in self.__values:
+            if key not in seen_keys:
+                seen_keys.add(key)
+                yield key
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __contains__(self, key):
+        if key in self.__values:
+            return True
+        if key in self.__hidden_keys:
+            return False
+        return any(key in layer for layer in self.__layers)
+
+    def to_dict(self):
+        """
+        :rtype: dict
+        """
+        return {key: value.to_dict() if isinstance(value, _LayeredDict) else value
+                for key, value in self.items()}
+
+
+# types of values what can not be mappings, so they can skip the slow check of Mapping ABC
+_SCALAR_TYPES = frozenset(type(value) for value in (u'', b'', 0, 2 ** 64, 0.0, True, None, [], ()))
+_STRING_TYPES = (str, type(u''))
+_MISSING = object()
+
+
+class ConfigObject(object):
+    __slots__ = ('__data', '__children', '__generation', '__path_index', '__shared', '__owned', '__parent', '__key')
+
+    def __init__(self, data, shared=False):
+        """
+        The ``shared`` config can share its subtrees with other configs; its dicts are copied at their first change,
+        and its lists are copied at their first read (because their changes can not be tracked)
+
+        :type data: dict or Mapping
+        :type shared: bool
+        """
+        self.__data = data
+        self.__children = {}
+        self.__generation = [0]
+        self.__path_index = None
+        self.__shared = shared
+        self.__owned = not shared
+        self.__parent = None
+        self.__key = None
+
+    def __getattribute__(self, name):
+        """
+        The names of the class are resolved as usual, every other name is looked up in the config directly
+
+        :type name: str
+        """
+        if name in _CONFIG_OBJECT_NAMES:
+            return object.__getattribute__(self, name)
+        return _get_node(self, name)
 
     def __setattr__(self, key, value):
-        if key == '_ConfigObject__data':
+        if key in _CONFIG_OBJECT_NAMES:
             super(ConfigObject, self).__setattr__(key, value)
         else:
             self.__setitem__(key, value)
 
     def __iter__(self):
-        for each in self.__data.keys():
-            yield each
+        return iter(_get_config_data(self))
+
+    def __contains__(self, name):
+        """
+        :type name: str
+        :rtype: bool
+        """
+        return name in _get_config_data(self)
 
     def __getitem__(self, name):
         """
         :type name: str
         """
-        return self.__getattr__(name)
+        return _get_node(self, name)
 
     def __setitem__(self, name, value):
         """
         :type name: str
         """
-        self.__data[name] = value
+        if not self.__owned:
+            self.__own()
+        _get_config_data(self)[name] = value
+        _get_config_children(self).pop(name, None)
+        _get_config_generation(self)[0] += 1
+
+    def get(self, name, default=None):
+        """
+        :type name: str
+        """
+        return _get_node(self, name, default)
+
+    def get_path(self, path, default=None):
+        """
+        Get a node by its dotted path (e.g. ``'Flask.SQLALCHEMY_DATABASE_URI'``) or by the tuple of its keys
+
+        The nodes are looked up in a flat index of paths, what is built at the first lookup, and it is rebuilt after
+        changes of the config (except the direct changes of ``get_dict()`` results).
+
+        :type path: str or tuple or list
+        """
+        # the slots are read by the module level getters, because every self.__... read runs __getattribute__()
+        path_index, path_wrappers = _get_path_index(self)
+        if isinstance(path, list):
+            path = tuple(path)
+
+        value = path_index.get(path, _MISSING)
+        if value is _MISSING:
+            return default
+
+        value_type = type(value)
+        if value_type is list and _get_config_shared(self):
+            # the lists of shared configs are copied at their first read by their parents
+            return _get_shared_node(self, path)
+        if value_type in _SCALAR_TYPES or (value_type is not dict and not isinstance(value, Mapping)):
+            return value
+
+        wrapper = path_wrappers.get(path)
+        if wrapper is None:
+            if _get_config_shared(self):
+                # the wrappers of shared configs need their parents for copy-on-write
+                wrapper = _get_shared_node(self, path)
+            else:
+                wrapper = _make_child(self, value)
+            path_wrappers[path] = wrapper
+        return wrapper
+
+    def get_paths(self, paths, default=None):
+        """
+        :type paths: list
+        :rtype: list
+        """
+        return [self.get_path(path, default) for path in paths]
+
+    def has_path(self, path):
+        """
+        :type path: str or tuple or list
+        :rtype: bool
+        """
+        path_index, _ = _get_path_index(self)
+        if isinstance(path, list):
+            path = tuple(path)
+        return path in path_index
+
+    def __own(self):
+        """
+        Copy the shared dicts (with their lists) from the topmost not owned parent to this config
+        """
+        not_owned_configs = []
+        config = self
+        while config is not None and not config.__owned:
+            not_owned_configs.append(config)
+            config = config.__parent
+
+        for config in reversed(not_owned_configs):
+            original_data = config.__data
+            data = dict(original_data)
+            for key, value in data.items():
+                if isinstance(value, list):
+                    data[key] = _copy_nodes(value)
+            config.__data = data
+            config.__owned = True
+
+            # the stale wrappers (their node was replaced in the parent) are detached, and they do not overwrite
+            # the newer value of the parent
+            parent = config.__parent
+            if parent is not None:
+                if parent.__data.get(config.__key, _MISSING) is original_data:
+                    parent.__data[config.__key] = data
+                else:
+                    config.__parent = None
+
+    def iter_leaves(self, flatten=True, prefix=None, max_depth=None):
+        """
+        Iterate over the ``(path, value)`` pairs of the leaves, where the path is the tuple of keys
+
+        The lists are flattened too (their indexes are in the paths), except with ``flatten=False``. The ``prefix``
+        (dotted path or tuple of keys) selects a subtree, and the nodes in ``max_depth`` depth of it are returned as
+        leaves. The values are not copied or wrapped.
+
+        :type flatten: bool
+        :type prefix: str or tuple or list or None
+        :type max_depth: int or None
+        :rtype: collections.Iterator
+        """
+        node = self.__data
+        root_path = ()
+        if prefix is not None:
+            root_path = tuple(prefix.split('.')) if isinstance(prefix, _STRING_TYPES) else tuple(prefix)
+            for key in root_path:
+                if not isinstance(node, Mapping) or key not in node:
+                    return
+                node = node[key]
+
+        if max_depth == 0 or not _has_children(node, flatten):
+            yield root_path, node
+            return
+
+        max_path_length = None if max_depth is None else len(root_path) + max_depth
+        stack = [(root_path, _iter_children(node))]
+        while stack:
+            path, children = stack[-1]
+            for key, value in children:
+                child_path = path + (key,)
+                if len(child_path) != max_path_length and _has_children(value, flatten):
+                    stack.append((child_path, _iter_children(value)))
+                    break
+                yield child_path, value
+            else:
+                stack.pop()
 
     def __str__(self):
-        return pformat(self.__data)
+        return pformat(self.get_dict())
 
     def get_dict(self):
         """
+        The config of lazy loads is merged into a new dict, and the shared configs are copied, what do not reflect
+        later changes
+
         :rtype: dict
         """
+        if isinstance(self.__data, _LayeredDict):
+            return self.__data.to_dict()
+        if self.__shared:
+            return _copy_nodes(self.__data)
         return self.__data
 
+    def freeze(self):
+        """
+        Make an immutable snapshot of the config, what has native attribute reads and can be shared between threads
+
+        :rtype: octoconf.frozen.FrozenConfigObject
+        """
+        return freeze_config(self.__data)
+
+
+_CONFIG_OBJECT_NAMES = frozenset(dir(ConfigObject))
+_get_config_data = ConfigObject.__dict__['_ConfigObject__data'].__get__
+_get_config_children = ConfigObject.__dict__['_ConfigObject__children'].__get__
+_get_config_generation = ConfigObject.__dict__['_ConfigObject__generation'].__get__
+_set_config_generation = ConfigObject.__dict__['_ConfigObject__generation'].__set__
+_get_config_shared = ConfigObject.__dict__['_ConfigObject__shared'].__get__
+_get_config_owned = ConfigObject.__dict__['_ConfigObject__owned'].__get__
+_own_config = ConfigObject.__dict__['_ConfigObject__own']
+_set_config_parent = ConfigObject.__dict__['_ConfigObject__parent'].__set__
+_set_config_key = ConfigObject.__dict__['_ConfigObject__key'].__set__
+_get_config_path_index = ConfigObject.__dict__['_ConfigObject__path_index'].__get__
+_set_config_path_index = ConfigObject.__dict__['_ConfigObject__path_index'].__set__
+
+
+def _get_path_index(config):
+    """
+    Get the path index and the wrappers of the paths, and rebuild them after changes of the config
+
+    :type config: ConfigObject
+    :rtype: tuple
+    """
+    path_index = _get_config_path_index(config)
+    generation = _get_config_generation(config)[0]
+    if path_index is None or path_index[0] != generation:
+        path_index = (generation, _build_path_index(_get_config_data(config)), {})
+        _set_config_path_index(config, path_index)
+    return path_index[1], path_index[2]
+
+
+def _get_shared_node(config, path):
+    """
+    :type config: ConfigObject
+    :type path: str or tuple
+    """
+    node = config
+    for key in path.split('.') if isinstance(path, _STRING_TYPES) else path:
+        node = _get_node(node, key)
+    return node
+
+
+def _get_node(config, name, default=_MISSING):
+    """
+    Get a node of the config, where the dicts are wrapped, and the wrapper is reused until the node is replaced
+
+    :type config: ConfigObject
+    :type name: str
+    """
+    value = _get_config_data(config).get(name, _MISSING)
+    if value is _MISSING:
+        if default is _MISSING:
+            raise AttributeError('{!r} object has no attribute {!r}'.format(type(config).__name__, name))
+        return default
+
+    value_type = type(value)
+    if value_type in _SCALAR_TYPES or (value_type is not dict and not isinstance(value, Mapping)):
+        if value_type is list and not _get_config_owned(config):
+            # the changes of the lists can not be tracked, so the lists of shared configs are copied at first read
+            _own_config(config)
+            return _get_config_data(config)[name]
+        return value
+
+    children = _get_config_children(config)
+    child = children.get(name)
+    if child is None or _get_config_data(child) is not value:
+        child = children[name] = _make_child(config, value, name)
+    return child
+
+
+def _make_child(config, value, key=None):
+    """
+    Wrap a nested node, what shares the change tracking (and the copy-on-write mode) with its parent
+
+    :type config: ConfigObject
+    :type value: dict or Mapping
+    :type key: str or None
+    :rtype: ConfigObject
+    """
+    shared = _get_config_shared(config)
+    child = ConfigObject(value, shared=shared)
+    _set_config_generation(child, _get_config_generation(config))
+    if shared:
+        _set_config_parent(child, config)
+        _set_config_key(child, key)
+    return child
+
+
+def _has_children(node, flatten):
+    """
+    :type flatten: bool
+    :rtype: bool
+    """
+    if isinstance(node, Mapping):
+        return len(node) > 0
+    return flatten and isinstance(node, list) and len(node) > 0
+
+
+def _iter_children(node):
+    """
+    :type node: dict or Mapping or list
+    :rtype: collections.Iterator
+    """
+    if isinstance(node, list):
+        return enumerate(node)
+    return iter(getattr(node, 'iteritems', node.items)())
+
+
+def _build_path_index(data):
+    """
+    Collect every node of the config by the tuple of its keys, and by its dotted path (if it is unambiguous)
+
+    :type data: dict or Mapping
+    :rtype: dict
+    """
+    path_index = {}
+    stack = [((), '', data)]
+    while stack:
+        parent_path, parent_dotted_path, node = stack.pop()
+        for key, value in node.items():
+            path = parent_path + (key,)
+            path_index[path] = value
+
+            dotted_path = None
+            if parent_dotted_path is not None and isinstance(key, _STRING_TYPES) and '.' not in key:
+                dotted_path = '{}.{}'.format(parent_dotted_path, key) if parent_path else key
+                path_index[dotted_path] = value
+
+            if isinstance(value, Mapping):
+                stack.append((path, dotted_path, value))
+
+    return path_index
+
+
+def _merge_dicts(base, update, skipped_keys=(), stats=None, owned_dicts=None):
+    """
+    Merge the update into the base recursively, without changing them
+
+    Only the dicts on the merged paths are copied, the other subtrees of the inputs are shared with the result. The
+    ``owned_dicts`` (by their ids) belong to the result of a series of merges, so they are changed in place, and the
+    copies are added to them; it keeps the series linear in the size of the updates.
+
+    :type base: dict or Mapping
+    :type update: dict or Mapping
+    :type skipped_keys: tuple
+    :type stats: LoadStats or None
+    :type owned_dicts: dict or None
+    :rtype: dict
+    """
+    merged = base if owned_dicts is not None and id(base) in owned_dicts else _copy_owned_dict(base, owned_dicts)
+    stack = [(merged, update, skipped_keys)]
+    while stack:
+        target, source, skipped = stack.pop()
+        if stats is not None:
+            stats.merged_nodes += len(source)
+
+        for key, value in source.items():
+            if skipped and key in skipped:
+                continue
+            if _is_mapping(value):
+                base_value = target.get(key)
+                if base_value is not None and _is_mapping(base_value):
+                    if owned_dicts is None or id(base_value) not in owned_dicts:
+                        target[key] = base_value = _copy_owned_dict(base_value, owned_dicts)
+                    stack.append((base_value, value, ()))
+                    continue
+            target[key] = value
+
+    return merged
+
+
+def _copy_owned_dict(data, owned_dicts):
+    """
+    Copy the dict, and register the copy in the owned dicts (they are kept alive, so their ids are not reused)
+
+    :type data: dict or Mapping
+    :type owned_dicts: dict or None
+    :rtype: dict
+    """
+    copied = dict(data)
+    if owned_dicts is not None:
+        owned_dicts[id(copied)] = copied
+    return copied
+
+
+def _is_mapping(value):
+    """
+    :type value: object
+    :rtype: bool
+    """
+    value_type = type(value)
+    return value_type is dict or (value_type not in _SCALAR_TYPES and isinstance(value, Mapping))
+
+
+def _copy_nodes(data):
+    """
+    Copy the dicts and the lists of a config (or of a list), so the copy can be changed without changing the shared
+    subtrees
+
+    :type data: dict or Mapping or list
+    :rtype: dict or list
+    """
+    copied = list(data) if isinstance(data, list) else dict(data)
+    stack = [copied]
+    while stack:
+        node = stack.pop()
+        for key, value in node.items() if isinstance(node, dict) else enumerate(node):
+            if isinstance(value, list):
+                node[key] = value = list(value)
+                stack.append(value)
+            elif _is_mapping(value):
+                node[key] = value = dict(value)
+                stack.append(value)
+    return copied
+
+
+def _get_include_paths(includes, directory_files, include_cwd=None):
+    """
+    Get the absolute paths of the includes, where the glob patterns of the file names are expanded in sorted order,
+    and the directories of the patterns with their matched paths
+
+    The file names of the directories are listed once per ``directory_files`` dict.
+
+    :type includes: list
+    :type directory_files: dict
+    :type include_cwd: str or None
+    :rtype: tuple
+    """
+    abs_paths = []
+    globs = []
+    for path in includes:
+        if include_cwd:
+            path = os.path.join(include_cwd, path)
+        abs_path = os.path.abspath(path)
+
+        directory, pattern = os.path.split(abs_path)
+        if _GLOB_PATTERN_REGEX.search(directory) and not os.path.isdir(directory):
+            raise ValueError('glob pattern is supported in the file names of includes only: {!r}'.format(path))
+        if not _GLOB_PATTERN_REGEX.search(pattern) or os.path.isfile(abs_path):
+            abs_paths.append(abs_path)
+            continue
+
+        file_names = directory_files.get(directory)
+        if file_names is None:
+            file_names = directory_files[directory] = _list_file_names(directory)
+
+        # the hidden files (e.g. swap files of editors) are matched by explicit patterns only
+        matched_paths = [os.path.join(directory, file_name) for file_name in fnmatch.filter(file_names, pattern)
+                         if not file_name.startswith('.') or pattern.startswith('.')]
+        abs_paths.extend(matched_paths)
+        globs.append((directory, matched_paths))
+    return abs_paths, globs
+
+
+def _has_path(node, path):
+    """
+    :type node: object
+    :type path: tuple
+    :rtype: bool
+    """
+    if node is None:
+        return False
+    for key in path:
+        if _is_mapping(node) and key in node:
+            node = node[key]
+        elif isinstance(node, list) and isinstance(key, int) and key < len(node):
+            node = node[key]
+        else:
+            return False
+    return True
+
+
+def _list_file_names(directory):
+    """
+    :type directory: str
+    :rtype: list
+    """
+    scandir = getattr(os, 'scandir', None)
+    if scandir is None:
+        return sorted(file_name for file_name in os.listdir(directory)
+                      if os.path.isfile(os.path.join(directory, file_name)))
+    return sorted(entry.name for entry in scandir(directory) if entry.is_file())
+
 
 class Octoconf(object):
     @classmethod
-    def load(cls, yaml_stream, variables=None, used_config=None, include_cwd=None):
+    def load(cls, yaml_stream, variables=None, used_config=None, include_cwd=None, cache=None, stats=None,
+             executor=None, lazy=False, frozen=False, selective=False, loader=None, schema=None):
         """
         Load config from YAML contained IO stream (e.g. file)
 
@@ -91,26 +1013,189 @@ class Octoconf(object):
         :type variables: dict or None
         :type used_config: str or None
         :type include_cwd: str or None
-        :rtype: ConfigObject
+        :type cache: octoconf.cache.DiskCache or octoconf.cache.MemoryCache or None
+        :type stats: LoadStats or None
+        :type executor: concurrent.futures.Executor or None
+        :type lazy: bool
+        :type frozen: bool
+        :type selective: bool
+        :type loader: type or None
+        :type schema: octoconf.schema.Schema or None
+        :rtype: ConfigObject or octoconf.frozen.FrozenConfigObject
         """
+        started = _clock() if stats is not None else None
         yaml_string = yaml_stream.read()
-        return cls.loads(yaml_string, variables=variables, used_config=used_config, include_cwd=include_cwd)
+        if stats is not None:
+            stats.add_time('read', started)
+            stats.bytes_read += _get_byte_size(yaml_string)
+
+        try:
+            return cls.loads(yaml_string, variables=variables, used_config=used_config, include_cwd=include_cwd,
+                             cache=cache, stats=stats, executor=executor, lazy=lazy,
+                             frozen=frozen, selective=selective, loader=loader, schema=schema)
+        except SchemaError as e:
+            if e.source == ROOT_SOURCE_NAME and hasattr(yaml_stream, 'name'):
+                e.source = os.path.abspath(yaml_stream.name)
+            raise
 
     @classmethod
-    def loads(cls, yaml_string, variables=None, used_config=None, include_cwd=None):
+    def loads(cls, yaml_string, variables=None, used_config=None, include_cwd=None, cache=None, stats=None,
+              executor=None, lazy=False, frozen=False, selective=False, loader=None, schema=None):
         """
         Load config from YAML contained string
 
+        The ``executor`` (e.g. ``concurrent.futures.ThreadPoolExecutor``) reads and parses the included files of a
+        level concurrently, but they are merged in the original order.
+
+        The ``lazy`` mode does not merge the inherited profiles at load, but every value is merged at its first access.
+
+        The ``frozen`` mode returns an immutable snapshot of the config (see ``ConfigObject.freeze()``).
+
+        The ``selective`` mode composes the YAML files, but constructs only the profiles of the used inheritance chain
+        (the included files are read sequentially in this mode).
+
+        The ``loader`` is the YAML loader class (default: ``yaml.CSafeLoader``, or ``yaml.SafeLoader`` without
+        libyaml; see ``set_default_loader()``).
+
+        The ``schema`` (see ``octoconf.schema.Schema``) checks and coerces the config once at load, and the result is
+        a frozen snapshot of the typed values. The ``SchemaError`` names the key path and the file, what set the value.
+
         :type yaml_string: str
         :type variables: dict or None
         :type used_config: str or None
         :type include_cwd: str or None
-        :rtype: ConfigObject
+        :type cache: octoconf.cache.DiskCache or octoconf.cache.MemoryCache or None
+        :type stats: LoadStats or None
+        :type executor: concurrent.futures.Executor or None
+        :type lazy: bool
+        :type frozen: bool
+        :type selective: bool
+        :type loader: type or None
+        :type schema: octoconf.schema.Schema or None
+        :rtype: ConfigObject or octoconf.frozen.FrozenConfigObject
+        """
+        variables = _LazyVariables(variables)
+        loader = _get_loader(loader)
+        started = None
+        if stats is not None:
+            started = _clock()
+            stats.loader = loader
+
+        cache_key = None
+        if cache is not None:
+            # the providers are keyed by the used variables of the root only, the others are checked by the cache, so
+            # the not used providers are not called
+            key_variables = variables.get_constants()
+            key_variables.update(variables.resolve(_get_template_names(yaml_string)))
+            cache_key = get_cache_key(yaml_string, key_variables, used_config, include_cwd, loader=loader)
+            cached_config = cache.get(cache_key, variables=variables)
+            if cached_config is not None:
+                try:
+                    return cls.__wrap_config(cached_config, frozen, stats=stats, started=started, schema=schema)
+                except SchemaError:
+                    # the cache does not store the parsed files, so the failed config is loaded again for the source
+                    pass
+
+        if selective:
+            root_yaml = cls.__compose_yaml(yaml_string, variables, loader, stats=stats)
+            directory_files = {}
+            parsed_yaml, read_yaml_file = cls.__parse_yaml_selective(root_yaml, variables, loader,
+                                                                     used_config=used_config, include_cwd=include_cwd,
+                                                                     directory_files=directory_files, stats=stats)
+            context = _LoadContext(variables, stats=stats, read_yaml_file=read_yaml_file, loader=loader,
+                                   directory_files=directory_files)
+        else:
+            context = _LoadContext(variables, stats=stats, executor=executor, loader=loader, cache=cache)
+            parsed_yaml = cls.__parse_yaml(yaml_string, variables=variables, stats=stats, loader=loader)
+        context.count_parse()
+        config = cls._resolve_yaml(parsed_yaml, context, used_config=used_config, include_cwd=include_cwd, lazy=lazy)
+
+        cached_config = config.to_dict() if cache is not None and lazy else config
+        try:
+            wrapped_config = cls.__wrap_config(config, frozen, stats=stats, started=started, schema=schema)
+        except SchemaError as e:
+            e.source = cls.__find_source(parsed_yaml, context, e.path, used_config=used_config,
+                                         include_cwd=include_cwd) or ROOT_SOURCE_NAME
+            raise
+
+        # the configs, what fail the schema, are not cached
+        if cache is not None:
+            cache.set(cache_key, cached_config, context.sources, variables=variables.get_used())
+        return wrapped_config
+
+    @classmethod
+    def _loads_indexed(cls, read_range, ranges, variables=None, used_config=None, include_cwd=None, stats=None,
+                       lazy=False, frozen=False, loader=None):
+        """
+        Load config from the ranges of the used profile chain of an indexed YAML file (it is not name mangled for the
+        index module)
+
+        :type read_range: callable
+        :type ranges: dict
+        :type variables: dict or None
+        :type used_config: str or None
+        :type include_cwd: str or None
+        :type stats: LoadStats or None
+        :type lazy: bool
+        :type frozen: bool
+        :type loader: type or None
+        :rtype: ConfigObject or octoconf.frozen.FrozenConfigObject
+        """
+        variables = _LazyVariables(variables)
+        loader = _get_loader(loader)
+        started = None
+        if stats is not None:
+            started = _clock()
+            stats.loader = loader
+
+        root_yaml = _IndexedYaml(read_range, ranges, lambda yaml_string: cls.__substitute_yaml(yaml_string, variables),
+                                 loader)
+        directory_files = {}
+        parsed_yaml, read_yaml_file = cls.__parse_yaml_selective(root_yaml, variables, loader,
+                                                                 used_config=used_config, include_cwd=include_cwd,
+                                                                 directory_files=directory_files, stats=stats)
+        context = _LoadContext(variables, stats=stats, read_yaml_file=read_yaml_file, loader=loader,
+                               directory_files=directory_files)
+        context.count_parse()
+        config = cls._resolve_yaml(parsed_yaml, context, used_config=used_config, include_cwd=include_cwd, lazy=lazy)
+
+        return cls.__wrap_config(config, frozen, stats=stats, started=started)
+
+    @classmethod
+    def _get_default_config_name(cls, yaml_string, variables=None, include_cwd=None, loader=None):
+        """
+        Get the profile name of the default selector of the YAML and its includes (it is not name mangled for the
+        compiled module)
+
+        :type yaml_string: str
+        :type variables: dict or None
+        :type include_cwd: str or None
+        :type loader: type or None
+        :rtype: str or None
+        """
+        variables = _LazyVariables(variables)
+        loader = _get_loader(loader)
+        context = _LoadContext(variables, loader=loader)
+        parsed_yaml = cls.__parse_yaml(yaml_string, variables=variables, loader=loader)
+        return cls.__populate_includes(parsed_yaml, context, include_cwd=include_cwd).get(DEFAULT_CONFIG_SELECTOR)
+
+    @classmethod
+    def _resolve_yaml(cls, parsed_yaml, context, used_config=None, include_cwd=None, lazy=False):
         """
-        variables = variables or {}
+        Populate the includes and inherit the used config (it is not name mangled for the watcher)
 
-        parsed_yaml = cls.__parse_yaml(yaml_string, variables=variables)
-        populated_yaml = cls.__populate_includes(parsed_yaml, variables=variables, include_cwd=include_cwd)
+        :type parsed_yaml: dict
+        :type context: _LoadContext
+        :type used_config: str or None
+        :type include_cwd: str or None
+        :type lazy: bool
+        :rtype: dict or Mapping
+        """
+        stats = context.stats
+        started = _clock() if stats is not None else None
+        populated_yaml = cls.__populate_includes(parsed_yaml, context, include_cwd=include_cwd)
+        if stats is not None:
+            started = stats.add_time('include', started)
 
         used_config = used_config or populated_yaml.get(DEFAULT_CONFIG_SELECTOR)
         if used_config is None:
@@ -118,30 +1203,289 @@ class Octoconf(object):
         if used_config not in populated_yaml.keys():
             raise ValueError('missing used_config referred node: {!r}'.format(used_config))
 
-        inherited_yaml = cls.__inherit_yaml(populated_yaml, used_config)
+        if lazy:
+            config = cls.__inherit_yaml_lazy(populated_yaml, used_config, stats=stats)
+        else:
+            config = cls.__inherit_yaml(populated_yaml, used_config, stats=stats)
+
+        if stats is not None:
+            stats.add_time('inherit', started)
+        return config
+
+    @classmethod
+    def __wrap_config(cls, config, frozen, stats=None, started=None, schema=None):
+        """
+        :type config: dict or Mapping
+        :type frozen: bool
+        :type stats: LoadStats or None
+        :type started: float or None
+        :type schema: octoconf.schema.Schema or None
+        :rtype: ConfigObject or octoconf.frozen.FrozenConfigObject
+        """
+        wrap_started = _clock() if stats is not None else None
+
+        if schema is not None:
+            config = freeze_config(schema.validate(config))
+        elif frozen:
+            config = freeze_config(config)
+        else:
+            config = ConfigObject(config)
+
+        if stats is not None:
+            stats.add_time('wrap', wrap_started)
+            stats.add_time('total', started)
+        return config
+
+    @classmethod
+    def __find_source(cls, parsed_yaml, context, path, used_config=None, include_cwd=None):
+        """
+        Find the included file, what set the value of the path in the used profile chain (or its deepest existing
+        parent, if the path is missing)
+
+        It repeats the override order of the merges, but it runs on the failed loads only.
+
+        :type parsed_yaml: dict
+        :type context: _LoadContext
+        :type path: tuple
+        :type used_config: str or None
+        :type include_cwd: str or None
+        :rtype: str or None
+        """
+        # the files in override order: every file precedes its includes, and the later includes precede the earlier
+        ordered_yamls = []
+        visited_paths = set()
+        pending_yamls = [(None, parsed_yaml, include_cwd)]
+        while pending_yamls:
+            abs_path, file_yaml, file_cwd = pending_yamls.pop()
+            if abs_path in visited_paths:
+                continue
+            visited_paths.add(abs_path)
+            ordered_yamls.append((abs_path, file_yaml))
+
+            includes = file_yaml.get(INCLUDE_FILE_SPECIFIER)
+            if isinstance(includes, str):
+                includes = [includes]
+            for included_path in _get_include_paths(includes or (), context.directory_files,
+                                                    include_cwd=file_cwd)[0]:
+                if included_path in context.parsed_yamls:
+                    pending_yamls.append((included_path, context.parsed_yamls[included_path],
+                                          os.path.dirname(included_path)))
+
+        def get_first(name, key):
+            for _abs_path, file_yaml in ordered_yamls:
+                node = file_yaml.get(name) if name is not None else file_yaml
+                if _is_mapping(node) and key in node:
+                    return node[key]
+            return None
+
+        profile_chain = []
+        name = used_config or get_first(None, DEFAULT_CONFIG_SELECTOR)
+        while name is not None and name not in profile_chain:
+            profile_chain.append(name)
+            name = get_first(name, BASE_CONFIG_SELECTOR)
+
+        for depth in range(len(path), -1, -1):
+            for name in profile_chain:
+                for abs_path, file_yaml in ordered_yamls:
+                    if _has_path(file_yaml.get(name), path[:depth]):
+                        return abs_path
+        return None
 
-        return ConfigObject(inherited_yaml[used_config])
+    @classmethod
+    def load_all(cls, yaml_stream, variables=None, include_cwd=None, stats=None, executor=None, loader=None,
+                 shared=False):
+        """
+        Load every config profile from YAML contained IO stream (e.g. file)
+
+        :type yaml_stream: io.StringIO or io.TextIOWrapper
+        :type variables: dict or None
+        :type include_cwd: str or None
+        :type stats: LoadStats or None
+        :type executor: concurrent.futures.Executor or None
+        :type loader: type or None
+        :type shared: bool
+        :rtype: dict
+        """
+        started = _clock() if stats is not None else None
+        yaml_string = yaml_stream.read()
+        if stats is not None:
+            stats.add_time('read', started)
+            stats.bytes_read += _get_byte_size(yaml_string)
+
+        return cls.loads_all(yaml_string, variables=variables, include_cwd=include_cwd, stats=stats,
+                             executor=executor, loader=loader, shared=shared)
+
+    @classmethod
+    def loads_all(cls, yaml_string, variables=None, include_cwd=None, stats=None, executor=None, loader=None,
+                  shared=False):
+        """
+        Load every config profile from YAML contained string
+
+        The YAML and its includes are parsed once, and every base profile is merged only once. The ``shared``
+        profiles reference the unchanged subtrees of their bases instead of copies; they are copied at the first change.
+
+        :type yaml_string: str
+        :type variables: dict or None
+        :type include_cwd: str or None
+        :type stats: LoadStats or None
+        :type executor: concurrent.futures.Executor or None
+        :type loader: type or None
+        :type shared: bool
+        :rtype: dict
+        """
+        variables = _LazyVariables(variables)
+        loader = _get_loader(loader)
+        started = None
+        if stats is not None:
+            started = _clock()
+            stats.loader = loader
+
+        context = _LoadContext(variables, stats=stats, executor=executor, loader=loader)
+        parsed_yaml = cls.__parse_yaml(yaml_string, variables=variables, stats=stats, loader=loader)
+        context.count_parse()
+        phase_started = _clock() if stats is not None else None
+        populated_yaml = cls.__populate_includes(parsed_yaml, context, include_cwd=include_cwd)
+        if stats is not None:
+            phase_started = stats.add_time('include', phase_started)
+
+        inherited_yaml = cls.__inherit_all_yaml(populated_yaml, stats=stats)
+        if stats is not None:
+            phase_started = stats.add_time('inherit', phase_started)
+
+        if shared:
+            configs = {config_name: ConfigObject(config, shared=True)
+                       for config_name, config in inherited_yaml.items()}
+        else:
+            # the profiles share their base subtrees, so they are copied to be independent
+            configs = {config_name: ConfigObject(_copy_nodes(config))
+                       for config_name, config in inherited_yaml.items()}
+        if stats is not None:
+            stats.add_time('wrap', phase_started)
+            stats.add_time('total', started)
+        return configs
 
     @classmethod
-    def __parse_yaml(cls, yaml_string, variables):
+    def __parse_yaml(cls, yaml_string, variables, stats=None, loader=None):
         """
         :type yaml_string: str
         :type variables: dict
+        :type stats: LoadStats or None
+        :type loader: type or None
         :rtype dict
         """
+        started = _clock() if stats is not None else None
         substituted_yaml_string = cls.__substitute_yaml(yaml_string, variables)
+        if stats is not None:
+            started = stats.add_time('substitute', started)
 
-        parsed_yaml = yaml.load(substituted_yaml_string, Loader=YamlLoader) or {}
+        parsed_yaml = yaml.load(substituted_yaml_string, Loader=loader or YamlLoader) or {}
+        if stats is not None:
+            stats.add_time('parse', started)
         if not isinstance(parsed_yaml, dict):
             raise ValueError('bad formatted YAML; have to be dict on top level')
 
         return parsed_yaml
 
     @classmethod
-    def __populate_includes(cls, parsed_yaml, variables, include_cwd=None, already_included=None):
+    def __compose_yaml(cls, yaml_string, variables, loader, stats=None):
         """
-        :type parsed_yaml: dict
+        :type yaml_string: str
         :type variables: dict
+        :type loader: type
+        :type stats: LoadStats or None
+        :rtype: _ComposedYaml
+        """
+        started = _clock() if stats is not None else None
+        substituted_yaml_string = cls.__substitute_yaml(yaml_string, variables)
+        if stats is not None:
+            started = stats.add_time('substitute', started)
+
+        composed_yaml = _ComposedYaml(substituted_yaml_string, loader)
+        if stats is not None:
+            stats.add_time('parse', started)
+        return composed_yaml
+
+    @classmethod
+    def __parse_yaml_selective(cls, root_yaml, variables, loader, used_config=None, include_cwd=None,
+                               directory_files=None, stats=None):
+        """
+        Compose the included files of the composed YAML, then construct only the selector, the include and the used
+        profile chain nodes of them
+
+        The used chain is collected from every file, because the profiles of the included files are merged.
+
+        :type root_yaml: _ComposedYaml or _IndexedYaml
+        :type variables: dict
+        :type loader: type
+        :type used_config: str or None
+        :type include_cwd: str or None
+        :type directory_files: dict or None
+        :type stats: LoadStats or None
+        :rtype: tuple
+        """
+        composed_files = {}
+        cls.__compose_includes(root_yaml, variables, loader, composed_files,
+                               {} if directory_files is None else directory_files, include_cwd=include_cwd,
+                               stats=stats)
+        composed_yamls = [root_yaml] + [composed_yaml for _digest, composed_yaml in composed_files.values()]
+
+        used_names = {DEFAULT_CONFIG_SELECTOR, INCLUDE_FILE_SPECIFIER}
+        pending_names = [used_config] if used_config else \
+            [composed_yaml.get(DEFAULT_CONFIG_SELECTOR) for composed_yaml in composed_yamls]
+        while pending_names:
+            name = pending_names.pop()
+            if name is None or name in used_names:
+                continue
+            used_names.add(name)
+            pending_names.extend(composed_yaml.get_base_name(name) for composed_yaml in composed_yamls)
+
+        def construct(composed_yaml):
+            started = _clock() if stats is not None else None
+            constructed_yaml = composed_yaml.construct(used_names)
+            if stats is not None:
+                stats.add_time('parse', started)
+            return constructed_yaml
+
+        def read_yaml_file(abs_path, variables):
+            if abs_path not in composed_files:
+                return cls._read_yaml_file(abs_path, variables, stats=stats, loader=loader)
+            digest, composed_yaml = composed_files[abs_path]
+            return digest, construct(composed_yaml)
+
+        return construct(root_yaml), read_yaml_file
+
+    @classmethod
+    def __compose_includes(cls, composed_yaml, variables, loader, composed_files, directory_files, include_cwd=None,
+                           stats=None):
+        """
+        :type composed_yaml: _ComposedYaml or _IndexedYaml
+        :type variables: dict
+        :type loader: type
+        :type composed_files: dict
+        :type directory_files: dict
+        :type include_cwd: str or None
+        :type stats: LoadStats or None
+        """
+        includes = composed_yaml.get(INCLUDE_FILE_SPECIFIER)
+        if isinstance(includes, str):
+            includes = [includes]
+
+        for abs_path in _get_include_paths(includes or (), directory_files, include_cwd=include_cwd)[0]:
+            if abs_path in composed_files:
+                continue
+
+            included_yaml_string = cls.__read_file(abs_path, stats=stats)
+            included_yaml = cls.__compose_yaml(included_yaml_string, variables, loader, stats=stats)
+            composed_files[abs_path] = (get_digest(included_yaml_string), included_yaml)
+
+            cls.__compose_includes(included_yaml, variables, loader, composed_files, directory_files,
+                                   include_cwd=os.path.dirname(abs_path), stats=stats)
+
+    @classmethod
+    def __populate_includes(cls, parsed_yaml, context, include_cwd=None, already_included=None):
+        """
+        :type parsed_yaml: dict
+        :type context: _LoadContext
         :type include_cwd: str or None
         :type already_included: list or None
         :rtype: dict
@@ -156,34 +1500,151 @@ class Octoconf(object):
         if not includes:
             return parsed_yaml
 
-        # build base yaml from includes
+        parent_abs_path = already_included[-1] if already_included else None
+        abs_paths, globs = _get_include_paths(includes, context.directory_files, include_cwd=include_cwd)
+        for directory, matched_paths in globs:
+            context.sources[directory] = _DIRECTORY_DIGEST
+            context.include_parents.setdefault(directory, set()).add(parent_abs_path)
+            context.globbed_paths.update(matched_paths)
+
+            for abs_path in matched_paths:
+                context.use_cached_yaml_file(abs_path)
+
+        if context.executor is not None and context.yaml_file_reader is None:
+            cls.__prefetch_includes(abs_paths, context)
+
+        # build base yaml from includes, where the dicts of the base are merged in place
         base_yaml = {}
-        for path in includes:
+        owned_dicts = {id(base_yaml): base_yaml}
+        for abs_path in abs_paths:
             already_included_stack = list(already_included)
-
-            if include_cwd:
-                path = os.path.join(include_cwd, path)
-            abs_path = os.path.abspath(path)
+            context.include_parents.setdefault(abs_path, set()).add(parent_abs_path)
 
             if abs_path in already_included_stack:
                 raise CircularIncludeError('circular include detected; ref_chain={ref_chain!s}'.format(
                     ref_chain=already_included_stack + [abs_path]))
 
-            with open(abs_path) as fd:
-                included_yaml_string = fd.read()
+            # the result of an already included file is reusable, because its includes were free of circles
+            if abs_path in context.included_yamls:
+                context.count_saved_parse()
+                base_yaml = _merge_dicts(base_yaml, context.included_yamls[abs_path], stats=context.stats,
+                                         owned_dicts=owned_dicts)
+                continue
+
+            if abs_path in context.parsed_yamls:
+                context.count_saved_parse()
+                included_parsed_yaml = context.parsed_yamls[abs_path]
+            else:
+                pending_yaml = context.pending_yamls.pop(abs_path, None)
+                if pending_yaml is not None:
+                    started = _clock() if context.stats is not None else None
+                    included_yaml_digest, included_parsed_yaml, file_stats, used_variables = pending_yaml.result()
+                    if context.stats is not None:
+                        context.stats.add_time('prefetch_wait', started)
+                        context.stats.add_stats(file_stats)
+                else:
+                    included_yaml_digest, included_parsed_yaml = context.read_yaml_file(abs_path)
+                    used_variables = None
+                context.cache_yaml_file(abs_path, included_yaml_digest, included_parsed_yaml,
+                                        used_variables=used_variables)
+
+                context.sources[abs_path] = included_yaml_digest
+                context.parsed_yamls[abs_path] = included_parsed_yaml
+                context.count_parse()
 
-            included_parsed_yaml = cls.__parse_yaml(included_yaml_string, variables=variables)
             already_included_stack.append(abs_path)
 
             included_populated_yaml = cls.__populate_includes(
-                included_parsed_yaml, variables=variables,
+                included_parsed_yaml, context,
                 include_cwd=os.path.dirname(abs_path),
                 already_included=already_included_stack)
+            context.included_yamls[abs_path] = included_populated_yaml
 
-            base_yaml = cls.__update_dict_recursive(base_yaml, included_populated_yaml)
+            base_yaml = _merge_dicts(base_yaml, included_populated_yaml, stats=context.stats, owned_dicts=owned_dicts)
 
         # update included base with parsed_yaml
-        return cls.__update_dict_recursive(base_yaml, parsed_yaml)
+        return _merge_dicts(base_yaml, parsed_yaml, stats=context.stats, owned_dicts=owned_dicts)
+
+    @classmethod
+    def __prefetch_includes(cls, abs_paths, context):
+        """
+        Start reading and parsing of the not yet loaded files of an include list on the executor
+
+        The executor gets plain dicts of the variables only, because the providers can not be called (or memoized) in
+        the processes of a process pool. So with providers (or resolver) the files are read here, and the executor
+        gets the resolved variables of the file.
+
+        :type abs_paths: list
+        :type context: _LoadContext
+        """
+        plain_variables = context.variables.get_plain()
+        collect_stats = context.stats is not None
+        for abs_path in abs_paths:
+            if abs_path in context.parsed_yamls or abs_path in context.pending_yamls:
+                continue
+            if plain_variables is not None:
+                pending_yaml = context.executor.submit(cls._prefetch_yaml_file, abs_path, plain_variables,
+                                                       collect_stats=collect_stats, loader=context.loader)
+            else:
+                yaml_string = cls.__read_file(abs_path, stats=context.stats)
+                variables = context.variables.resolve(_get_template_names(yaml_string))
+                pending_yaml = context.executor.submit(cls._prefetch_yaml_file, abs_path, variables,
+                                                       yaml_string=yaml_string, collect_stats=collect_stats,
+                                                       loader=context.loader)
+            context.pending_yamls[abs_path] = pending_yaml
+
+    @classmethod
+    def _read_yaml_file(cls, abs_path, variables, stats=None, loader=None):
+        """
+        Read and parse an included file (it is not name mangled to be picklable for process pools)
+
+        :type abs_path: str
+        :type variables: dict
+        :type stats: LoadStats or None
+        :type loader: type or None
+        :rtype: tuple
+        """
+        yaml_string = cls.__read_file(abs_path, stats=stats)
+        return get_digest(yaml_string), cls.__parse_yaml(yaml_string, variables=variables, stats=stats, loader=loader)
+
+    @classmethod
+    def _prefetch_yaml_file(cls, abs_path, variables, yaml_string=None, collect_stats=False, loader=None):
+        """
+        Read (if it was not read yet) and parse an included file on the executor (it is not name mangled to be
+        picklable for process pools)
+
+        The stats and the used variables of the file are returned with the result, because the stats and the
+        variables of the load are not reachable (and the used variables are not recorded) on the executor.
+
+        :type abs_path: str
+        :type variables: dict
+        :type yaml_string: str or None
+        :type collect_stats: bool
+        :type loader: type or None
+        :rtype: tuple
+        """
+        stats = LoadStats() if collect_stats else None
+        if yaml_string is None:
+            yaml_string = cls.__read_file(abs_path, stats=stats)
+        parsed_yaml = cls.__parse_yaml(yaml_string, variables=variables, stats=stats, loader=loader)
+        used_variables = {name: variables[name] for name in _get_template_names(yaml_string) if name in variables}
+        return get_digest(yaml_string), parsed_yaml, stats, used_variables
+
+    @classmethod
+    def __read_file(cls, abs_path, stats=None):
+        """
+        :type abs_path: str
+        :type stats: LoadStats or None
+        :rtype: str
+        """
+        started = _clock() if stats is not None else None
+        with open(abs_path) as fd:
+            yaml_string = fd.read()
+        if stats is not None:
+            stats.add_time('read', started)
+            stats.files_opened += 1
+            stats.bytes_read += _get_byte_size(yaml_string)
+        return yaml_string
 
     @classmethod
     def __substitute_yaml(cls, yaml_string, variables):
@@ -200,47 +1661,94 @@ class Octoconf(object):
         return substituted_yaml
 
     @classmethod
-    def __inherit_yaml(cls, parsed_yaml, config_name, parent_stack=None):
+    def __inherit_yaml(cls, parsed_yaml, config_name, stats=None):
         """
+        Merge the base chain of the config, without changing the parsed_yaml
+
         :type parsed_yaml: dict
         :type config_name: str
-        :type parent_stack: list or None
+        :type stats: LoadStats or None
         :rtype: dict
         """
-        if not parent_stack:
-            parent_stack = []
-        parent_stack.append(config_name)
+        parent_stack = [config_name]
+        while BASE_CONFIG_SELECTOR in parsed_yaml[parent_stack[-1]].keys():
+            base_name = parsed_yaml[parent_stack[-1]][BASE_CONFIG_SELECTOR]
+            if base_name in parent_stack:
+                raise CircularDependencyError('circular dependency detected; ref_chain={ref_chain!s}'.format(
+                    ref_chain=parent_stack + [base_name]))
+            parent_stack.append(base_name)
 
-        # Has it base?
-        if BASE_CONFIG_SELECTOR not in parsed_yaml[config_name].keys():
-            return parsed_yaml
+        if stats is not None:
+            stats.inheritance_depth = len(parent_stack) - 1
 
-        # Skipping circular-dependency
-        base_name = parsed_yaml[config_name][BASE_CONFIG_SELECTOR]
-        if base_name in parent_stack:
-            raise CircularDependencyError('circular dependency detected; ref_chain={ref_chain!s}'.format(
-                ref_chain=parent_stack + [base_name]))
+        config = parsed_yaml[parent_stack[-1]]
+        for name in reversed(parent_stack[:-1]):
+            config = _merge_dicts(config, parsed_yaml[name], skipped_keys=(BASE_CONFIG_SELECTOR,), stats=stats)
+        return config
 
-        del parsed_yaml[config_name][BASE_CONFIG_SELECTOR]
+    @classmethod
+    def __inherit_yaml_lazy(cls, parsed_yaml, config_name, stats=None):
+        """
+        :type parsed_yaml: dict
+        :type config_name: str
+        :type stats: LoadStats or None
+        :rtype: _LayeredDict
+        """
+        parent_stack = [config_name]
+        layers = [parsed_yaml[config_name]]
 
-        # Get full config with inherited base config
-        parsed_yaml = cls.__inherit_yaml(parsed_yaml, base_name, parent_stack)
+        while BASE_CONFIG_SELECTOR in layers[-1].keys():
+            base_name = layers[-1][BASE_CONFIG_SELECTOR]
+            if base_name in parent_stack:
+                raise CircularDependencyError('circular dependency detected; ref_chain={ref_chain!s}'.format(
+                    ref_chain=parent_stack + [base_name]))
 
-        # Set base_config based current config
-        parsed_yaml[config_name] = cls.__update_dict_recursive(parsed_yaml[base_name], parsed_yaml[config_name])
+            parent_stack.append(base_name)
+            layers.append(parsed_yaml[base_name])
 
-        return parsed_yaml
+        if stats is not None:
+            stats.inheritance_depth = len(layers) - 1
+        return _LayeredDict(layers, hidden_keys=(BASE_CONFIG_SELECTOR,))
 
     @classmethod
-    def __update_dict_recursive(cls, base, update):
+    def __inherit_all_yaml(cls, parsed_yaml, stats=None):
         """
-        :type base: dict
-        :type update: dict or Mapping
+        Inherit every profile in topological order of their bases, without changing the parsed_yaml
+
+        :type parsed_yaml: dict
+        :type stats: LoadStats or None
         :rtype: dict
         """
-        for k, v in update.items():
-            if isinstance(v, Mapping):
-                base[k] = cls.__update_dict_recursive(base.get(k, {}), v)
-            else:
-                base[k] = update[k]
-        return base
+        inherited_yaml = {}
+        inheritance_depths = {}
+        for config_name, config in parsed_yaml.items():
+            if config_name in (DEFAULT_CONFIG_SELECTOR, INCLUDE_FILE_SPECIFIER) or not isinstance(config, Mapping):
+                continue
+
+            # collect the not yet inherited part of the base chain
+            parent_stack = [config_name]
+            while parent_stack[-1] not in inherited_yaml \
+                    and BASE_CONFIG_SELECTOR in parsed_yaml[parent_stack[-1]].keys():
+                base_name = parsed_yaml[parent_stack[-1]][BASE_CONFIG_SELECTOR]
+                if base_name in parent_stack:
+                    raise CircularDependencyError('circular dependency detected; ref_chain={ref_chain!s}'.format(
+                        ref_chain=parent_stack + [base_name]))
+                parent_stack.append(base_name)
+
+            for name in reversed(parent_stack):
+                if name in inherited_yaml:
+                    continue
+
+                base_name = parsed_yaml[name].get(BASE_CONFIG_SELECTOR)
+                if base_name is None:
+                    inherited_yaml[name] = parsed_yaml[name]
+                    inheritance_depths[name] = 0
+                else:
+                    inherited_yaml[name] = _merge_dicts(inherited_yaml[base_name], parsed_yaml[name],
+                                                        skipped_keys=(BASE_CONFIG_SELECTOR,), stats=stats)
+                    inheritance_depths[name] = inheritance_depths[base_name] + 1
+
+        if stats is not None:
+            stats.inheritance_depth = max(inheritance_depths.values()) if inheritance_depths else 0
+        return {config_name: inherited_yaml[config_name]
+                for config_name in parsed_yaml.keys() if config_name in inherited_yaml}
@@ -0,0 +1,269 @@
+import datetime
+import re
+from collections import Mapping
+
+try:
+    from urllib.parse import urlparse
+except ImportError:  # pragma: no cover
+    from urlparse import urlparse
+
+ROOT_SOURCE_NAME = '<string>'
+
+_STRING_TYPES = (str, type(u''))
+_TEXT_TYPE = type(u'')
+_INTEGER_TYPES = tuple(set(type(value) for value in (0, 2 ** 64)))
+_TRUE_STRINGS = frozenset(['true', 'yes', 'on', '1'])
+_FALSE_STRINGS = frozenset(['false', 'no', 'off', '0'])
+_DURATION_REGEX = re.compile(r'^\s*(?:(\d+(?:\.\d+)?)\s*(ms|s|m|h|d|w)\s*)+$')
+_DURATION_PART_REGEX = re.compile(r'(\d+(?:\.\d+)?)\s*(ms|s|m|h|d|w)')
+_DURATION_UNITS = {
+    'ms': datetime.timedelta(milliseconds=1),
+    's': datetime.timedelta(seconds=1),
+    'm': datetime.timedelta(minutes=1),
+    'h': datetime.timedelta(hours=1),
+    'd': datetime.timedelta(days=1),
+    'w': datetime.timedelta(weeks=1),
+}
+
+
+class SchemaError(ValueError):
+    def __init__(self, reason, path, source=None):
+        """
+        :type reason: str
+        :type path: tuple
+        :type source: str or None
+        """
+        super(SchemaError, self).__init__(reason)
+        self.reason = reason
+        self.path = path
+        self.source = source
+
+    def __str__(self):
+        return '{}; path={!r}, source={!r}'.format(self.reason, '.'.join(str(key) for key in self.path), self.source)
+
+
+class Optional(object):
+    def __init__(self, spec, default=None):
+        """
+        Mark a key of the schema as optional; the missing key gets the default
+
+        :type spec: object
+        :type default: object
+        """
+        self.spec = spec
+        self.default = default
+
+
+class Duration(object):
+    """
+    Duration from seconds (e.g. ``90``) or from units (e.g. ``1h 30m``, ``500ms``) into ``datetime.timedelta``
+    """
+
+    def __call__(self, value):
+        """
+        :type value: int or float or str
+        :rtype: datetime.timedelta
+        """
+        if isinstance(value, bool):
+            raise ValueError('expected duration, got {!r}'.format(value))
+        if isinstance(value, _INTEGER_TYPES + (float,)):
+            return datetime.timedelta(seconds=value)
+        if isinstance(value, _STRING_TYPES) and _DURATION_REGEX.match(value):
+            return sum((float(amount) * _DURATION_UNITS[unit]
+                        for amount, unit in _DURATION_PART_REGEX.findall(value)), datetime.timedelta())
+        raise ValueError('expected duration, got {!r}'.format(value))
+
+
+class Url(object):
+    def __init__(self, schemes=None):
+        """
+        URL string with scheme and host
+
+        :type schemes: list or None
+        """
+        self.schemes = schemes
+
+    def __call__(self, value):
+        """
+        :type value: str
+        :rtype: str
+        """
+        if not isinstance(value, _STRING_TYPES):
+            raise ValueError('expected URL, got {!r}'.format(value))
+        parsed_url = urlparse(value)
+        if not parsed_url.scheme or not parsed_url.netloc:
+            raise ValueError('expected URL, got {!r}'.format(value))
+        if self.schemes is not None and parsed_url.scheme not in self.schemes:
+            raise ValueError('expected URL with scheme of {!r}, got {!r}'.format(list(self.schemes), value))
+        return value
+
+
+class Schema(object):
+    def __init__(self, spec, allow_extra=False):
+        """
+        Declaration of the typed config, what is compiled to validators once
+
+        The ``spec`` is a dict of the keys, where the values are types (``int``, ``float``, ``bool``, ``str``),
+        converter callables (e.g. ``Duration()``, ``Url()``), nested dicts, or lists of one spec for the items. The
+        keys are required, unless they are wrapped into ``Optional()``. The not declared keys are errors, unless the
+        ``allow_extra`` is set.
+
+        :type spec: dict
+        :type allow_extra: bool
+        """
+        self.__validate = _compile(spec, allow_extra)
+
+    def validate(self, data):
+        """
+        Check and coerce the config
+
+        :type data: dict or Mapping
+        :rtype: dict
+        """
+        return self.__validate(data, ())
+
+
+def _compile(spec, allow_extra):
+    """
+    :type spec: object
+    :type allow_extra: bool
+    :rtype: callable
+    """
+    if isinstance(spec, dict):
+        return _compile_mapping(spec, allow_extra)
+    if isinstance(spec, list):
+        if len(spec) != 1:
+            raise TypeError('list spec has to contain the spec of the items only: {!r}'.format(spec))
+        return _compile_list(_compile(spec[0], allow_extra))
+    if spec in _STRING_TYPES:
+        return _compile_converter(_to_text)
+    if spec is bool:
+        return _compile_converter(_to_bool)
+    if spec is int:
+        return _compile_converter(_to_int)
+    if spec is float:
+        return _compile_converter(_to_float)
+    if callable(spec):
+        return _compile_converter(spec)
+    raise TypeError('unsupported spec: {!r}'.format(spec))
+
+
+def _compile_mapping(spec, allow_extra):
+    """
+    :type spec: dict
+    :type allow_extra: bool
+    :rtype: callable
+    """
+    fields = []
+    for key, field_spec in spec.items():
+        if isinstance(field_spec, Optional):
+            fields.append((key, _compile(field_spec.spec, allow_extra), False, field_spec.default))
+        else:
+            fields.append((key, _compile(field_spec, allow_extra), True, None))
+    keys = frozenset(spec)
+
+    def validate_mapping(value, path):
+        if not isinstance(value, Mapping):
+            raise SchemaError('expected dict, got {!r}'.format(value), path)
+
+        validated = {}
+        for key, validate, is_required, default in fields:
+            if key in value:
+                validated[key] = validate(value[key], path + (key,))
+            elif is_required:
+                raise SchemaError('missing required key', path + (key,))
+            else:
+                validated[key] = default
+
+        for key in value:
+            if key not in keys:
+                if not allow_extra:
+                    raise SchemaError('unexpected key', path + (key,))
+                validated[key] = value[key]
+        return validated
+
+    return validate_mapping
+
+
+def _compile_list(validate_item):
+    """
+    :type validate_item: callable
+    :rtype: callable
+    """
+    def validate_list(value, path):
+        if not isinstance(value, list):
+            raise SchemaError('expected list, got {!r}'.format(value), path)
+        return [validate_item(item, path + (index,)) for index, item in enumerate(value)]
+
+    return validate_list
+
+
+def _compile_converter(convert):
+    """
+    :type convert: callable
+    :rtype: callable
+    """
+    def validate_value(value, path):
+        try:
+            return convert(value)
+        except (TypeError, ValueError) as e:
+            raise SchemaError(str(e), path)
+
+    return validate_value
+
+
+def _to_text(value):
+    """
+    :type value: object
+    :rtype: str
+    """
+    if isinstance(value, _STRING_TYPES):
+        return value
+    if isinstance(value, _INTEGER_TYPES + (float,)) and not isinstance(value, bool):
+        return _TEXT_TYPE(value)
+    raise ValueError('expected string, got {!r}'.format(value))
+
+
+def _to_bool(value):
+    """
+    :type value: object
+    :rtype: bool
+    """
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, _STRING_TYPES):
+        if value.lower() in _TRUE_STRINGS:
+            return True
+        if value.lower() in _FALSE_STRINGS:
+            return False
+    raise ValueError('expected bool, got {!r}'.format(value))
+
+
+def _to_int(value):
+    """
+    :type value: object
+    :rtype: int
+    """
+    if isinstance(value, _INTEGER_TYPES) and not isinstance(value, bool):
+        return value
+    if isinstance(value, _STRING_TYPES):
+        try:
+            return int(value.strip())
+        except ValueError:
+            pass
+    raise ValueError('expected int, got {!r}'.format(value))
+
+
+def _to_float(value):
+    """
+    :type value: object
+    :rtype: float
+    """
+    if isinstance(value, _INTEGER_TYPES + (float,)) and not isinstance(value, bool):
+        return float(value)
+    if isinstance(value, _STRING_TYPES):
+        try:
+            return float(value.strip())
+        except ValueError:
+            pass
+    raise ValueError('expected float, got {!r}'.format(value))
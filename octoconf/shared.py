@@ -0,0 +1,232 @@
+import mmap
+import os
+import pickle
+import struct
+
+from .cache import write_file_atomically
+from .octoconf import ConfigObject, Mapping, _is_mapping
+
+SHARED_FORMAT_VERSION = 1
+
+_MAGIC = b'OCSH'
+_HEADER = struct.Struct('<4sII')
+_TAG = struct.Struct('<c')
+_COUNT = struct.Struct('<cI')
+_OFFSET = struct.Struct('<I')
+_INTEGER = struct.Struct('<cq')
+_FLOAT = struct.Struct('<cd')
+
+_INTEGER_RANGE = (-2 ** 63, 2 ** 63)
+_TEXT_TYPE = type(u'')
+_CONSTANTS = {None: b'N', True: b'T', False: b'F'}
+_CONSTANT_VALUES = {b'N': None, b'T': True, b'F': False}
+
+
+def publish_config(config, path):
+    """
+    Write a resolved config into a compact, read-only file, what can be attached by many processes
+
+    The file can be on a memory backed file system (e.g. ``/dev/shm``) to share it without disk I/O.
+
+    :type config: ConfigObject or octoconf.frozen.FrozenConfigObject or dict
+    :type path: str
+    :rtype: int
+    """
+    data = config.get_dict() if hasattr(config, 'get_dict') else config
+    encoded = _encode(data)
+    write_file_atomically(path, encoded)
+    return len(encoded)
+
+
+def attach_config(path):
+    """
+    Map a published config into the memory, and wrap it without decoding
+
+    The nodes are decoded at their access, so the pages of the file are shared by the processes, what attached it. The
+    config is copy-on-write (see ``shared=True`` of ``loads_all()``), so its changes are private to the process.
+
+    :type path: str
+    :rtype: ConfigObject
+    """
+    if os.path.getsize(path) < _HEADER.size:
+        raise ValueError('bad formatted shared config: {!r}'.format(path))
+    with open(path, 'rb') as fd:
+        buffer = mmap.mmap(fd.fileno(), 0, access=mmap.ACCESS_READ)
+
+    magic, version, root_offset = _HEADER.unpack_from(buffer, 0)
+    if magic != _MAGIC:
+        raise ValueError('bad formatted shared config: {!r}'.format(path))
+    if version != SHARED_FORMAT_VERSION:
+        raise ValueError('unsupported shared config version: {!r}'.format(version))
+
+    return ConfigObject(_SharedMapping(buffer, root_offset), shared=True)
+
+
+class _SharedMapping(Mapping):
+    def __init__(self, buffer, offset):
+        """
+        Read-only view of an encoded dict
+
+        The offsets of the values are indexed by the keys at the first access, and the nested views are memoized.
+
+        :type buffer: mmap.mmap
+        :type offset: int
+        """
+        self.__buffer = buffer
+        self.__offset = offset
+        self.__value_offsets = None
+        self.__views = {}
+
+    def __getitem__(self, key):
+        value_offset = self.__get_value_offsets()[key]
+        view = self.__views.get(value_offset)
+        if view is not None:
+            return view
+
+        value = _decode(self.__buffer, value_offset, as_view=True)
+        if isinstance(value, _SharedMapping):
+            self.__views[value_offset] = value
+        return value
+
+    def __iter__(self):
+        return iter(self.__get_value_offsets())
+
+    def __len__(self):
+        return len(self.__get_value_offsets())
+
+    def __contains__(self, key):
+        return key in self.__get_value_offsets()
+
+    def __get_value_offsets(self):
+        """
+        :rtype: dict
+        """
+        if self.__value_offsets is None:
+            self.__value_offsets = dict(_iter_item_offsets(self.__buffer, self.__offset))
+        return self.__value_offsets
+
+
+def _encode(data):
+    """
+    Encode the nodes into a buffer, where the dicts and the lists are tables of the offsets of their items
+
+    The equal scalars are stored once.
+
+    :type data: dict or Mapping
+    :rtype: bytearray
+    """
+    buffer = bytearray(_HEADER.size)
+    scalar_offsets = {}
+    root_offset = None
+    pending_nodes = [(data, None)]
+    while pending_nodes:
+        value, reference_offset = pending_nodes.pop()
+
+        scalar_key = None
+        if not _is_mapping(value) and not isinstance(value, (list, tuple)):
+            try:
+                scalar_key = (type(value), value)
+                offset = scalar_offsets.get(scalar_key)
+            except TypeError:
+                scalar_key = offset = None
+            if offset is None:
+                offset = len(buffer)
+                buffer += _encode_scalar(value)
+                if scalar_key is not None:
+                    scalar_offsets[scalar_key] = offset
+        else:
+            offset = len(buffer)
+            if _is_mapping(value):
+                items = list(value.items())
+                buffer += _COUNT.pack(b'M', len(items))
+                table_offset = len(buffer)
+                buffer += b'\0' * (8 * len(items))
+                for index, (key, item) in enumerate(items):
+                    pending_nodes.append((key, table_offset + 8 * index))
+                    pending_nodes.append((item, table_offset + 8 * index + 4))
+            else:
+                buffer += _COUNT.pack(b'A', len(value))
+                table_offset = len(buffer)
+                buffer += b'\0' * (4 * len(value))
+                for index, item in enumerate(value):
+                    pending_nodes.append((item, table_offset + 4 * index))
+
+        if reference_offset is None:
+            root_offset = offset
+        else:
+            _OFFSET.pack_into(buffer, reference_offset, offset)
+
+    _HEADER.pack_into(buffer, 0, _MAGIC, SHARED_FORMAT_VERSION, root_offset)
+    return buffer
+
+
+def _encode_scalar(value):
+    """
+    :type value: object
+    :rtype: bytes
+    """
+    value_type = type(value)
+    if value_type is bool or value is None:
+        return _CONSTANTS[value]
+    if value_type is int and _INTEGER_RANGE[0] <= value < _INTEGER_RANGE[1]:
+        return _INTEGER.pack(b'I', value)
+    if value_type is float:
+        return _FLOAT.pack(b'D', value)
+    if value_type is _TEXT_TYPE:
+        encoded = value.encode('utf-8')
+        return _COUNT.pack(b'S', len(encoded)) + encoded
+    if value_type is bytes:
+        return _COUNT.pack(b'B', len(value)) + value
+
+    # the other YAML types (e.g. dates and sets) are pickled
+    encoded = pickle.dumps(value, protocol=2)
+    return _COUNT.pack(b'P', len(encoded)) + encoded
+
+
+def _decode(buffer, offset, as_view=False):
+    """
+    :type buffer: mmap.mmap
+    :type offset: int
+    :type as_view: bool
+    :rtype: object
+    """
+    tag = _TAG.unpack_from(buffer, offset)[0]
+    if tag in _CONSTANT_VALUES:
+        return _CONSTANT_VALUES[tag]
+    if tag == b'I':
+        return _INTEGER.unpack_from(buffer, offset)[1]
+    if tag == b'D':
+        return _FLOAT.unpack_from(buffer, offset)[1]
+
+    count = _COUNT.unpack_from(buffer, offset)[1]
+    start = offset + _COUNT.size
+    if tag == b'S':
+        return buffer[start:start + count].decode('utf-8')
+    if tag == b'B':
+        return buffer[start:start + count]
+    if tag == b'P':
+        return pickle.loads(buffer[start:start + count])
+    if tag == b'M':
+        if as_view:
+            return _SharedMapping(buffer, offset)
+        # the dicts in lists are not wrapped by ConfigObject, so they are decoded
+        return {key: _decode(buffer, value_offset) for key, value_offset in _iter_item_offsets(buffer, offset)}
+    if tag == b'A':
+        return [_decode(buffer, item_offset) for item_offset in
+                struct.unpack_from('<{}I'.format(count), buffer, start)]
+    raise ValueError('bad formatted shared config; unknown tag at {}: {!r}'.format(offset, tag))
+
+
+def _iter_item_offsets(buffer, offset):
+    """
+    Iterate the decoded keys and the value offsets of an encoded dict
+
+    :type buffer: mmap.mmap
+    :type offset: int
+    :rtype: collections.Iterator
+    """
+    count = _COUNT.unpack_from(buffer, offset)[1]
+    table_offset = offset + _COUNT.size
+    for index in range(count):
+        key_offset, value_offset = struct.unpack_from('<II', buffer, table_offset + 8 * index)
+        yield _decode(buffer, key_offset), value_offset
@@ -0,0 +1,165 @@
+import string
+import yaml
+
+from .cache import get_digest
+from .frozen import freeze_config
+from .octoconf import Octoconf, ConfigObject, UndefinedVariableError, _LazyVariables, _LoadContext, _get_loader
+
+
+class _TemplateString(type(u'')):
+    """
+    Quoted YAML scalar, what contains variables; it remains a string after the substitution
+    """
+
+
+class _PlainTemplateString(_TemplateString):
+    """
+    Plain YAML scalar, what contains variables; its type is resolved after the substitution
+    """
+
+
+def _construct_template_str(loader, node):
+    value = loader.construct_yaml_str(node)
+    if '$' not in value:
+        return value
+    if not node.style:
+        return _PlainTemplateString(value)
+    return _TemplateString(value)
+
+
+_TEMPLATE_LOADERS = {}
+
+
+def _get_template_loader(loader):
+    """
+    :type loader: type
+    :rtype: type
+    """
+    template_loader = _TEMPLATE_LOADERS.get(loader)
+    if template_loader is None:
+        template_loader = type('Template' + loader.__name__, (loader,), {})
+        template_loader.add_constructor(u'tag:yaml.org,2002:str', _construct_template_str)
+        _TEMPLATE_LOADERS[loader] = template_loader
+    return template_loader
+
+
+class _TemplateRenderer(object):
+    def __init__(self, variables):
+        """
+        Copy the parsed template and substitute the variables in its template scalars
+
+        :type variables: dict
+        """
+        self.__variables = variables
+        self.__resolver = yaml.resolver.Resolver()
+        self.__constructor = yaml.constructor.SafeConstructor()
+
+    def render(self, node):
+        if isinstance(node, dict):
+            return {self.render(key): self.render(value) for key, value in node.items()}
+        if isinstance(node, list):
+            return [self.render(item) for item in node]
+        if isinstance(node, _TemplateString):
+            return self.__render_string(node)
+        return node
+
+    def __render_string(self, value):
+        try:
+            substituted = string.Template(value).substitute(self.__variables)
+        except KeyError as e:
+            raise UndefinedVariableError('; '.join(e.args))
+
+        if not isinstance(value, _PlainTemplateString):
+            return substituted
+
+        tag = self.__resolver.resolve(yaml.ScalarNode, substituted, (True, False))
+        return self.__constructor.construct_object(yaml.ScalarNode(tag, substituted))
+
+
+class ConfigTemplate(object):
+    def __init__(self, parsed_yaml, include_cwd=None, loader=None):
+        """
+        Parsed config, what can be rendered with many variable sets without parsing it again
+
+        The included files are parsed at the first render what includes them, and the parsed files are reused by
+        the later renders.
+
+        :type parsed_yaml: dict
+        :type include_cwd: str or None
+        :type loader: type or None
+        """
+        self.__parsed_yaml = parsed_yaml
+        self.__include_cwd = include_cwd
+        self.__loader = _get_loader(loader)
+        self.__parsed_files = {}
+
+    @classmethod
+    def load(cls, yaml_stream, include_cwd=None, loader=None):
+        """
+        Parse a YAML stream as a template
+
+        :type yaml_stream: io.StringIO or io.TextIOWrapper
+        :type include_cwd: str or None
+        :type loader: type or None
+        :rtype: ConfigTemplate
+        """
+        return cls.loads(yaml_stream.read(), include_cwd=include_cwd, loader=loader)
+
+    @classmethod
+    def loads(cls, yaml_string, include_cwd=None, loader=None):
+        """
+        Parse a YAML string as a template
+
+        :type yaml_string: str
+        :type include_cwd: str or None
+        :type loader: type or None
+        :rtype: ConfigTemplate
+        """
+        loader = _get_loader(loader)
+        return cls(cls.__parse_template_yaml(yaml_string, loader), include_cwd=include_cwd, loader=loader)
+
+    def render(self, variables=None, used_config=None, lazy=False, frozen=False):
+        """
+        Substitute the variables and return the selected config
+
+        :type variables: dict or None
+        :type used_config: str or None
+        :type lazy: bool
+        :type frozen: bool
+        :rtype: ConfigObject or octoconf.frozen.FrozenConfigObject
+        """
+        variables = _LazyVariables(variables)
+        renderer = _TemplateRenderer(variables)
+
+        def read_yaml_file(abs_path, _variables):
+            digest, parsed_yaml = self.__read_yaml_file(abs_path)
+            return digest, renderer.render(parsed_yaml)
+
+        context = _LoadContext(variables, read_yaml_file=read_yaml_file)
+        config = Octoconf._resolve_yaml(renderer.render(self.__parsed_yaml), context, used_config=used_config,
+                                        include_cwd=self.__include_cwd, lazy=lazy)
+
+        if frozen:
+            return freeze_config(config)
+        return ConfigObject(config)
+
+    def __read_yaml_file(self, abs_path):
+        parsed_file = self.__parsed_files.get(abs_path)
+        if parsed_file is None:
+            with open(abs_path) as fd:
+                yaml_string = fd.read()
+            parsed_file = (get_digest(yaml_string), self.__parse_template_yaml(yaml_string, self.__loader))
+            self.__parsed_files[abs_path] = parsed_file
+        return parsed_file
+
+    @classmethod
+    def __parse_template_yaml(cls, yaml_string, loader):
+        """
+        :type yaml_string: str
+        :type loader: type
+        :rtype: dict
+        """
+        parsed_yaml = yaml.load(yaml_string, Loader=_get_template_loader(loader)) or {}
+        if not isinstance(parsed_yaml, dict):
+            raise ValueError('bad formatted YAML; have to be dict on top level')
+        return parsed_yaml
@@ -0,0 +1,233 @@
+import os
+import threading
+
+from .cache import get_digest
+from .octoconf import Octoconf, ConfigObject, _LazyVariables, _LoadContext, _get_loader
+
+
+class ConfigWatcher(object):
+    def __init__(self, path, variables=None, used_config=None, include_cwd=None, interval=1.0, executor=None,
+                 stats=None, on_error=None, loader=None):
+        """
+        Load the config file, and reload it when the file or any of its included files were changed
+
+        The changes are detected by polling the stats of the files. At reload only the changed files are parsed
+        again, and only their includer files are merged again. The includes are relative to the directory of the
+        config file by default.
+
+        :type path: str
+        :type variables: dict or None
+        :type used_config: str or None
+        :type include_cwd: str or None
+        :type interval: float
+        :type executor: concurrent.futures.Executor or None
+        :type stats: octoconf.octoconf.LoadStats or None
+        :type on_error: callable or None
+        :type loader: type or None
+        """
+        self.__path = os.path.abspath(path)
+        self.__variables = variables
+        self.__used_config = used_config
+        self.__include_cwd = os.path.dirname(self.__path) if include_cwd is None else include_cwd
+        self.__interval = interval
+        self.__executor = executor
+        self.__stats = stats
+        self.__on_error = on_error
+        self.__loader = _get_loader(loader)
+
+        self.__root_parsed_yaml = None
+        self.__sources = {}
+        self.__parsed_yamls = {}
+        self.__included_yamls = {}
+        self.__include_parents = {}
+        self.__unlinked_includes = set()
+        self.__file_stats = {}
+
+        self.__subscribers = []
+        self.__lock = threading.Lock()
+        self.__stop_event = threading.Event()
+        self.__thread = None
+
+        with self.__lock:
+            self.config = self.__load()
+
+    def subscribe(self, callback):
+        """
+        Register a callback, what will be called with the new config after every reload
+
+        :type callback: callable
+        :rtype: callable
+        """
+        self.__subscribers.append(callback)
+        return callback
+
+    def unsubscribe(self, callback):
+        """
+        :type callback: callable
+        """
+        self.__subscribers.remove(callback)
+
+    def check(self):
+        """
+        Reload the config if any of its files were changed
+
+        :rtype: bool
+        """
+        with self.__lock:
+            changed_paths = [path for path, file_stat in self.__file_stats.items()
+                             if self.__get_file_stat(path) != file_stat]
+            changed_paths = [path for path in changed_paths if self.__is_content_changed(path)]
+            if not changed_paths:
+                return False
+
+            for path in changed_paths:
+                self.__invalidate(path)
+            self.config = self.__load()
+            config = self.config
+
+        for callback in list(self.__subscribers):
+            callback(config)
+        return True
+
+    def start(self):
+        """
+        Start polling of the files in a background thread
+        """
+        if self.__thread is not None:
+            return
+
+        self.__stop_event.clear()
+        self.__thread = threading.Thread(target=self.__poll, name='octoconf-watcher')
+        self.__thread.daemon = True
+        self.__thread.start()
+
+    def stop(self):
+        if self.__thread is None:
+            return
+
+        self.__stop_event.set()
+        self.__thread.join()
+        self.__thread = None
+
+    def __poll(self):
+        while not self.__stop_event.wait(self.__interval):
+            try:
+                self.check()
+            except Exception as e:  # pylint: disable=broad-except
+                if self.__on_error is None:
+                    raise
+                self.__on_error(e)
+
+    def __load(self):
+        """
+        :rtype: ConfigObject
+        """
+        variables = _LazyVariables(self.__variables)
+        if self.__root_parsed_yaml is None:
+            self.__file_stats[self.__path] = self.__get_file_stat(self.__path)
+            self.__sources[self.__path], self.__root_parsed_yaml = Octoconf._read_yaml_file(
+                self.__path, variables, stats=self.__stats, loader=self.__loader)
+            if self.__stats is not None:
+                self.__stats.parses += 1
+
+        context = _LoadContext(variables, stats=self.__stats, executor=self.__executor,
+                               sources=self.__sources, parsed_yamls=self.__parsed_yamls,
+                               included_yamls=self.__included_yamls, include_parents=self.__include_parents,
+                               loader=self.__loader)
+        config = Octoconf._resolve_yaml(self.__root_parsed_yaml, context, used_config=self.__used_config,
+                                        include_cwd=self.__include_cwd)
+
+        if any(parent not in self.__include_parents.get(path, ()) for path, parent in self.__unlinked_includes):
+            self.__drop_not_included_files()
+        self.__unlinked_includes.clear()
+
+        for path in self.__sources:
+            if path not in self.__file_stats:
+                self.__file_stats[path] = self.__get_file_stat(path)
+
+        # the config shares subtrees with the kept parsed files, so they are copied at their first change
+        return ConfigObject(config, shared=True)
+
+    def __is_content_changed(self, path):
+        """
+        :type path: str
+        :rtype: bool
+        """
+        self.__file_stats[path] = self.__get_file_stat(path)
+        try:
+            with open(path) as fd:
+                return get_digest(fd.read()) != self.__sources.get(path)
+        except (IOError, OSError):
+            return True
+
+    def __invalidate(self, path):
+        """
+        Drop the parsed YAML of the changed file, and the merged YAMLs of the file and its includers
+
+        :type path: str
+        """
+        self.__parsed_yamls.pop(path, None)
+        self.__sources.pop(path, None)
+        if path == self.__path:
+            self.__root_parsed_yaml = None
+
+        invalidated_paths = set()
+        stack = [path]
+        while stack:
+            included_path = stack.pop()
+            if included_path is None or included_path in invalidated_paths:
+                continue
+            invalidated_paths.add(included_path)
+            self.__included_yamls.pop(included_path, None)
+            stack.extend(self.__include_parents.get(included_path, ()))
+
+        # the includes of the invalidated files (the root file is the None parent) are registered again by their merge,
+        # so the dropped includes lose their parents
+        invalidated_parents = {None if invalidated_path == self.__path else invalidated_path
+                               for invalidated_path in invalidated_paths}
+        invalidated_parents.add(None)
+        for path, parents in self.__include_parents.items():
+            unlinked_parents = parents & invalidated_parents
+            if unlinked_parents:
+                parents.difference_update(unlinked_parents)
+                self.__unlinked_includes.update((path, parent) for parent in unlinked_parents)
+
+    def __drop_not_included_files(self):
+        """
+        Forget the files (and their stats), what are not included anymore
+        """
+        included_paths = {}
+        for included_path, parents in self.__include_parents.items():
+            for parent in parents:
+                included_paths.setdefault(parent, []).append(included_path)
+
+        used_paths = {self.__path}
+        stack = [None]
+        while stack:
+            for included_path in included_paths.get(stack.pop(), ()):
+                if included_path not in used_paths:
+                    used_paths.add(included_path)
+                    stack.append(included_path)
+
+        for path in set(self.__sources) | set(self.__file_stats) | set(self.__include_parents):
+            if path in used_paths:
+                continue
+            self.__sources.pop(path, None)
+            self.__file_stats.pop(path, None)
+            self.__parsed_yamls.pop(path, None)
+            self.__included_yamls.pop(path, None)
+            self.__include_parents.pop(path, None)
+        for parents in self.__include_parents.values():
+            parents.intersection_update(used_paths | {None})
+
+    @staticmethod
+    def __get_file_stat(path):
+        """
+        :type path: str
+        :rtype: tuple or None
+        """
+        try:
+            file_stat = os.stat(path)
+        except OSError:
+            return None
+        return file_stat.st_mtime, file_stat.st_size
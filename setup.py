@@ -49,6 +49,11 @@ setup(
     tests_require=read('requirements-dev.txt').splitlines(),
 
     packages=find_packages(exclude=['tests']),
+    entry_points={
+        'console_scripts': [
+            'octoconf = octoconf.__main__:main',
+        ],
+    },
     cmdclass={
         'test': PyTest
     },
@@ -2,6 +2,7 @@
 # pylint: disable=misplaced-comparison-constant,redefined-outer-name,no-self-use
 
 import pytest
+import yaml as yaml_module
 from io import StringIO
 
 import octoconf
@@ -59,3 +60,39 @@ def test_load_utf8_character_contained_string(utf8_yaml):
 
     assert {'utf8': u'Több hűtőházból kértünk színhúst'} == config.get_dict()
     assert '{{\'utf8\': {!r}}}'.format(u'Több hűtőházból kértünk színhúst') == str(config)
+
+
+class TestYamlLoader(object):
+    TUPLE_YAML = """
+        Orange:
+          size: !!python/tuple [1, 2]
+        """
+
+    def test_default_loader_is_safe(self, minimal_yaml):
+        stats = octoconf.LoadStats()
+        octoconf.loads(minimal_yaml, stats=stats)
+
+        assert issubclass(stats.loader, yaml_module.SafeLoader if not octoconf.LIBYAML_AVAILABLE
+                          else yaml_module.CSafeLoader)
+        with pytest.raises(yaml_module.constructor.ConstructorError):
+            octoconf.loads(self.TUPLE_YAML, used_config='Orange')
+
+    def test_custom_loader(self):
+        config = octoconf.loads(self.TUPLE_YAML, used_config='Orange', loader=yaml_module.Loader)
+
+        assert (1, 2) == config.size
+
+    def test_set_default_loader(self, monkeypatch):
+        monkeypatch.setattr('octoconf.octoconf.YamlLoader', octoconf.octoconf.YamlLoader)
+        octoconf.set_default_loader(yaml_module.Loader)
+
+        assert (1, 2) == octoconf.loads(self.TUPLE_YAML, used_config='Orange').size
+
+    def test_warn_about_pure_python_fallback(self, minimal_yaml, monkeypatch):
+        monkeypatch.setattr('octoconf.octoconf.YamlLoader', yaml_module.SafeLoader)
+        monkeypatch.setattr('octoconf.octoconf._FALLBACK_LOADER', yaml_module.SafeLoader)
+
+        with pytest.warns(octoconf.PurePythonLoaderWarning):
+            config = octoconf.loads(minimal_yaml)
+
+        assert {'orange': 12} == config.get_dict()
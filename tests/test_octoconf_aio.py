@@ -0,0 +1,134 @@
+# pylint: disable=misplaced-comparison-constant,redefined-outer-name,no-self-use
+
+import sys
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+
+import octoconf
+from tests.common import substitute_yaml
+
+pytestmark = pytest.mark.skipif(sys.version_info < (3, 5), reason='the asyncio API requires Python 3.5+')
+
+
+class CountingExecutor(ThreadPoolExecutor):
+    def __init__(self):
+        super(CountingExecutor, self).__init__(max_workers=2)
+        self.submits = 0
+
+    def submit(self, *args, **kwargs):
+        self.submits += 1
+        return super(CountingExecutor, self).submit(*args, **kwargs)
+
+
+@pytest.fixture
+def event_loop():
+    import asyncio
+
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    yield loop
+    asyncio.set_event_loop(None)
+    loop.close()
+
+
+@pytest.fixture
+def config_dir(tmpdir):
+    tmpdir.join('main.yml').write(substitute_yaml("""
+        {_default_}: Orange
+        {_include_}:
+          - fruits.yml
+          - colors.yml
+
+        Orange:
+          {_base_}: Fruit
+          size: ${{size}}
+        """))
+    tmpdir.join('fruits.yml').write(substitute_yaml("""
+        Fruit:
+          color: green
+          weight: 3
+        """))
+    tmpdir.join('colors.yml').write(substitute_yaml("""
+        Orange:
+          color: orange
+        """))
+    return tmpdir
+
+
+def test_aload(event_loop, config_dir):
+    path = str(config_dir.join('main.yml'))
+    include_executor = CountingExecutor()
+
+    config = event_loop.run_until_complete(octoconf.aload(path, variables={'size': 2},
+                                                          include_executor=include_executor))
+    include_executor.shutdown()
+
+    assert {'color': 'orange', 'weight': 3, 'size': 2} == config.get_dict()
+    assert 2 == include_executor.submits
+
+
+def test_aloads(event_loop):
+    yaml = substitute_yaml("""
+        Fruit:
+          size: ${{size}}
+        """)
+
+    config = event_loop.run_until_complete(octoconf.aloads(yaml, variables={'size': 2}, used_config='Fruit',
+                                                           frozen=True))
+
+    assert 2 == config.size
+    with pytest.raises(octoconf.UndefinedVariableError):
+        event_loop.run_until_complete(octoconf.aloads(yaml, used_config='Fruit'))
+
+
+def test_concurrent_loads_share_one_load(event_loop, config_dir):
+    import asyncio
+
+    path = str(config_dir.join('main.yml'))
+    executor = CountingExecutor()
+
+    configs = event_loop.run_until_complete(asyncio.gather(
+        octoconf.aload(path, variables={'size': 2}, executor=executor),
+        octoconf.aload(path, variables={'size': 2}, executor=executor),
+        octoconf.aload(path, variables={'size': 3}, executor=executor),
+    ))
+    executor.shutdown()
+
+    # two loads, and the copies of the two callers of the shared load
+    assert 2 + 2 == executor.submits
+    assert [2, 2, 3] == [config.size for config in configs]
+
+    configs[0].size = 100
+    assert 2 == configs[1].size
+
+
+def test_single_load_is_not_copied(event_loop, config_dir):
+    path = str(config_dir.join('main.yml'))
+    executor = CountingExecutor()
+
+    config = event_loop.run_until_complete(octoconf.aload(path, variables={'size': 2}, executor=executor))
+    executor.shutdown()
+
+    assert 1 == executor.submits
+    assert 2 == config.size
+
+
+def test_concurrent_loads_are_independent(event_loop):
+    import asyncio
+
+    yaml = substitute_yaml("""
+        Fruit:
+          hosts: [a, b]
+          sizes: [{{small: 1}}]
+        """)
+
+    first_config, second_config = event_loop.run_until_complete(asyncio.gather(
+        octoconf.aloads(yaml, used_config='Fruit'),
+        octoconf.aloads(yaml, used_config='Fruit'),
+    ))
+    first_config.hosts.append('c')
+    first_config.sizes[0]['small'] = 2
+    first_config.get_dict()['color'] = 'green'
+
+    assert {'hosts': ['a', 'b'], 'sizes': [{'small': 1}]} == second_config.get_dict()
+    assert 'green' == first_config.color
@@ -0,0 +1,157 @@
+# pylint: disable=misplaced-comparison-constant,redefined-outer-name,no-self-use
+
+import mock
+import os
+import pytest
+import stat
+
+import octoconf
+from tests.common import substitute_yaml
+
+
+@pytest.fixture
+def config_dir(tmpdir):
+    tmpdir.join('alpha.yml').write(substitute_yaml("""
+        Fruits:
+          apple: 1
+          banana: ${{banana}}
+        """))
+    return tmpdir
+
+
+@pytest.fixture
+def main_yaml():
+    return substitute_yaml("""
+        {_default_}: Fruits
+        {_include_}: alpha.yml
+
+        Fruits:
+          orange: 3
+        """)
+
+
+def load(main_yaml, config_dir, banana=2):
+    return octoconf.loads(main_yaml, variables={'banana': banana}, include_cwd=str(config_dir),
+                          cache=octoconf.DiskCache(str(config_dir.join('cache'))))
+
+
+def test_cold_load_stores_resolved_config(main_yaml, config_dir):
+    config = load(main_yaml, config_dir)
+
+    assert {'apple': 1, 'banana': 2, 'orange': 3} == config.get_dict()
+    assert 1 == len(config_dir.join('cache').listdir())
+
+
+def test_warm_load_skips_parsing(main_yaml, config_dir):
+    load(main_yaml, config_dir)
+
+    with mock.patch('yaml.load') as yaml_load_mock:
+        config = load(main_yaml, config_dir)
+
+    assert not yaml_load_mock.called
+    assert {'apple': 1, 'banana': 2, 'orange': 3} == config.get_dict()
+
+
+def test_changed_variables_are_not_served_from_cache(main_yaml, config_dir):
+    load(main_yaml, config_dir)
+    config = load(main_yaml, config_dir, banana=20)
+
+    assert {'apple': 1, 'banana': 20, 'orange': 3} == config.get_dict()
+
+
+def test_changed_include_invalidates_cache(main_yaml, config_dir):
+    load(main_yaml, config_dir)
+    config_dir.join('alpha.yml').write(substitute_yaml("""
+        Fruits:
+          apple: 10
+          banana: ${{banana}}
+          kiwi: 4
+        """))
+
+    config = load(main_yaml, config_dir)
+
+    assert {'apple': 10, 'banana': 2, 'kiwi': 4, 'orange': 3} == config.get_dict()
+
+
+def test_corrupted_cache_entry_is_rebuilt(main_yaml, config_dir):
+    load(main_yaml, config_dir)
+    config_dir.join('cache').listdir()[0].write('garbage')
+
+    config = load(main_yaml, config_dir)
+
+    assert {'apple': 1, 'banana': 2, 'orange': 3} == config.get_dict()
+
+
+def test_keeps_limited_count_of_entries(main_yaml, config_dir):
+    cache = octoconf.DiskCache(str(config_dir.join('cache')), max_entries=2)
+    for banana in range(5):
+        octoconf.loads(main_yaml, variables={'banana': banana}, include_cwd=str(config_dir), cache=cache)
+
+    assert 2 == len(config_dir.join('cache').listdir())
+
+
+@pytest.mark.skipif(os.name != 'posix', reason='the permissions are POSIX only')
+def test_entries_are_private(main_yaml, config_dir):
+    load(main_yaml, config_dir)
+
+    cache_dir = config_dir.join('cache')
+    assert 0 == stat.S_IMODE(os.stat(str(cache_dir)).st_mode) & 0o077
+    assert 0 == stat.S_IMODE(os.stat(str(cache_dir.listdir()[0])).st_mode) & 0o077
+
+
+class TestMemoryCache(object):
+    def load(self, main_yaml, config_dir, cache, banana=2):
+        return octoconf.loads(main_yaml, variables={'banana': banana}, include_cwd=str(config_dir), cache=cache)
+
+    def test_counts_hits_and_misses(self, main_yaml, config_dir):
+        cache = octoconf.MemoryCache()
+
+        self.load(main_yaml, config_dir, cache)
+        with mock.patch('yaml.load') as yaml_load_mock:
+            config = self.load(main_yaml, config_dir, cache)
+
+        assert not yaml_load_mock.called
+        assert {'apple': 1, 'banana': 2, 'orange': 3} == config.get_dict()
+        assert (1, 1, 0) == (cache.hits, cache.misses, cache.evictions)
+
+    def test_results_are_safe_to_change(self, main_yaml, config_dir):
+        cache = octoconf.MemoryCache()
+
+        self.load(main_yaml, config_dir, cache)['apple'] = 100
+        config = self.load(main_yaml, config_dir, cache)
+        config['orange'] = 300
+
+        assert {'apple': 1, 'banana': 2, 'orange': 3} == self.load(main_yaml, config_dir, cache).get_dict()
+
+    def test_evicts_least_recently_used_entries(self, main_yaml, config_dir):
+        cache = octoconf.MemoryCache(max_entries=2)
+
+        self.load(main_yaml, config_dir, cache, banana=1)
+        self.load(main_yaml, config_dir, cache, banana=2)
+        self.load(main_yaml, config_dir, cache, banana=1)
+        self.load(main_yaml, config_dir, cache, banana=3)
+
+        assert 2 == len(cache)
+        assert 1 == cache.evictions
+
+        self.load(main_yaml, config_dir, cache, banana=1)
+        self.load(main_yaml, config_dir, cache, banana=2)
+        assert (2, 4) == (cache.hits, cache.misses)
+
+    def test_evicts_entries_above_byte_limit(self, main_yaml, config_dir):
+        cache = octoconf.MemoryCache(max_entries=None, max_bytes=1)
+
+        self.load(main_yaml, config_dir, cache)
+
+        assert 0 == len(cache)
+        assert 0 == cache.size
+
+    def test_changed_include_invalidates_cache(self, main_yaml, config_dir):
+        cache = octoconf.MemoryCache()
+
+        self.load(main_yaml, config_dir, cache)
+        config_dir.join('alpha.yml').write('Fruits: {apple: 10}')
+        config = self.load(main_yaml, config_dir, cache)
+
+        assert {'apple': 10, 'orange': 3} == config.get_dict()
+        assert (0, 2) == (cache.hits, cache.misses)
@@ -0,0 +1,124 @@
+# pylint: disable=misplaced-comparison-constant,redefined-outer-name,no-self-use
+
+import os
+import pytest
+
+import octoconf
+from octoconf.__main__ import main
+from tests.common import substitute_yaml
+
+
+@pytest.fixture
+def config_dir(tmpdir):
+    tmpdir.join('main.yml').write(substitute_yaml("""
+        {_default_}: Orange
+        {_include_}: fruits.yml
+
+        Orange:
+          {_base_}: Fruit
+          color: orange
+          path: /home/${{USER}}
+        """))
+    tmpdir.join('fruits.yml').write(substitute_yaml("""
+        Fruit:
+          color: green
+          weight: 3
+        """))
+    return tmpdir
+
+
+@pytest.mark.parametrize('extension', ['json', 'marshal'])
+def test_load_compiled(config_dir, extension):
+    artifact_path = str(config_dir.join('config.' + extension))
+    octoconf.compile_config(str(config_dir.join('main.yml')), artifact_path, variables={'USER': 'kiwi'})
+
+    config = octoconf.load_compiled(artifact_path)
+
+    assert {'color': 'orange', 'weight': 3, 'path': '/home/kiwi'} == config.get_dict()
+
+
+def test_load_default_profile_by_name(config_dir):
+    artifact_path = str(config_dir.join('config.json'))
+    octoconf.compile_config(str(config_dir.join('main.yml')), artifact_path, variables={'USER': 'kiwi'})
+
+    assert 'orange' == octoconf.load_compiled(artifact_path, used_config='Orange').color
+
+
+def test_default_profile_of_included_file(tmpdir):
+    tmpdir.join('main.yml').write(substitute_yaml("""
+        {_include_}: fruits.yml
+        """))
+    tmpdir.join('fruits.yml').write(substitute_yaml("""
+        {_default_}: Fruit
+
+        Fruit:
+          weight: 3
+        """))
+    artifact_path = str(tmpdir.join('config.json'))
+    octoconf.compile_config(str(tmpdir.join('main.yml')), artifact_path)
+
+    assert 3 == octoconf.load_compiled(artifact_path, used_config='Fruit').weight
+    assert 3 == octoconf.load_compiled(artifact_path).weight
+
+
+def test_load_selected_profiles(config_dir):
+    artifact_path = str(config_dir.join('config.json'))
+    octoconf.compile_config(str(config_dir.join('main.yml')), artifact_path, used_configs=['Fruit', 'Orange'],
+                            variables={'USER': 'kiwi'})
+
+    assert {'color': 'green', 'weight': 3} == octoconf.load_compiled(artifact_path).get_dict()
+    assert 'orange' == octoconf.load_compiled(artifact_path, used_config='Orange').color
+    assert 3 == octoconf.load_compiled(artifact_path, frozen=True).weight
+
+    with pytest.raises(ValueError) as excinfo:
+        octoconf.load_compiled(artifact_path, used_config='Apple')
+
+    assert 'missing used_config referred node: \'Apple\'' == str(excinfo.value)
+
+
+@pytest.mark.parametrize('value, message', [
+    ('{80: http}', "config can not be stored in json artifact without changes; path=['profiles', 0, 1, 'ports', 80]"),
+    ('2016-05-01', 'config can not be stored in json artifact: '),
+])
+def test_deny_changing_artifact(tmpdir, value, message):
+    tmpdir.join('main.yml').write('Fruit:\n  ports: {}\n'.format(value))
+    artifact_path = str(tmpdir.join('config.json'))
+
+    with pytest.raises(ValueError) as excinfo:
+        octoconf.compile_config(str(tmpdir.join('main.yml')), artifact_path, used_configs=['Fruit'])
+
+    assert str(excinfo.value).startswith(message)
+    assert ['main.yml'] == os.listdir(str(tmpdir))
+
+
+def test_marshal_keeps_integer_keys(tmpdir):
+    tmpdir.join('main.yml').write('Fruit:\n  ports: {80: http}\n')
+    artifact_path = str(tmpdir.join('config.marshal'))
+    octoconf.compile_config(str(tmpdir.join('main.yml')), artifact_path, used_configs=['Fruit'])
+
+    assert {'ports': {80: 'http'}} == octoconf.load_compiled(artifact_path).get_dict()
+
+
+def test_detect_stale_artifact(config_dir):
+    artifact_path = str(config_dir.join('config.json'))
+    octoconf.compile_config(str(config_dir.join('main.yml')), artifact_path, variables={'USER': 'kiwi'})
+
+    included_path = str(config_dir.join('fruits.yml'))
+    stat = os.stat(included_path)
+    config_dir.join('fruits.yml').write('Fruit:\n  weight: 4\n')
+    os.utime(included_path, (stat.st_atime, stat.st_mtime + 10))
+
+    with pytest.raises(octoconf.StaleArtifactError):
+        octoconf.load_compiled(artifact_path)
+
+    assert 3 == octoconf.load_compiled(artifact_path, check_sources=False).weight
+
+
+def test_compile_command(config_dir, capsys):
+    artifact_path = str(config_dir.join('config.bin'))
+
+    assert 0 == main(['compile', str(config_dir.join('main.yml')), '-o', artifact_path, '-v', 'USER=kiwi',
+                      '--format', 'marshal'])
+
+    assert 'compiled 1 profile(s) from 2 source(s)' in capsys.readouterr()[0]
+    assert '/home/kiwi' == octoconf.load_compiled(artifact_path, artifact_format='marshal').path
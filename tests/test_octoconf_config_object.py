@@ -119,3 +119,140 @@ def test_string_representation():
     })
 
     assert '{\'Fruits\': {\'Apple\': \'a\'}}' == str(config)
+
+
+def test_can_get_nodes_with_default(config):
+    assert 42 == config.get('count')
+    assert 'a' == config.get('Fruits').get('Apple')
+    assert config.get('Avocado') is None
+    assert 'none' == config.get('Avocado', 'none')
+
+
+def test_can_check_membership(config):
+    assert 'Apple' in config.Fruits
+    assert 'Avocado' not in config
+    assert 'Avocado' not in config.Fruits
+
+
+def test_reuses_wrappers_of_nested_nodes(config):
+    assert config.Fruits is config.Fruits
+    assert config['Fruits'] is config.get('Fruits')
+
+
+def test_changed_nested_node_gets_new_wrapper(config):
+    fruits = config.Fruits
+    config.Fruits = {'Cherry': 'c'}
+
+    assert fruits is not config.Fruits
+    assert {'Cherry'} == set(config.Fruits)
+
+    config.get_dict()['Fruits'] = {'Kiwi': 'k'}
+
+    assert {'Kiwi'} == set(config.Fruits)
+
+
+def test_has_no_instance_dict(config):
+    assert not hasattr(config, '__dict__')
+
+
+def test_can_get_nodes_by_path(config):
+    assert 'a' == config.get_path('Fruits.Apple')
+    assert 'a' == config.get_path(('Fruits', 'Apple'))
+    assert 'a' == config.get_path(['Fruits', 'Apple'])
+    assert ['small', 'large'] == config.get_path('Sizes')
+    assert {'Apple': 'a', 'Banana': 'b'} == config.get_path('Fruits').get_dict()
+    assert 'b' == config.get_path('Fruits').Banana
+
+
+def test_can_get_not_existing_nodes_by_path_with_default(config):
+    assert config.get_path('Fruits.Avocado') is None
+    assert 'none' == config.get_path('Fruits.Apple.Seed', 'none')
+
+
+def test_can_check_paths(config):
+    assert config.has_path('Fruits.Banana')
+    assert config.has_path(('count',))
+    assert not config.has_path('Fruits.Avocado')
+    assert not config.has_path('Sizes.small')
+
+
+def test_can_get_multiple_paths(config):
+    assert ['a', 42, None] == config.get_paths(['Fruits.Apple', 'count', 'missing'])
+
+
+def test_can_get_paths_of_dotted_keys():
+    config = ConfigObject({'Fruits': {'Apple.Seed': 1}})
+
+    assert 1 == config.get_path(('Fruits', 'Apple.Seed'))
+    assert not config.has_path('Fruits.Apple.Seed')
+
+
+def test_path_lookup_follows_changes(config):
+    assert 'a' == config.get_path('Fruits.Apple')
+
+    config.Fruits.Apple = 'changed'
+    config['Fruits']['Cherry'] = 'c'
+    config.Vegetables = {'Carrot': 'c'}
+
+    assert 'changed' == config.get_path('Fruits.Apple')
+    assert 'c' == config.get_path('Fruits.Cherry')
+    assert 'c' == config.get_path('Vegetables.Carrot')
+
+
+def test_path_lookup_of_nested_node_follows_changes(config):
+    fruits = config.Fruits
+    assert 'a' == fruits.get_path('Apple')
+
+    config.get_path('Fruits').Apple = 'changed'
+
+    assert 'changed' == fruits.get_path('Apple')
+
+
+def test_can_iterate_over_leaves(config):
+    assert [
+        (('Fruits', 'Apple'), 'a'),
+        (('Fruits', 'Banana'), 'b'),
+        (('Sizes', 0), 'small'),
+        (('Sizes', 1), 'large'),
+        (('count',), 42),
+    ] == sorted(config.iter_leaves())
+
+
+def test_can_iterate_over_leaves_without_flattening_lists(config):
+    assert [
+        (('Fruits', 'Apple'), 'a'),
+        (('Fruits', 'Banana'), 'b'),
+        (('Sizes',), ['small', 'large']),
+        (('count',), 42),
+    ] == sorted(config.iter_leaves(flatten=False))
+
+
+def test_can_iterate_over_leaves_of_subtree(config):
+    assert [
+        (('Fruits', 'Apple'), 'a'),
+        (('Fruits', 'Banana'), 'b'),
+    ] == sorted(config.iter_leaves(prefix='Fruits'))
+    assert [(('Fruits', 'Apple'), 'a')] == list(config.iter_leaves(prefix=('Fruits', 'Apple')))
+    assert [] == list(config.iter_leaves(prefix='Fruits.Avocado'))
+    assert [] == list(config.iter_leaves(prefix='count.Avocado'))
+
+
+def test_can_iterate_over_leaves_until_max_depth(config):
+    assert [
+        (('Fruits',), {'Apple': 'a', 'Banana': 'b'}),
+        (('Sizes',), ['small', 'large']),
+        (('count',), 42),
+    ] == sorted(config.iter_leaves(max_depth=1), key=lambda leaf: leaf[0])
+    assert [(('Fruits',), {'Apple': 'a', 'Banana': 'b'})] == list(config.iter_leaves(prefix='Fruits', max_depth=0))
+
+
+def test_iterated_leaves_are_not_copied(config):
+    leaves = dict(config.iter_leaves(flatten=False))
+
+    assert leaves[('Sizes',)] is config.get_dict()['Sizes']
+
+
+def test_empty_nodes_are_leaves():
+    config = ConfigObject({'Fruits': {}, 'Sizes': []})
+
+    assert [(('Fruits',), {}), (('Sizes',), [])] == sorted(config.iter_leaves())
@@ -0,0 +1,138 @@
+# pylint: disable=misplaced-comparison-constant,redefined-outer-name,no-self-use
+
+import pickle
+import pytest
+
+import octoconf
+from octoconf import ConfigObject, FrozenConfigObject
+from tests.common import substitute_yaml
+
+
+@pytest.fixture
+def config_dict():
+    return {
+        'Fruits': {
+            'Apple': 'a',
+            'Banana': 'b'
+        },
+        'Sizes': [
+            'small',
+            {'large': 'L'},
+        ],
+        'count': 42,
+        'not-identifier': 1,
+        'get': 2,
+    }
+
+
+@pytest.fixture
+def config(config_dict):
+    return ConfigObject(config_dict).freeze()
+
+
+def test_can_get_nodes(config):
+    assert isinstance(config, FrozenConfigObject)
+    assert isinstance(config.Fruits, FrozenConfigObject)
+    assert 'a' == config.Fruits.Apple
+    assert 'b' == config['Fruits']['Banana']
+    assert 42 == config.count
+    assert 'L' == config.Sizes[1].large
+    assert 1 == config['not-identifier']
+    assert 2 == config['get']
+    assert 42 == config.get('count')
+    assert config.get('Avocado') is None
+
+
+def test_nodes_are_slots(config):
+    assert 'count' in type(config).__slots__
+    assert 'Apple' in type(config.Fruits).__slots__
+    assert not hasattr(config, '__dict__')
+
+
+def test_sections_with_same_keys_share_the_class():
+    config = ConfigObject({'a': {'x': 1}, 'b': {'x': 2}}).freeze()
+
+    assert type(config.a) is type(config.b)
+
+
+def test_sections_with_same_key_set_share_the_class():
+    config = ConfigObject({'a': {'x': 1, 'y': 2}, 'b': {'y': 3, 'x': 4, 'not-identifier': 5}}).freeze()
+
+    assert type(config.a) is type(config.b)
+    assert (4, 3, 5) == (config.b.x, config.b.y, config.b['not-identifier'])
+
+
+def test_generic_class_without_free_entries(monkeypatch):
+    monkeypatch.setattr(octoconf.frozen, '_frozen_classes', {})
+    monkeypatch.setattr(octoconf.frozen, 'FROZEN_CLASSES_MAX_ENTRIES', 1)
+    config = ConfigObject({'a': {'x': 1}, 'b': {'y': 2}}).freeze()
+
+    assert 1 == len(octoconf.frozen._frozen_classes)  # pylint: disable=protected-access
+    assert FrozenConfigObject in (type(config), type(config.a), type(config.b))
+    assert (1, 2) == (config.a.x, config.b.y)
+    assert {'a': {'x': 1}, 'b': {'y': 2}} == config.get_dict()
+
+
+def test_generic_class_of_many_keys(monkeypatch):
+    monkeypatch.setattr(octoconf.frozen, 'FROZEN_CLASS_MAX_SLOTS', 2)
+    config = ConfigObject({'hosts': {'alpha': 1, 'beta': 2, 'gamma': 3}}).freeze()
+
+    assert FrozenConfigObject is type(config.hosts)
+    assert 3 == config.hosts.gamma
+
+
+def test_can_not_get_not_existing_nodes(config):
+    with pytest.raises(AttributeError) as excinfo:
+        print(config.Avocado)
+
+    assert '\'FrozenConfigObject\' object has no attribute \'Avocado\'' == str(excinfo.value)
+
+
+def test_can_not_change_nodes(config):
+    with pytest.raises(TypeError):
+        config.count = 100
+    with pytest.raises(TypeError):
+        config['count'] = 100
+    with pytest.raises(TypeError):
+        config.new = 'new_value'
+    with pytest.raises(AttributeError):
+        config.Sizes.append('medium')
+
+    assert 42 == config.count
+
+
+def test_snapshot_is_independent_from_original(config_dict):
+    config = ConfigObject(config_dict)
+    frozen_config = config.freeze()
+    config.Fruits.Apple = 'changed'
+
+    assert 'a' == frozen_config.Fruits.Apple
+
+
+def test_is_hashable_and_comparable(config, config_dict):
+    other_config = ConfigObject(config_dict).freeze()
+
+    assert config == other_config
+    assert hash(config) == hash(other_config)
+    assert config != ConfigObject({'count': 1}).freeze()
+
+
+def test_dict_representation(config, config_dict):
+    assert config_dict == config.get_dict()
+    assert str(ConfigObject(config_dict)) == str(config)
+
+
+def test_can_be_pickled(config):
+    assert config == pickle.loads(pickle.dumps(config))
+
+
+def test_frozen_load():
+    config = octoconf.loads(substitute_yaml("""
+        {_default_}: Fruits
+
+        Fruits:
+          orange: 12
+        """), frozen=True)
+
+    assert isinstance(config, FrozenConfigObject)
+    assert 12 == config.orange
@@ -1,7 +1,9 @@
 # pylint: disable=misplaced-comparison-constant,redefined-outer-name,no-self-use
 
+import os
 import pytest
 import textwrap
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 
 import octoconf
 from tests.common import substitute_yaml, patch_open_read
@@ -358,3 +360,201 @@ class TestContentOfIncludedFile(object):
             'banana': 13,
             'kiwi': 14,
         } == config.get_dict()
+
+
+class TestParseOfIncludedFile(object):
+    def test_diamond_included_file_is_parsed_once(self):
+        yaml = substitute_yaml("""
+            {_default_}: Fruits
+            {_include_}:
+              - alpha.yml
+              - beta.yml
+            """)
+
+        included_files = {
+            'alpha.yml': substitute_yaml("""
+                {_include_}: vendor.yml
+                Fruits:
+                    apple: 1
+                """),
+            'beta.yml': substitute_yaml("""
+                {_include_}: vendor.yml
+                Fruits:
+                    banana: 2
+                """),
+            'vendor.yml': substitute_yaml("""
+                Fruits:
+                    apple: 10
+                    banana: 20
+                    kiwi: 30
+                """),
+        }
+
+        stats = octoconf.LoadStats()
+        with patch_open_read(included_files):
+            config = octoconf.loads(yaml, stats=stats)
+
+        assert {
+            'apple': 10,
+            'banana': 2,
+            'kiwi': 30,
+        } == config.get_dict()
+        assert 4 == stats.parses
+        assert 1 == stats.saved_parses
+
+
+class TestConcurrentInclude(object):
+    main_yaml = substitute_yaml("""
+        {_default_}: Fruits
+        {_include_}:
+          - alpha.yml
+          - beta.yml
+          - gamma.yml
+
+        Fruits:
+            orange: 1
+        """)
+
+    included_files = {
+        'alpha.yml': substitute_yaml("""
+            {_include_}:
+              - beta.yml
+              - delta.yml
+            Fruits:
+                apple: 2
+                kiwi: 2
+            """),
+        'beta.yml': substitute_yaml("""
+            Fruits:
+                apple: 3
+                banana: 3
+            """),
+        'gamma.yml': substitute_yaml("""
+            {_include_}: delta.yml
+            Fruits:
+                banana: 4
+            """),
+        'delta.yml': substitute_yaml("""
+            Fruits:
+                kiwi: 5
+                mango: 5
+            """),
+    }
+
+    def test_thread_pool_keeps_the_merge_order(self):
+        with patch_open_read(self.included_files):
+            serial_config = octoconf.loads(self.main_yaml)
+
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                stats = octoconf.LoadStats()
+                concurrent_config = octoconf.loads(self.main_yaml, executor=executor, stats=stats)
+
+        assert {
+            'orange': 1,
+            'apple': 3,
+            'banana': 4,
+            'kiwi': 5,
+            'mango': 5,
+        } == serial_config.get_dict()
+        assert serial_config.get_dict() == concurrent_config.get_dict()
+        assert (5, 2) == (stats.parses, stats.saved_parses)
+
+    def test_process_pool(self, tmpdir):
+        for path, content in self.included_files.items():
+            tmpdir.join(path).write(content)
+
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            config = octoconf.loads(self.main_yaml, include_cwd=str(tmpdir), executor=executor)
+
+        assert octoconf.loads(self.main_yaml, include_cwd=str(tmpdir)).get_dict() == config.get_dict()
+
+    def test_errors_are_raised_in_order(self):
+        included_files = {
+            'alpha.yml': substitute_yaml('{_include_}: alpha.yml'),
+            'beta.yml': 'Fruits: ${{undefined}}',
+        }
+
+        with patch_open_read(included_files):
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                with pytest.raises(octoconf.CircularIncludeError):
+                    octoconf.loads(self.main_yaml.replace('- gamma.yml', ''), executor=executor)
+
+
+class TestGlobInclude(object):
+    main_yaml = substitute_yaml("""
+        {_default_}: Fruits
+        {_include_}:
+          - conf.d/*.yml
+          - local.yml
+
+        Fruits:
+            orange: 1
+        """)
+
+    @pytest.fixture
+    def config_dir(self, tmpdir):
+        conf_dir = tmpdir.mkdir('conf.d')
+        conf_dir.join('20-banana.yml').write('Fruits: {banana: 2, kiwi: 2}')
+        conf_dir.join('10-apple.yml').write('Fruits: {apple: 1, kiwi: 1}')
+        conf_dir.join('.30-swap.yml').write('Fruits: {kiwi: 3}')
+        conf_dir.join('README.txt').write('not a config')
+        tmpdir.join('local.yml').write('Fruits: {banana: 4}')
+        return tmpdir
+
+    @pytest.mark.parametrize('selective', [False, True])
+    def test_expanded_in_sorted_order(self, config_dir, selective):
+        config = octoconf.loads(self.main_yaml, include_cwd=str(config_dir), selective=selective)
+
+        assert {'orange': 1, 'apple': 1, 'banana': 4, 'kiwi': 2} == config.get_dict()
+
+    def test_concurrent_load(self, config_dir):
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            config = octoconf.loads(self.main_yaml, include_cwd=str(config_dir), executor=executor)
+
+        assert octoconf.loads(self.main_yaml, include_cwd=str(config_dir)).get_dict() == config.get_dict()
+
+    def test_new_file_parses_only_the_new_file(self, config_dir):
+        cache = octoconf.MemoryCache(max_entries=1)
+        octoconf.loads(self.main_yaml, include_cwd=str(config_dir), cache=cache)
+
+        conf_dir = config_dir.join('conf.d')
+        stat = os.stat(str(conf_dir))
+        conf_dir.join('15-mango.yml').write('Fruits: {mango: 5}')
+        os.utime(str(conf_dir), (stat.st_atime, stat.st_mtime + 10))
+
+        stats = octoconf.LoadStats()
+        config = octoconf.loads(self.main_yaml, include_cwd=str(config_dir), cache=cache, stats=stats)
+
+        assert {'orange': 1, 'apple': 1, 'banana': 4, 'kiwi': 2, 'mango': 5} == config.get_dict()
+        assert (3, 2) == (stats.parses, stats.saved_parses)
+        assert (1, 0) == (len(cache), cache.evictions)
+
+    def test_changed_file_is_parsed_again(self, config_dir):
+        cache = octoconf.MemoryCache()
+        octoconf.loads(self.main_yaml, include_cwd=str(config_dir), cache=cache)
+
+        fragment_path = str(config_dir.join('conf.d', '10-apple.yml'))
+        stat = os.stat(fragment_path)
+        with open(fragment_path, 'w') as fd:
+            fd.write('Fruits: {apple: 7, kiwi: 1}')
+        os.utime(fragment_path, (stat.st_atime, stat.st_mtime + 10))
+
+        config = octoconf.loads(self.main_yaml, include_cwd=str(config_dir), cache=cache)
+
+        assert 7 == config.apple
+
+    def test_concurrent_load_checks_variables_of_cached_file(self, config_dir):
+        config_dir.join('conf.d', '10-apple.yml').write('Fruits: {apple: ${APPLE}}')
+
+        for apple in (1, 2):
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                config = octoconf.loads(self.main_yaml, variables={'APPLE': apple}, include_cwd=str(config_dir),
+                                        cache=octoconf.MemoryCache(), executor=executor)
+
+            assert apple == config.apple
+
+    def test_pattern_in_directory(self, config_dir):
+        with pytest.raises(ValueError) as excinfo:
+            octoconf.loads(substitute_yaml('{_include_}: "*.d/10-apple.yml"'), include_cwd=str(config_dir))
+
+        assert str(excinfo.value).startswith('glob pattern is supported in the file names of includes only')
@@ -0,0 +1,134 @@
+# pylint: disable=misplaced-comparison-constant,redefined-outer-name,no-self-use
+# -*- coding: utf-8 -*-
+
+import io
+import json
+import mock
+import os
+import pytest
+
+import octoconf
+from octoconf.__main__ import main
+from octoconf.index import get_index_path
+from tests.common import substitute_yaml
+
+
+@pytest.fixture
+def config_dir(tmpdir):
+    with io.open(str(tmpdir.join('main.yml')), 'w', encoding='utf-8') as fd:
+        fd.write(substitute_yaml(u"""
+            {_default_}: Tangerine
+            {_include_}: fruits.yml
+
+            Apple:
+              {_base_}: Fruit
+              name: alma á
+
+            # the range of a profile ends at the next top level key
+            Tangerine:
+              {_base_}: Orange
+              size: ${{size}}
+            """))
+    tmpdir.join('fruits.yml').write(substitute_yaml("""
+        Fruit:
+          color: green
+          weight: 3
+
+        Orange:
+          {_base_}: Fruit
+          color: orange
+        """))
+    return tmpdir
+
+
+def test_load_indexed(config_dir):
+    path = str(config_dir.join('main.yml'))
+    stats = octoconf.LoadStats()
+
+    config = octoconf.load_indexed(path, variables={'size': 2}, stats=stats)
+
+    assert {'color': 'orange', 'weight': 3, 'size': 2} == config.get_dict()
+    assert os.path.exists(get_index_path(path))
+    with open(get_index_path(path)) as fd:
+        ranges = json.load(fd)['ranges']
+    included_size = config_dir.join('fruits.yml').size()
+    assert sum(end - start for name, (start, end) in ranges.items() if name != 'Apple') + included_size \
+        == stats.bytes_read
+    assert 2 == stats.files_opened
+    assert u'alma á' == octoconf.load_indexed(path, used_config='Apple', variables={'size': 2}).name
+
+
+def test_byte_ranges(config_dir):
+    path = str(config_dir.join('main.yml'))
+
+    index = octoconf.build_index(path)
+
+    with open(path, 'rb') as fd:
+        data = fd.read()
+    assert {'USED_CONFIG>', '<INCLUDE', 'Apple', 'Tangerine'} == set(index['ranges'])
+    for name, (start, end) in index['ranges'].items():
+        assert data[start:end].decode('utf-8').lstrip().startswith(name)
+    assert len(data) == index['ranges']['Tangerine'][1]
+
+
+def test_rebuild_stale_index(config_dir):
+    path = str(config_dir.join('main.yml'))
+    octoconf.build_index(path)
+
+    stat = os.stat(path)
+    config_dir.join('main.yml').write(substitute_yaml("""
+        {_include_}: fruits.yml
+
+        Kiwi:
+          {_base_}: Fruit
+          color: brown
+        """))
+    os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+
+    assert 'brown' == octoconf.load_indexed(path, used_config='Kiwi').color
+    with open(get_index_path(path)) as fd:
+        assert ['<INCLUDE', 'Kiwi'] == sorted(json.load(fd)['ranges'])
+
+
+def test_parsed_index_is_reused_until_index_is_changed(config_dir):
+    path = str(config_dir.join('main.yml'))
+    octoconf.build_index(path)
+
+    with mock.patch('json.load', side_effect=json.load) as load_mock:
+        for _ in range(2):
+            assert 'orange' == octoconf.load_indexed(path, variables={'size': 2}).color
+        assert 0 == load_mock.call_count
+
+        index_path = get_index_path(path)
+        with open(index_path) as fd:
+            index = json.load(fd)
+        index['ranges'].pop('USED_CONFIG>')
+        with open(index_path, 'w') as fd:
+            json.dump(index, fd)
+
+        with pytest.raises(ValueError):
+            octoconf.load_indexed(path, variables={'size': 2})
+        assert 2 == load_mock.call_count
+
+
+@pytest.mark.parametrize('yaml, message', [
+    ('{Fruit: {size: 1}}', 'bad formatted YAML; have to be block style dict on top level for indexing'),
+    ('Fruit: &fruit\n  size: 1\nApple: *fruit\n',
+     'alias between top level nodes is not supported for indexing: \'Apple\' refers to \'Fruit\''),
+    ('1: one\n', 'top level key has to be string for indexing: 1'),
+])
+def test_not_indexable_yaml(tmpdir, yaml, message):
+    tmpdir.join('main.yml').write(yaml)
+
+    with pytest.raises(ValueError) as excinfo:
+        octoconf.build_index(str(tmpdir.join('main.yml')))
+
+    assert message == str(excinfo.value)
+
+
+def test_index_command(config_dir, capsys):
+    path = str(config_dir.join('main.yml'))
+
+    assert 0 == main(['index', path])
+
+    assert 'indexed 4 top level node(s) into {}'.format(get_index_path(path)) in capsys.readouterr()[0]
@@ -1,9 +1,12 @@
 # pylint: disable=misplaced-comparison-constant,redefined-outer-name,no-self-use
 
+import sys
 import pytest
+from io import StringIO
 
 import octoconf
-from tests.common import substitute_yaml
+from octoconf.octoconf import _merge_dicts, _get_config_data
+from tests.common import substitute_yaml, patch_open_read
 
 
 @pytest.fixture
@@ -159,3 +162,249 @@ def test_multi_level_circular_dependency_detection():
            '\'Fruit\', ' \
            '\'Tangerine\'' \
            ']' == str(excinfo.value)
+
+
+class TestLazyInheritance(object):
+    @pytest.mark.parametrize('used_config', ['Fruit', 'Orange', 'Tangerine'])
+    def test_same_result_as_eager_inheritance(self, single_level_overlapped_yaml, used_config):
+        eager_config = octoconf.loads(single_level_overlapped_yaml, used_config=used_config)
+        lazy_config = octoconf.loads(single_level_overlapped_yaml, used_config=used_config, lazy=True)
+
+        assert eager_config.get_dict() == lazy_config.get_dict()
+        assert list(eager_config) == list(lazy_config)
+        assert str(eager_config) == str(lazy_config)
+
+    def test_multi_level_overlapping(self, multi_level_overlapped_yaml):
+        config = octoconf.loads(multi_level_overlapped_yaml, used_config='MediumFruits', lazy=True)
+
+        assert 15 == config.Kiwi.count
+        assert 2 == config.Kiwi.SmallKiwi.count
+        assert {'count': 1, 'size': 14} == config['Apple']['SmallApple'].get_dict()
+
+    def test_can_change_nodes(self, multi_level_overlapped_yaml):
+        config = octoconf.loads(multi_level_overlapped_yaml, used_config='MediumFruits', lazy=True)
+
+        config.Kiwi.count = 100
+        config.Apple = 'eaten'
+
+        assert 100 == config.Kiwi.count
+        assert 'eaten' == config.Apple
+        assert {'Apple', 'Kiwi'} == set(config)
+
+    def test_circular_dependency_detection(self):
+        yaml = substitute_yaml("""
+            Fruit:
+              {_base_}: Tangerine
+
+            Orange:
+              {_base_}: Fruit
+
+            Tangerine:
+              {_base_}: Orange
+            """)
+
+        with pytest.raises(octoconf.CircularDependencyError) as excinfo:
+            octoconf.loads(yaml, used_config='Tangerine', lazy=True)
+
+        assert 'circular dependency detected; ref_chain=[' \
+               '\'Tangerine\', ' \
+               '\'Orange\', ' \
+               '\'Fruit\', ' \
+               '\'Tangerine\'' \
+               ']' == str(excinfo.value)
+
+
+class TestLoadAll(object):
+    def test_same_result_as_single_loads(self, single_level_overlapped_yaml):
+        configs = octoconf.loads_all(single_level_overlapped_yaml)
+
+        assert ['Fruit', 'Orange', 'Tangerine'] == list(configs)
+        for config_name, config in configs.items():
+            assert octoconf.loads(single_level_overlapped_yaml, used_config=config_name).get_dict() \
+                   == config.get_dict()
+
+    @pytest.mark.parametrize('shared', [False, True])
+    def test_profiles_are_independent(self, multi_level_overlapped_yaml, shared):
+        configs = octoconf.loads_all(multi_level_overlapped_yaml, shared=shared)
+
+        configs['MediumFruits'].Kiwi.SmallKiwi.count = 100
+        configs['SmallFruits'].Apple.SmallApple.count = 200
+
+        assert 2 == configs['SmallFruits'].Kiwi.SmallKiwi.count
+        assert 1 == configs['MediumFruits'].Apple.SmallApple.count
+
+    @pytest.mark.parametrize('shared', [False, True])
+    def test_lists_of_profiles_are_independent(self, shared):
+        yaml = substitute_yaml("""
+            Fruit:
+              hosts: [a, b]
+              sizes: [[1], {{small: 1}}]
+              nested:
+                hosts: [c]
+
+            Apple:
+              {_base_}: Fruit
+            """)
+        configs = octoconf.loads_all(yaml, shared=shared)
+
+        configs['Apple'].hosts.append('EVIL')
+        configs['Apple'].sizes[0].append(2)
+        configs['Apple'].sizes[1]['small'] = 2
+        configs['Apple'].get_path('nested.hosts').append('EVIL')
+
+        assert {'hosts': ['a', 'b'], 'sizes': [[1], {'small': 1}], 'nested': {'hosts': ['c']}} \
+            == configs['Fruit'].get_dict()
+        assert ['a', 'b', 'EVIL'] == configs['Apple'].hosts
+        assert ['c', 'EVIL'] == configs['Apple'].nested.hosts
+
+    def test_stale_wrapper_does_not_overwrite_new_value(self, multi_level_overlapped_yaml):
+        configs = octoconf.loads_all(multi_level_overlapped_yaml, shared=True)
+        old_small_kiwi = configs['MediumFruits'].Kiwi.SmallKiwi
+
+        configs['MediumFruits'].Kiwi['SmallKiwi'] = {'count': 10}
+        old_small_kiwi['count'] = 5
+
+        assert {'count': 10} == configs['MediumFruits'].Kiwi.SmallKiwi.get_dict()
+        assert 5 == old_small_kiwi.count
+        assert 2 == configs['SmallFruits'].Kiwi.SmallKiwi.count
+
+    def test_shared_profiles_reference_unchanged_subtrees(self, multi_level_overlapped_yaml):
+        configs = octoconf.loads_all(multi_level_overlapped_yaml, shared=True)
+
+        assert _get_config_data(configs['MediumFruits'].Kiwi.SmallKiwi) \
+            is _get_config_data(configs['SmallFruits'].Kiwi.SmallKiwi)
+        assert _get_config_data(configs['MediumFruits'].Kiwi) is not _get_config_data(configs['SmallFruits'].Kiwi)
+        assert configs['MediumFruits'].get_path('Kiwi.SmallKiwi') is configs['MediumFruits'].Kiwi.SmallKiwi
+        assert octoconf.loads(multi_level_overlapped_yaml, used_config='MediumFruits').get_dict() \
+            == configs['MediumFruits'].get_dict()
+
+    def test_shared_profiles_copy_on_write(self, multi_level_overlapped_yaml):
+        configs = octoconf.loads_all(multi_level_overlapped_yaml, shared=True)
+        small_kiwi = configs['MediumFruits'].get_path(('Kiwi', 'SmallKiwi'))
+
+        small_kiwi.count = 100
+        configs['MediumFruits'].get_path('Kiwi').color = 'green'
+
+        assert 100 == small_kiwi.count
+        assert 100 == configs['MediumFruits'].Kiwi.SmallKiwi.count
+        assert 100 == configs['MediumFruits'].get_path('Kiwi.SmallKiwi.count')
+        assert 'green' == configs['MediumFruits'].Kiwi.color
+        assert {'SmallKiwi': {'count': 2}, 'count': 3} == configs['SmallFruits'].Kiwi.get_dict()
+        assert 2 == configs['SmallFruits'].get_path('Kiwi.SmallKiwi.count')
+
+    def test_skips_selector_and_include_nodes(self):
+        yaml = substitute_yaml("""
+            {_default_}: Fruit
+
+            Fruit:
+              size: 1
+            """)
+
+        assert ['Fruit'] == list(octoconf.loads_all(yaml))
+
+    def test_load_stream(self):
+        fd = StringIO(substitute_yaml(u"""
+            Fruit:
+              size: 1
+
+            Orange:
+              {_base_}: Fruit
+            """))
+        configs = octoconf.load_all(fd)
+        fd.close()
+
+        assert 1 == configs['Orange'].size
+
+    def test_circular_dependency_detection(self):
+        yaml = substitute_yaml("""
+            Apple:
+              size: 1
+
+            Fruit:
+              {_base_}: Tangerine
+
+            Orange:
+              {_base_}: Fruit
+
+            Tangerine:
+              {_base_}: Orange
+            """)
+
+        with pytest.raises(octoconf.CircularDependencyError) as excinfo:
+            octoconf.loads_all(yaml)
+
+        assert 'circular dependency detected; ref_chain=[' \
+               '\'Fruit\', ' \
+               '\'Tangerine\', ' \
+               '\'Orange\', ' \
+               '\'Fruit\'' \
+               ']' == str(excinfo.value)
+
+
+class TestMergeDicts(object):
+    def test_merge_without_changing_the_inputs(self):
+        base = {'Apple': {'size': 1, 'color': {'skin': 'red'}}, 'Kiwi': {'size': 2}}
+        update = {'Apple': {'color': {'flesh': 'white'}}, 'Orange': {'size': 3}, '<BASE': 'Fruit'}
+
+        merged = _merge_dicts(base, update, skipped_keys=('<BASE',))
+
+        assert {
+            'Apple': {'size': 1, 'color': {'skin': 'red', 'flesh': 'white'}},
+            'Kiwi': {'size': 2},
+            'Orange': {'size': 3},
+        } == merged
+        assert {'Apple': {'size': 1, 'color': {'skin': 'red'}}, 'Kiwi': {'size': 2}} == base
+        assert {'Apple': {'color': {'flesh': 'white'}}, 'Orange': {'size': 3}, '<BASE': 'Fruit'} == update
+
+    def test_share_the_not_merged_subtrees(self):
+        base = {'Apple': {'size': 1}, 'Kiwi': {'size': 2}}
+        update = {'Apple': {'size': 10}, 'Orange': {'size': 3}}
+
+        merged = _merge_dicts(base, update)
+
+        assert merged['Kiwi'] is base['Kiwi']
+        assert merged['Orange'] is update['Orange']
+        assert merged['Apple'] is not base['Apple']
+
+    def test_merge_deeper_than_recursion_limit(self):
+        depth = sys.getrecursionlimit() * 2
+        base, update = {}, {}
+        base_node, update_node = base, update
+        for _ in range(depth):
+            base_node['nested'], update_node['nested'] = {'base': True}, {'update': True}
+            base_node, update_node = base_node['nested'], update_node['nested']
+
+        merged = _merge_dicts(base, update)
+
+        for _ in range(depth):
+            merged = merged['nested']
+            assert merged['base'] and merged['update']
+
+    def test_inheritance_does_not_change_included_profiles(self):
+        yaml = substitute_yaml("""
+            {_include_}: fruits.yml
+
+            Orange:
+              {_base_}: Fruit
+              color: orange
+            """)
+        included_files = {
+            'fruits.yml': substitute_yaml("""
+                Fruit:
+                  color: green
+                  weight: 3
+
+                Tangerine:
+                  {_base_}: Orange
+                """),
+        }
+
+        with patch_open_read(included_files):
+            configs = [octoconf.loads(yaml, used_config=used_config).get_dict()
+                       for used_config in ('Tangerine', 'Orange', 'Fruit')]
+
+        assert [
+            {'color': 'orange', 'weight': 3},
+            {'color': 'orange', 'weight': 3},
+            {'color': 'green', 'weight': 3},
+        ] == configs
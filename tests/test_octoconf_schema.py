@@ -0,0 +1,220 @@
+# pylint: disable=misplaced-comparison-constant,redefined-outer-name,no-self-use
+import datetime
+import io
+import os
+import pytest
+
+import octoconf
+from octoconf import Schema, SchemaError, Optional, Duration, Url
+from tests.common import substitute_yaml
+
+SCHEMA = Schema({
+    'port': int,
+    'ratio': float,
+    'debug': bool,
+    'name': str,
+    'timeout': Duration(),
+    'endpoint': Url(schemes=['http', 'https']),
+    'database': {
+        'host': str,
+        'pool_size': Optional(int, default=4),
+    },
+    'hosts': [str],
+})
+
+yaml_string = substitute_yaml("""
+    {_default_}: Production
+
+    Fallback:
+      port: '8080'
+      ratio: 1
+      debug: 'off'
+      name: 42
+      timeout: 1m 30s
+      endpoint: https://example.com/api
+      database:
+        host: localhost
+      hosts: [a, b]
+
+    Production:
+      {_base_}: Fallback
+      timeout: 500ms
+    """)
+
+
+def test_typed_values():
+    config = octoconf.loads(yaml_string, schema=SCHEMA)
+
+    assert 8080 == config.port
+    assert 1.0 == config.ratio
+    assert config.debug is False
+    assert '42' == config.name
+    assert datetime.timedelta(milliseconds=500) == config.timeout
+    assert 'https://example.com/api' == config.endpoint
+    assert 'localhost' == config.database.host
+    assert 4 == config.database.pool_size
+    assert ('a', 'b') == config.hosts
+
+
+def test_typed_config_is_frozen():
+    config = octoconf.loads(yaml_string, schema=SCHEMA)
+
+    assert isinstance(config, octoconf.FrozenConfigObject)
+    assert type(config) is type(octoconf.loads(yaml_string, schema=SCHEMA))  # pylint: disable=unidiomatic-typecheck
+    with pytest.raises(TypeError):
+        config.port = 1
+
+
+@pytest.mark.parametrize('value, expected', [
+    (90, datetime.timedelta(seconds=90)),
+    (1.5, datetime.timedelta(seconds=1.5)),
+    ('2h', datetime.timedelta(hours=2)),
+    ('1d 12h', datetime.timedelta(days=1, hours=12)),
+    ('1w', datetime.timedelta(weeks=1)),
+])
+def test_duration(value, expected):
+    assert expected == Duration()(value)
+
+
+@pytest.mark.parametrize('spec, value, reason', [
+    (int, 'eight', "expected int, got 'eight'"),
+    (int, True, 'expected int, got True'),
+    (bool, 'maybe', "expected bool, got 'maybe'"),
+    (Duration(), '10 parsecs', "expected duration, got '10 parsecs'"),
+    (Url(), 'localhost', "expected URL, got 'localhost'"),
+    (Url(schemes=['https']), 'ftp://example.com', "expected URL with scheme of ['https'], got 'ftp://example.com'"),
+    ({'host': str}, 'localhost', "expected dict, got 'localhost'"),
+    ([int], 5, 'expected list, got 5'),
+])
+def test_invalid_value(spec, value, reason):
+    with pytest.raises(SchemaError) as excinfo:
+        Schema({'key': spec}).validate({'key': value})
+
+    assert reason == excinfo.value.reason
+    assert ('key',) == excinfo.value.path
+
+
+def test_missing_and_unexpected_keys():
+    with pytest.raises(SchemaError) as excinfo:
+        Schema({'database': {'host': str}}).validate({'database': {}})
+    assert 'missing required key' == excinfo.value.reason
+    assert ('database', 'host') == excinfo.value.path
+
+    with pytest.raises(SchemaError) as excinfo:
+        Schema({'port': int}).validate({'port': 1, 'prot': 2})
+    assert 'unexpected key' == excinfo.value.reason
+    assert ('prot',) == excinfo.value.path
+
+    assert {'port': 1, 'prot': 2} == Schema({'port': int}, allow_extra=True).validate({'port': 1, 'prot': 2})
+
+
+def test_custom_converter():
+    schema = Schema({'level': lambda value: {'low': 1, 'high': 2}[value] if value in ('low', 'high') else int(value)})
+
+    assert {'level': 2} == schema.validate({'level': 'high'})
+    with pytest.raises(SchemaError):
+        schema.validate({'level': 'medium'})
+
+
+def test_error_names_root_source():
+    with pytest.raises(SchemaError) as excinfo:
+        octoconf.loads(yaml_string.replace('500ms', 'soon'), schema=SCHEMA)
+
+    assert octoconf.schema.ROOT_SOURCE_NAME == excinfo.value.source
+    assert "expected duration, got 'soon'; path='timeout', source='<string>'" == str(excinfo.value)
+
+
+def test_error_names_stream_source(tmpdir):
+    path = str(tmpdir.join('main.yml'))
+    with io.open(path, 'w') as fd:
+        fd.write(yaml_string.replace('500ms', 'soon'))
+
+    with pytest.raises(SchemaError) as excinfo:
+        with open(path) as fd:
+            octoconf.load(fd, schema=SCHEMA)
+
+    assert path == excinfo.value.source
+
+
+class TestIncludeSource(object):
+    main_yaml = substitute_yaml("""
+        {_include_}:
+          - defaults.yml
+          - database.yml
+        {_default_}: Production
+
+        Production:
+          {_base_}: Fallback
+          timeout: 500ms
+        """)
+
+    files = {
+        'defaults.yml': substitute_yaml("""
+            Fallback:
+              port: 8080
+              ratio: 1
+              debug: false
+              name: app
+              timeout: 1m
+              endpoint: https://example.com/api
+              hosts: [a, b]
+              database:
+                host: localhost
+            """),
+        'database.yml': substitute_yaml("""
+            Fallback:
+              database:
+                host: [db1, db2]
+            Production:
+              hosts: [c, 7]
+            """),
+    }
+
+    @pytest.fixture
+    def config_dir(self, tmpdir):
+        for path, content in self.files.items():
+            tmpdir.join(path).write(content)
+        return str(tmpdir)
+
+    def test_error_names_included_file(self, config_dir):
+        with pytest.raises(SchemaError) as excinfo:
+            octoconf.loads(self.main_yaml, include_cwd=config_dir, schema=SCHEMA)
+
+        assert ('database', 'host') == excinfo.value.path
+        assert os.path.join(config_dir, 'database.yml') == excinfo.value.source
+
+    def test_error_in_list_item(self, config_dir):
+        schema = Schema({'hosts': [int]}, allow_extra=True)
+        with pytest.raises(SchemaError) as excinfo:
+            octoconf.loads(self.main_yaml, include_cwd=config_dir, schema=schema)
+
+        assert ('hosts', 0) == excinfo.value.path
+        assert os.path.join(config_dir, 'database.yml') == excinfo.value.source
+
+    def test_cached_error_names_included_file(self, config_dir):
+        cache = octoconf.MemoryCache()
+        octoconf.loads(self.main_yaml, include_cwd=config_dir, cache=cache)
+
+        for _ in range(2):
+            with pytest.raises(SchemaError) as excinfo:
+                octoconf.loads(self.main_yaml, include_cwd=config_dir, schema=SCHEMA, cache=cache)
+
+            assert ('database', 'host') == excinfo.value.path
+            assert os.path.join(config_dir, 'database.yml') == excinfo.value.source
+
+    def test_invalid_config_is_not_cached(self, config_dir):
+        cache = octoconf.MemoryCache()
+
+        for _ in range(2):
+            with pytest.raises(SchemaError):
+                octoconf.loads(self.main_yaml, include_cwd=config_dir, schema=SCHEMA, cache=cache)
+
+        assert (0, 0, 2) == (len(cache), cache.hits, cache.misses)
+
+    def test_missing_key_names_parent_source(self, config_dir):
+        schema = Schema({'database': {'port': int}}, allow_extra=True)
+        with pytest.raises(SchemaError) as excinfo:
+            octoconf.loads(self.main_yaml, include_cwd=config_dir, schema=schema, selective=True)
+
+        assert ('database', 'port') == excinfo.value.path
+        assert os.path.join(config_dir, 'database.yml') == excinfo.value.source
@@ -1,9 +1,10 @@
 # pylint: disable=misplaced-comparison-constant,redefined-outer-name,no-self-use
 
 import pytest
+import yaml as yaml_module
 
 import octoconf
-from tests.common import substitute_yaml
+from tests.common import substitute_yaml, patch_open_read
 
 
 def get_yaml(used_config):
@@ -65,3 +66,66 @@ def test_raise_when_referred_config_is_not_exist():
         octoconf.loads(yaml)
 
     assert 'missing used_config referred node: \'Melon\'' == str(excinfo.value)
+
+
+class TestSelectiveLoad(object):
+    @pytest.mark.parametrize('used_config', [None, 'Apple', 'Banana'])
+    def test_same_result_as_full_load(self, used_config):
+        yaml = get_yaml(used_config='Apple')
+
+        assert octoconf.loads(yaml, used_config=used_config).get_dict() \
+            == octoconf.loads(yaml, used_config=used_config, selective=True).get_dict()
+
+    def test_constructs_used_chain_only(self):
+        yaml = substitute_yaml("""
+            {_default_}: Banana
+
+            Fruit: &fruit
+              size: 1
+
+            Apple:
+              broken: !not_constructable_tag 1
+
+            Banana:
+              {_base_}: Fruit
+              <<: *fruit
+              letter: B
+            """)
+
+        with pytest.raises(yaml_module.constructor.ConstructorError):
+            octoconf.loads(yaml)
+
+        assert {'size': 1, 'letter': 'B'} == octoconf.loads(yaml, selective=True).get_dict()
+
+    def test_base_from_included_file(self):
+        yaml = substitute_yaml("""
+            {_include_}: fruits.yml
+
+            Banana:
+              letter: B
+            """)
+        included_files = {
+            'fruits.yml': substitute_yaml("""
+                {_default_}: Banana
+
+                Fruit:
+                  size: 1
+
+                Apple:
+                  broken: !not_constructable_tag 1
+
+                Banana:
+                  {_base_}: Fruit
+                """),
+        }
+
+        with patch_open_read(included_files):
+            config = octoconf.loads(yaml, selective=True)
+
+        assert {'size': 1, 'letter': 'B'} == config.get_dict()
+
+    def test_raise_when_referred_config_is_not_exist(self):
+        with pytest.raises(ValueError) as excinfo:
+            octoconf.loads(get_yaml(used_config='Cherry'), selective=True)
+
+        assert 'missing used_config referred node: \'Cherry\'' == str(excinfo.value)
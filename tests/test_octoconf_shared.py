@@ -0,0 +1,97 @@
+# pylint: disable=misplaced-comparison-constant,redefined-outer-name,no-self-use
+# -*- coding: utf-8 -*-
+
+import datetime
+import multiprocessing
+import os
+import pytest
+
+import octoconf
+from tests.common import substitute_yaml
+
+
+@pytest.fixture
+def config():
+    return octoconf.loads(substitute_yaml(u"""
+        {_default_}: Orange
+
+        Fruit:
+          color: green
+          weight: 3
+          price: 1.5
+          organic: false
+          seller: null
+          picked: 2016-05-01
+          sizes: [1, 2, {{small: 0.5}}]
+          name: narancs ő
+
+        Orange:
+          {_base_}: Fruit
+          color: orange
+          big: 36893488147419103232
+          nested:
+            deeper:
+              color: orange
+        """))
+
+
+@pytest.fixture
+def published_path(tmpdir, config):
+    path = str(tmpdir.join('config.bin'))
+    octoconf.publish_config(config, path)
+    return path
+
+
+def test_attach_config(config, published_path):
+    shared_config = octoconf.attach_config(published_path)
+
+    assert config.get_dict() == shared_config.get_dict()
+    assert 'orange' == shared_config.nested.deeper.color
+    assert shared_config.nested is shared_config.nested
+    assert datetime.date(2016, 5, 1) == shared_config.picked
+    assert {'small': 0.5} == shared_config.sizes[2]
+    assert 'orange' == shared_config.get_path('nested.deeper.color')
+    assert shared_config.has_path(('nested', 'deeper'))
+    assert 3 == shared_config.freeze().weight
+
+
+def test_changes_are_private(published_path):
+    shared_config = octoconf.attach_config(published_path)
+
+    shared_config.nested.deeper.color = 'red'
+    shared_config.weight = 4
+
+    assert 'red' == shared_config.nested.deeper.color
+    assert 4 == shared_config['weight']
+    assert 'orange' == octoconf.attach_config(published_path).nested.deeper.color
+
+
+def test_publish_replaces_attached_file(tmpdir, published_path):
+    attached_config = octoconf.attach_config(published_path)
+    octoconf.publish_config({'weight': 4}, published_path)
+
+    assert 'orange' == attached_config.nested.deeper.color
+    assert {'weight': 4} == octoconf.attach_config(published_path).get_dict()
+    assert ['config.bin'] == os.listdir(str(tmpdir))
+
+
+def read_color(path, queue):
+    queue.put(octoconf.attach_config(path).nested.deeper.color)
+
+
+def test_attach_from_other_process(published_path):
+    queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=read_color, args=(published_path, queue))
+    process.start()
+    process.join()
+
+    assert 'orange' == queue.get(timeout=5)
+
+
+def test_bad_formatted_file(tmpdir):
+    tmpdir.join('config.bin').write('not a config')
+
+    with pytest.raises(ValueError) as excinfo:
+        octoconf.attach_config(str(tmpdir.join('config.bin')))
+
+    assert str(excinfo.value).startswith('bad formatted shared config')
@@ -0,0 +1,107 @@
+# pylint: disable=misplaced-comparison-constant,redefined-outer-name,no-self-use
+
+import pytest
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from io import StringIO
+
+import octoconf
+from octoconf.octoconf import YamlLoader
+from tests.common import substitute_yaml, patch_open_read
+
+
+@pytest.fixture
+def included_yaml():
+    return substitute_yaml("""
+        {_default_}: Tangerine
+        {_include_}: fruits.yml
+
+        Tangerine:
+          {_base_}: Orange
+          size: ${{size}}
+        """)
+
+
+@pytest.fixture
+def included_files():
+    return {
+        'fruits.yml': substitute_yaml(u"""
+            Fruit:
+              color: green
+              weight: 3
+
+            Orange:
+              {_base_}: Fruit
+              color: orange
+            """),
+    }
+
+
+def test_counters(included_yaml, included_files):
+    stats = octoconf.LoadStats()
+    with patch_open_read(included_files):
+        config = octoconf.loads(included_yaml, variables={'size': 2}, stats=stats)
+
+    assert {'color': 'orange', 'weight': 3, 'size': 2} == config.get_dict()
+    assert 2 == stats.parses
+    assert 1 == stats.files_opened
+    assert len(included_files['fruits.yml'].encode('utf-8')) == stats.bytes_read
+    assert 2 == stats.inheritance_depth
+    assert 0 < stats.merged_nodes
+    assert YamlLoader is stats.loader
+
+
+def test_timings(included_yaml, included_files):
+    stats = octoconf.LoadStats()
+    with patch_open_read(included_files):
+        octoconf.load(StringIO(included_yaml), variables={'size': 2}, stats=stats)
+
+    assert {'read', 'substitute', 'parse', 'include', 'inherit', 'wrap', 'total'} == set(stats.timings)
+    assert all(0 <= seconds for seconds in stats.timings.values())
+    assert stats.timings['include'] <= stats.timings['total']
+
+
+@pytest.mark.parametrize('options', [
+    {'executor': ThreadPoolExecutor},
+    {'executor': ProcessPoolExecutor},
+    {'executor': ThreadPoolExecutor, 'provider': True},
+    {'selective': True},
+])
+def test_counters_of_included_files(tmpdir, included_yaml, included_files, options):
+    for path, content in included_files.items():
+        tmpdir.join(path).write(content)
+    variables = {'size': (lambda: 2) if options.get('provider') else 2}
+    stats = octoconf.LoadStats()
+
+    if 'executor' in options:
+        with options['executor'](max_workers=2) as executor:
+            config = octoconf.loads(included_yaml, variables=variables, include_cwd=str(tmpdir), stats=stats,
+                                    executor=executor)
+    else:
+        config = octoconf.loads(included_yaml, variables=variables, include_cwd=str(tmpdir), stats=stats,
+                                selective=options['selective'])
+
+    assert {'color': 'orange', 'weight': 3, 'size': 2} == config.get_dict()
+    assert 1 == stats.files_opened
+    assert len(included_files['fruits.yml'].encode('utf-8')) == stats.bytes_read
+    assert {'read', 'substitute', 'parse'} <= set(stats.timings)
+
+
+@pytest.mark.parametrize('lazy', [False, True])
+def test_inheritance_depth_without_base(lazy):
+    yaml = """
+        Fruit:
+          color: green
+        """
+    stats = octoconf.LoadStats()
+    octoconf.loads(yaml, used_config='Fruit', stats=stats, lazy=lazy)
+
+    assert 0 == stats.inheritance_depth
+
+
+def test_load_all(included_yaml, included_files):
+    stats = octoconf.LoadStats()
+    with patch_open_read(included_files):
+        octoconf.loads_all(included_yaml, variables={'size': 2}, stats=stats)
+
+    assert 2 == stats.inheritance_depth
+    assert {'substitute', 'parse', 'read', 'include', 'inherit', 'wrap', 'total'} == set(stats.timings)
@@ -1,8 +1,12 @@
 # pylint: disable=misplaced-comparison-constant,redefined-outer-name,no-self-use
 
+import mock
 import pytest
+import yaml as yaml_module
+from concurrent.futures import ProcessPoolExecutor
 
 import octoconf
+from tests.common import substitute_yaml, patch_open_read
 
 
 def test_substitute_variables():
@@ -41,3 +45,219 @@ def test_can_not_use_variable_without_define():
         octoconf.loads(yaml, used_config='notDefinedVariable')
 
     assert 'notDefinedVariable' == str(excinfo.value)
+
+
+class TestLazyVariables(object):
+    def test_call_used_providers_only_once(self):
+        yaml = substitute_yaml("""
+            {_include_}: fruits.yml
+
+            Fruits:
+              path: /home/${{USER}}/${{USER}}
+            """)
+        included_files = {
+            'fruits.yml': 'Fruits:\n  host: ${HOST}\n',
+        }
+        user_provider = mock.Mock(return_value='test')
+        host_provider = mock.Mock(return_value='localhost')
+        unused_provider = mock.Mock(return_value='unused')
+
+        with patch_open_read(included_files):
+            config = octoconf.loads(yaml, used_config='Fruits', variables={
+                'USER': user_provider,
+                'HOST': host_provider,
+                'UNUSED': unused_provider,
+            })
+
+        assert {'path': '/home/test/test', 'host': 'localhost'} == config.get_dict()
+        assert 1 == user_provider.call_count
+        assert 1 == host_provider.call_count
+        assert 0 == unused_provider.call_count
+
+    def test_resolver_hook(self):
+        class Variables(dict):
+            def __missing__(self, name):
+                if name.startswith('FRUIT_'):
+                    return name[len('FRUIT_'):].lower()
+                raise KeyError(name)
+
+        yaml = """
+            Fruits:
+              name: ${FRUIT_KIWI}
+              size: ${size}
+            """
+        config = octoconf.loads(yaml, variables=Variables(size=2), used_config='Fruits')
+
+        assert {'name': 'kiwi', 'size': 2} == config.get_dict()
+
+        with pytest.raises(octoconf.UndefinedVariableError) as excinfo:
+            octoconf.loads('Fruits:\n  kiwi: ${notDefinedVariable}\n', variables=Variables(), used_config='Fruits')
+
+        assert 'notDefinedVariable' == str(excinfo.value)
+
+    def test_render_template_with_providers(self):
+        template = octoconf.loads_template("""
+            Fruits:
+              size: ${size}
+            """)
+        size_provider = mock.Mock(return_value='3')
+
+        assert 3 == template.render({'size': size_provider, 'unused': mock.Mock()}, used_config='Fruits').size
+        assert 1 == size_provider.call_count
+
+    def test_cache_calls_used_providers_only(self, tmpdir):
+        tmpdir.join('fruits.yml').write('Fruits:\n  host: ${HOST}\n')
+        yaml = substitute_yaml("""
+            {_include_}: fruits.yml
+
+            Fruits:
+              user: ${{USER}}
+            """)
+        cache = octoconf.MemoryCache()
+        host_provider = mock.Mock(return_value='localhost')
+        unused_provider = mock.Mock(return_value='unused')
+        variables = {'USER': 'test', 'HOST': host_provider, 'UNUSED': unused_provider}
+
+        for _ in range(2):
+            config = octoconf.loads(yaml, variables=variables, used_config='Fruits', include_cwd=str(tmpdir),
+                                    cache=cache)
+            assert {'user': 'test', 'host': 'localhost'} == config.get_dict()
+
+        assert (1, 1) == (cache.hits, cache.misses)
+        assert 2 == host_provider.call_count
+        assert 0 == unused_provider.call_count
+
+    def test_cache_checks_resolved_values(self, tmpdir):
+        tmpdir.join('fruits.yml').write('Fruits:\n  name: ${FRUIT_NAME}\n')
+        yaml = substitute_yaml("""
+            {_include_}: fruits.yml
+
+            Fruits:
+              size: ${{FRUIT_SIZE}}
+            """)
+        resolved = {'FRUIT_NAME': 'kiwi', 'FRUIT_SIZE': 1}
+
+        class Variables(dict):
+            def __missing__(self, name):
+                return resolved[name]
+
+        cache = octoconf.MemoryCache()
+
+        def load():
+            return octoconf.loads(yaml, variables=Variables(), used_config='Fruits', include_cwd=str(tmpdir),
+                                  cache=cache).get_dict()
+
+        assert {'name': 'kiwi', 'size': 1} == load()
+        resolved['FRUIT_NAME'] = 'apple'
+        assert {'name': 'apple', 'size': 1} == load()
+        resolved['FRUIT_SIZE'] = 2
+        assert {'name': 'apple', 'size': 2} == load()
+        assert {'name': 'apple', 'size': 2} == load()
+        assert (1, 3) == (cache.hits, cache.misses)
+
+    def test_process_pool_with_providers(self, tmpdir):
+        tmpdir.join('fruits.yml').write('Fruits:\n  host: ${HOST}\n')
+        yaml = substitute_yaml("""
+            {_include_}: fruits.yml
+
+            Fruits:
+              user: test
+            """)
+        host_provider = mock.Mock(return_value='localhost')
+
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            config = octoconf.loads(yaml, variables={'HOST': host_provider, 'UNUSED': lambda: 'unused'},
+                                    used_config='Fruits', include_cwd=str(tmpdir), executor=executor)
+
+        assert {'user': 'test', 'host': 'localhost'} == config.get_dict()
+        assert 1 == host_provider.call_count
+
+
+class TestConfigTemplate(object):
+    def test_same_result_as_loads(self):
+        yaml = """
+            Fruits:
+              path: /home/$USER/foo
+              ${size}Size: 42
+              port: ${port}
+              quoted: '${port}'
+              price: $$1
+            """
+        variables = {'USER': 'test', 'size': 'small', 'port': '8080'}
+        template = octoconf.loads_template(yaml)
+
+        assert octoconf.loads(yaml, variables=variables, used_config='Fruits').get_dict() \
+            == template.render(variables, used_config='Fruits').get_dict()
+
+    def test_render_many_variable_sets_with_single_parse(self):
+        yaml = """
+            USED_CONFIG>: Fruits
+
+            Fruits:
+              server: ${server}
+              enabled: ${enabled}
+            """
+        with mock.patch('yaml.load', side_effect=yaml_module.load) as load_mock:
+            template = octoconf.loads_template(yaml)
+            first_config = template.render({'server': 'alpha', 'enabled': 'true'})
+            second_config = template.render({'server': 'beta', 'enabled': 'false'})
+
+        assert 1 == load_mock.call_count
+        assert {'server': 'alpha', 'enabled': True} == first_config.get_dict()
+        assert {'server': 'beta', 'enabled': False} == second_config.get_dict()
+
+    def test_substituted_values_stay_scalars(self):
+        yaml = """
+            Fruits:
+              sizes: ${sizes}
+              port: ${port}
+            """
+        variables = {'sizes': '[1, 2]', 'port': '8080'}
+
+        rendered_config = octoconf.loads_template(yaml).render(variables, used_config='Fruits')
+        loaded_config = octoconf.loads(yaml, variables=variables, used_config='Fruits')
+
+        assert {'sizes': '[1, 2]', 'port': 8080} == rendered_config.get_dict()
+        assert {'sizes': [1, 2], 'port': 8080} == loaded_config.get_dict()
+
+    def test_renders_are_independent(self):
+        template = octoconf.loads_template("""
+            Fruits:
+              Banana:
+                size: $size
+            """)
+        first_config = template.render({'size': '1'}, used_config='Fruits')
+        first_config.Banana.size = 100
+
+        assert 2 == template.render({'size': '2'}, used_config='Fruits').Banana.size
+
+    def test_render_included_files(self):
+        yaml = substitute_yaml("""
+            {_include_}: ${{name}}.yml
+
+            Fruits:
+              color: ${{color}}
+            """)
+        included_files = {
+            'apple.yml': 'Fruits:\n  name: apple\n  color: green\n',
+            'kiwi.yml': 'Fruits:\n  name: kiwi\n',
+        }
+        template = octoconf.loads_template(yaml)
+
+        with patch_open_read(included_files):
+            apple_config = template.render({'name': 'apple', 'color': 'red'}, used_config='Fruits')
+            kiwi_config = template.render({'name': 'kiwi', 'color': 'brown'}, used_config='Fruits')
+
+        assert {'name': 'apple', 'color': 'red'} == apple_config.get_dict()
+        assert {'name': 'kiwi', 'color': 'brown'} == kiwi_config.get_dict()
+
+    def test_can_not_render_variable_without_define(self):
+        template = octoconf.loads_template("""
+            Fruits:
+              Kiwi: ${notDefinedVariable}
+            """)
+
+        with pytest.raises(octoconf.UndefinedVariableError) as excinfo:
+            template.render(used_config='Fruits')
+
+        assert 'notDefinedVariable' == str(excinfo.value)
@@ -0,0 +1,215 @@
+# pylint: disable=misplaced-comparison-constant,redefined-outer-name,no-self-use
+
+import os
+import pytest
+import threading
+import time
+
+import octoconf
+from tests.common import substitute_yaml
+
+
+@pytest.fixture
+def config_dir(tmpdir):
+    tmpdir.join('main.yml').write(substitute_yaml("""
+        {_default_}: Fruits
+        {_include_}:
+          - alpha.yml
+          - beta.yml
+
+        Fruits:
+          orange: 1
+        """))
+    tmpdir.join('alpha.yml').write(substitute_yaml("""
+        {_include_}: vendor.yml
+        Fruits:
+          apple: 2
+        """))
+    tmpdir.join('beta.yml').write(substitute_yaml("""
+        Fruits:
+          banana: 3
+        """))
+    tmpdir.join('vendor.yml').write(substitute_yaml("""
+        Fruits:
+          kiwi: 4
+        """))
+    return tmpdir
+
+
+def change_file(path, content):
+    """
+    :type path: py.path.local
+    :type content: str
+    """
+    stat = os.stat(str(path))
+    path.write(content)
+    os.utime(str(path), (stat.st_atime, stat.st_mtime + 10))
+
+
+def create_watcher(config_dir, **kwargs):
+    return octoconf.ConfigWatcher(str(config_dir.join('main.yml')), include_cwd=str(config_dir), **kwargs)
+
+
+def test_initial_load(config_dir):
+    watcher = create_watcher(config_dir)
+
+    assert {'orange': 1, 'apple': 2, 'banana': 3, 'kiwi': 4} == watcher.config.get_dict()
+    assert not watcher.check()
+
+
+def test_reparses_only_the_changed_file(config_dir):
+    stats = octoconf.LoadStats()
+    watcher = create_watcher(config_dir, stats=stats)
+    assert 4 == stats.parses
+
+    change_file(config_dir.join('vendor.yml'), 'Fruits: {kiwi: 40}')
+
+    assert watcher.check()
+    assert 5 == stats.parses
+    assert {'orange': 1, 'apple': 2, 'banana': 3, 'kiwi': 40} == watcher.config.get_dict()
+
+
+def test_changed_list_does_not_survive_reload(config_dir):
+    change_file(config_dir.join('vendor.yml'), 'Fruits: {kiwi: 4, hosts: [a]}')
+    watcher = create_watcher(config_dir)
+    watcher.config.hosts.append('EVIL')
+
+    change_file(config_dir.join('beta.yml'), 'Fruits: {banana: 30}')
+
+    assert watcher.check()
+    assert ['a'] == watcher.config.hosts
+
+
+def test_changed_section_does_not_survive_reload(config_dir):
+    change_file(config_dir.join('vendor.yml'), 'Fruits: {kiwi: 4, Size: {small: 1}}')
+    watcher = create_watcher(config_dir)
+    watcher.config.Size['small'] = 100
+
+    change_file(config_dir.join('beta.yml'), 'Fruits: {banana: 30}')
+
+    assert watcher.check()
+    assert {'small': 1} == watcher.config.Size.get_dict()
+
+
+def test_reload_of_root_file(config_dir):
+    stats = octoconf.LoadStats()
+    watcher = create_watcher(config_dir, stats=stats)
+
+    change_file(config_dir.join('main.yml'), substitute_yaml("""
+        {_default_}: Fruits
+        {_include_}: beta.yml
+
+        Fruits:
+          orange: 10
+        """))
+
+    assert watcher.check()
+    assert 5 == stats.parses
+    assert {'orange': 10, 'banana': 3} == watcher.config.get_dict()
+
+
+def test_dropped_include_is_not_watched(config_dir):
+    watcher = create_watcher(config_dir)
+
+    change_file(config_dir.join('alpha.yml'), substitute_yaml("""
+        Fruits:
+          apple: 20
+        """))
+    assert watcher.check()
+    assert {'orange': 1, 'apple': 20, 'banana': 3} == watcher.config.get_dict()
+
+    change_file(config_dir.join('vendor.yml'), 'Fruits: {kiwi: 40}')
+    config_dir.join('beta.yml').remove()
+    change_file(config_dir.join('main.yml'), substitute_yaml("""
+        {_default_}: Fruits
+        {_include_}: alpha.yml
+
+        Fruits:
+          orange: 10
+        """))
+    assert watcher.check()
+    assert {'orange': 10, 'apple': 20} == watcher.config.get_dict()
+
+    change_file(config_dir.join('vendor.yml'), 'Fruits: {kiwi: 400}')
+    assert not watcher.check()
+
+
+def test_relative_includes_of_relative_path(config_dir, monkeypatch):
+    monkeypatch.chdir(str(config_dir.dirpath()))
+    watcher = octoconf.ConfigWatcher(os.path.join(config_dir.basename, 'main.yml'))
+
+    assert {'orange': 1, 'apple': 2, 'banana': 3, 'kiwi': 4} == watcher.config.get_dict()
+
+
+def test_touched_but_not_changed_file_does_not_reload(config_dir):
+    watcher = create_watcher(config_dir)
+    path = config_dir.join('beta.yml')
+
+    change_file(path, path.read())
+
+    assert not watcher.check()
+
+
+def test_notifies_subscribers(config_dir):
+    watcher = create_watcher(config_dir)
+    configs = []
+    watcher.subscribe(configs.append)
+
+    change_file(config_dir.join('beta.yml'), 'Fruits: {banana: 30}')
+    watcher.check()
+
+    assert 1 == len(configs)
+    assert configs[0] is watcher.config
+    assert 30 == configs[0].banana
+
+
+def test_polls_files_in_background(config_dir):
+    watcher = create_watcher(config_dir, interval=0.01)
+    reloaded = threading.Event()
+    watcher.subscribe(lambda config: reloaded.set())
+
+    watcher.start()
+    try:
+        change_file(config_dir.join('beta.yml'), 'Fruits: {banana: 30}')
+        assert reloaded.wait(5)
+    finally:
+        watcher.stop()
+
+    assert 30 == watcher.config.banana
+
+
+def test_reports_errors_of_background_reloads(config_dir):
+    errors = []
+    watcher = create_watcher(config_dir, interval=0.01, on_error=errors.append)
+
+    watcher.start()
+    try:
+        change_file(config_dir.join('beta.yml'), 'Fruits: ${undefined}')
+        for _ in range(500):
+            if errors:
+                break
+            time.sleep(0.01)
+    finally:
+        watcher.stop()
+
+    assert isinstance(errors[0], octoconf.UndefinedVariableError)
+    assert 3 == watcher.config.banana
+
+
+def test_new_file_of_glob_include(tmpdir):
+    tmpdir.join('main.yml').write(substitute_yaml("""
+        {_default_}: Fruits
+        {_include_}: conf.d/*.yml
+
+        Fruits:
+          orange: 1
+        """))
+    tmpdir.mkdir('conf.d').join('10-apple.yml').write('Fruits: {apple: 2}')
+    watcher = create_watcher(tmpdir)
+
+    stat = os.stat(str(tmpdir.join('conf.d')))
+    tmpdir.join('conf.d', '20-kiwi.yml').write('Fruits: {kiwi: 3}')
+    os.utime(str(tmpdir.join('conf.d')), (stat.st_atime, stat.st_mtime + 10))
+
+    assert watcher.check()
+    assert {'orange': 1, 'apple': 2, 'kiwi': 3} == watcher.config.get_dict()